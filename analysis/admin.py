@@ -1,10 +1,10 @@
 from django.contrib import admin
-from .models import UploadedFile, AnalysisSession
+from .models import UploadedFile, AnalysisSession, DatasetProfile
 
 
 @admin.register(UploadedFile)
 class UploadedFileAdmin(admin.ModelAdmin):
-    list_display = ['original_name', 'file_size', 'uploaded_at']
+    list_display = ['original_name', 'file_size', 'uploaded_at', 'profile']
     list_filter = ['uploaded_at']
     search_fields = ['original_name']
     readonly_fields = ['uploaded_at']
@@ -43,4 +43,12 @@ class AnalysisSessionAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         # Optimize queries by selecting related objects
-        return super().get_queryset(request).select_related('uploaded_file') 
\ No newline at end of file
+        return super().get_queryset(request).select_related('uploaded_file')
+
+
+@admin.register(DatasetProfile)
+class DatasetProfileAdmin(admin.ModelAdmin):
+    list_display = ['source_name', 'n_rows', 'n_columns', 'updated_at']
+    search_fields = ['source_name', 'fingerprint']
+    readonly_fields = ['fingerprint', 'created_at', 'updated_at']
+    ordering = ['-updated_at']
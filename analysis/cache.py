@@ -0,0 +1,237 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULT_DATASET_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+
+def file_fingerprint(file_path):
+    """Return an (absolute path, size, mtime) tuple identifying the file's current contents"""
+    file_stat = os.stat(file_path)
+    return (os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns)
+
+
+def estimate_size(value):
+    """Estimate the in-memory size of a cached value in bytes"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by an approximate memory budget"""
+
+    def __init__(self, max_bytes, name='cache'):
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._current_bytes = 0
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Return a cached value without counting a hit or miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            return default
+
+    def set(self, key, value, size=None):
+        """Store a value, evicting least-recently-used entries to stay within budget"""
+        size = estimate_size(value) if size is None else int(size)
+        with self._lock:
+            if key in self._entries:
+                self._current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Never let a single oversized entry flush the whole cache
+                self.rejections += 1
+                return False
+            self._entries[key] = (value, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def get_or_load(self, key, loader):
+        """Return (value, error) from the cache, calling loader() on a miss
+
+        loader must return a (value, error) tuple; failed loads are not cached.
+        Concurrent misses on one key (e.g. a page's plot requests) share a lock,
+        so the first caller loads the value and the others wait for it.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value, None
+
+        # The lock stays registered until its last waiter is done, so late callers queue on it too
+        with self._lock:
+            in_flight = self._loading.setdefault(key, [threading.Lock(), 0])
+            in_flight[1] += 1
+        try:
+            with in_flight[0]:
+                value = self.peek(key, sentinel)
+                if value is not sentinel:
+                    return value, None
+                value, error = loader()
+                if value is not None and error is None:
+                    self.set(key, value)
+                return value, error
+        finally:
+            with self._lock:
+                in_flight[1] -= 1
+                if in_flight[1] == 0:
+                    self._loading.pop(key, None)
+
+    def invalidate(self, predicate):
+        """Remove every entry whose key satisfies predicate(key); returns the number removed"""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self._current_bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.hits = self.misses = self.evictions = self.rejections = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                'current_bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class DatasetCache(LRUCache):
+    """Cache of parsed DataFrames keyed by file fingerprint or random-data parameters
+
+    Keys look like ('file', path, size, mtime_ns) or ('random', sample_size, seed,
+    distribution). Cached DataFrames are shared between requests and must be
+    treated as read-only.
+    """
+
+    def file_key(self, file_path, *extra):
+        return ('file',) + file_fingerprint(file_path) + extra
+
+    def invalidate_path(self, file_path):
+        """Drop every cached entry derived from file_path, whatever its size or mtime"""
+        path = os.path.abspath(file_path)
+        return self.invalidate(lambda key: key[0] == 'file' and key[1] == path)
+
+
+dataset_cache = DatasetCache(
+    getattr(settings, 'DATASET_CACHE_MAX_BYTES', DEFAULT_DATASET_CACHE_MAX_BYTES),
+    name='datasets'
+)
+
+
+class FigureCache:
+    """Rendered Plotly figures keyed by dataset fingerprint, plot type and plot parameters
+
+    Figures are stored in the Django cache named by `alias` (the 'figures'
+    entry of settings.CACHES), so the backend is pluggable: in-process memory,
+    a directory shared by every worker, or Redis (the default cache when there
+    is no such entry). A figure's key includes the
+    dataset cache key, whose file fingerprint changes whenever the file does,
+    so stale figures are never served and simply expire. Hit and miss counters
+    are per process.
+    """
+
+    def __init__(self, alias='figures'):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        # Settings that replace CACHES without a figures entry fall back to the default cache
+        if self.alias not in settings.CACHES:
+            return caches['default']
+        return caches[self.alias]
+
+    def key(self, dataset_key, plot, params):
+        """Backend key for one figure; parameters are order-independent"""
+        identity = repr((tuple(dataset_key), plot, sorted(params.items())))
+        return f'figure:{plot}:' + hashlib.sha256(identity.encode()).hexdigest()
+
+    def get_many(self, dataset_key, requested):
+        """Cached figures for a {plot: params} dict, as {plot: figure} for the hits only"""
+        keys = {plot: self.key(dataset_key, plot, params) for plot, params in requested.items()}
+        found = self.backend.get_many(list(keys.values()))
+        figures = {plot: found[key] for plot, key in keys.items() if key in found}
+        with self._lock:
+            self.hits += len(figures)
+            self.misses += len(keys) - len(figures)
+        return figures
+
+    def set(self, dataset_key, plot, params, figure):
+        """Store a rendered figure; figures that could not be drawn (None) are not cached"""
+        if figure is not None:
+            self.backend.set(self.key(dataset_key, plot, params), figure)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.alias,
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+figure_cache = FigureCache('figures')
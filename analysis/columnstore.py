@@ -0,0 +1,190 @@
+import copy
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+
+COLUMN_STORE_SUFFIX = '.columns'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+_SHAPE_PATTERN = re.compile(rb"'shape': \((\d+),\)")
+
+
+def column_store_path_for(file_path):
+    """Directory of the memory-mapped numeric column store kept alongside an uploaded file"""
+    return f"{file_path}{COLUMN_STORE_SUFFIX}"
+
+
+def write_column_store(df, file_path):
+    """Persist the numeric columns of df as one .npy file per column plus a JSON manifest
+
+    The store is written to a temporary directory and renamed into place, so
+    workers opening it concurrently never see a half-written store.
+    """
+    directory = column_store_path_for(file_path)
+    temp_directory = f"{directory}.tmp"
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    numeric = df.select_dtypes(include=[np.number])
+    manifest_columns = []
+    for position, name in enumerate(numeric.columns):
+        series = numeric[name]
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            # Nullable extension dtypes become float64 with NaN for missing values
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        file_name = f"{position:04d}.npy"
+        np.save(os.path.join(temp_directory, file_name), np.ascontiguousarray(values))
+        manifest_columns.append({'name': str(name), 'file': file_name, 'dtype': values.dtype.str})
+
+    manifest = {'version': MANIFEST_VERSION, 'n_rows': len(df), 'columns': manifest_columns}
+    with open(os.path.join(temp_directory, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+    return directory
+
+
+def _append_npy(path, values):
+    """Append values to a 1-D .npy file in place; returns False if its header has no room
+
+    np.save pads array headers so the shape can grow without moving the data, so
+    only the new values and the rewritten header are written.
+    """
+    with open(path, 'r+b') as f:
+        major, _ = np.lib.format.read_magic(f)
+        length_size = 2 if major == 1 else 4
+        header_length = int.from_bytes(f.read(length_size), 'little')
+        header_start = f.tell()
+        header = f.read(header_length)
+        match = _SHAPE_PATTERN.search(header)
+        if match is None:
+            return False
+        rows = int(match.group(1)) + len(values)
+        new_header = header[:match.start(1)] + str(rows).encode() + header[match.end(1):]
+        # Keep the header length (and so the data offset) unchanged by trimming padding
+        new_header = new_header.rstrip(b' \n')
+        if len(new_header) + 1 > header_length:
+            return False
+        new_header = new_header.ljust(header_length - 1) + b'\n'
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(values).tobytes())
+        f.seek(header_start)
+        f.write(new_header)
+    return True
+
+
+def append_column_store(df, file_path):
+    """Append the rows of df to an existing column store, touching only the new rows
+
+    New values are cast to each column's stored dtype when that is lossless and
+    appended in place. A column whose dtype cannot hold them (say, fractions or
+    missing values in an integer column) is rewritten once as float64. The
+    manifest is replaced last, so the store only looks current once every column
+    has its new rows.
+    """
+    directory = column_store_path_for(file_path)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    for column in manifest['columns']:
+        path = os.path.join(directory, column['file'])
+        name = column['name']
+        if name in df.columns:
+            values = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = np.full(len(df), np.nan)
+        dtype = np.dtype(column['dtype'])
+        with np.errstate(invalid='ignore', over='ignore'):
+            cast = values.astype(dtype)
+        if np.array_equal(cast.astype(np.float64), values, equal_nan=True) and _append_npy(path, cast):
+            continue
+
+        combined = np.concatenate([np.load(path).astype(np.float64), values])
+        temp_path = f"{path}.tmp.npy"
+        np.save(temp_path, combined)
+        os.replace(temp_path, path)
+        column['dtype'] = combined.dtype.str
+
+    manifest['n_rows'] += len(df)
+    temp_manifest = f"{manifest_path}.tmp"
+    with open(temp_manifest, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(temp_manifest, manifest_path)
+    return {column['name']: column['dtype'] for column in manifest['columns']}
+
+
+def remove_column_store(file_path):
+    shutil.rmtree(column_store_path_for(file_path), ignore_errors=True)
+
+
+class ColumnStore:
+    """Read-only, memory-mapped view over a dataset's numeric columns
+
+    Columns are opened with np.load(mmap_mode='r'), so every worker process
+    shares the same pages through the OS cache. Indexing returns a pandas Series
+    that wraps the mapped array without copying it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        self.n_rows = manifest['n_rows']
+        self._files = {column['name']: column['file'] for column in manifest['columns']}
+        self._arrays = {}
+
+    @classmethod
+    def open(cls, file_path):
+        """Open the column store for file_path, or return None if it is missing or stale"""
+        directory = column_store_path_for(file_path)
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            if os.path.getmtime(manifest_path) < os.path.getmtime(file_path):
+                return None
+            return cls(directory)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @property
+    def columns(self):
+        return pd.Index(list(self._files))
+
+    def __len__(self):
+        return self.n_rows
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def array(self, name):
+        """The raw memory-mapped array for a column"""
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.directory, self._files[name]), mmap_mode='r')
+        return self._arrays[name]
+
+    def __getitem__(self, name):
+        if name not in self._files:
+            raise KeyError(name)
+        return pd.Series(self.array(name), name=name, copy=False)
+
+    def select(self, columns):
+        """Store limited to the given columns, sharing the open memory maps"""
+        missing = [name for name in columns if name not in self._files]
+        if missing:
+            raise KeyError(missing)
+        view = copy.copy(self)
+        view._files = {name: self._files[name] for name in columns}
+        return view
+
+    def to_frame(self, columns=None):
+        """Zero-copy DataFrame over the requested (default: all) columns"""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self.array(name) for name in columns}, copy=False)
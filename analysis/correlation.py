@@ -0,0 +1,94 @@
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .streaming import CorrelationAccumulator
+
+
+CORRELATION_METHODS = ('pearson', 'spearman', 'kendall')
+
+
+def _pair_pearson(x, y):
+    """Pearson correlation of two complete 1-D arrays, NaN when undefined"""
+    if len(x) < 2:
+        return math.nan
+    dx = x - x.mean()
+    dy = y - y.mean()
+    denominator = math.sqrt(float(dx @ dx) * float(dy @ dy))
+    if denominator == 0:
+        return math.nan
+    return min(max(float(dx @ dy) / denominator, -1.0), 1.0)
+
+
+def _partial_pairs(valid):
+    """Column pairs (i < j) whose missing-value patterns differ"""
+    k = valid.shape[1]
+    return [
+        (i, j) for i in range(k) for j in range(i + 1, k)
+        if not np.array_equal(valid[:, i], valid[:, j])
+    ]
+
+
+def pearson_matrix(block):
+    """Pairwise-complete Pearson correlations of a 2-D float block (as DataFrame.corr())"""
+    columns = range(block.shape[1])
+    return CorrelationAccumulator(columns).update(block).matrix().to_numpy(copy=True)
+
+
+def spearman_matrix(block):
+    """Pairwise-complete Spearman correlations: Pearson over average ranks
+
+    Every column is ranked once and the ranks go through the masked Pearson
+    sums. Only pairs whose columns are missing on different rows are re-ranked
+    over their shared rows, because their ranks depend on the pair.
+    """
+    valid = ~np.isnan(block)
+    corr = pearson_matrix(stats.rankdata(block, axis=0, nan_policy='omit'))
+    for i, j in _partial_pairs(valid):
+        both = valid[:, i] & valid[:, j]
+        corr[i, j] = corr[j, i] = _pair_pearson(stats.rankdata(block[both, i]), stats.rankdata(block[both, j]))
+    return corr
+
+
+def kendall_matrix(block):
+    """Pairwise-complete Kendall tau-b correlations
+
+    Each pair uses scipy's kendalltau, which counts discordant pairs with a
+    merge sort (Knight's algorithm), so a pair costs O(n log n) rather than O(n²).
+    """
+    valid = ~np.isnan(block)
+    k = block.shape[1]
+    corr = np.full((k, k), np.nan)
+    with warnings.catch_warnings():
+        # Constant columns have an undefined tau; NaN is the expected result
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for i in range(k):
+            for j in range(i, k):
+                both = valid[:, i] & valid[:, j]
+                if i == j:
+                    # DataFrame.corr(method='kendall') reports 1 on the diagonal, even for constant columns
+                    corr[i, i] = 1.0 if both.any() else math.nan
+                elif both.sum() >= 2:
+                    corr[i, j] = corr[j, i] = stats.kendalltau(block[both, i], block[both, j]).statistic
+    return corr
+
+
+def correlation_matrix(data, method='pearson'):
+    """Correlation matrix over the numeric columns of a DataFrame
+
+    Missing values are handled pairwise, as DataFrame.corr() does, for every method.
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    numeric = data.select_dtypes(include=[np.number])
+    block = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    if method == 'spearman':
+        corr = spearman_matrix(block)
+    elif method == 'kendall':
+        corr = kendall_matrix(block)
+    else:
+        corr = pearson_matrix(block)
+    return pd.DataFrame(corr, index=numeric.columns, columns=numeric.columns)
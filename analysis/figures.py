@@ -0,0 +1,97 @@
+import base64
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+from plotly.colors import get_colorscale
+
+
+DEFAULT_TEMPLATE = 'plotly_white'
+# NumPy dtypes Plotly.js decodes from base64 typed arrays, by Plotly.js dtype code
+_TYPED_ARRAY_CODES = ('f8', 'f4', 'i4', 'u4', 'i2', 'u2', 'i1', 'u1')
+_TYPED_ARRAY_DTYPES = {np.dtype(code).newbyteorder('<'): code for code in _TYPED_ARRAY_CODES}
+
+
+def encode_array(values):
+    """JSON-safe form of an array: a Plotly.js base64 typed array for numbers, a list otherwise
+
+    64-bit integers are sent as int32 when they fit and as float64 otherwise;
+    2-D arrays carry their shape, as Plotly.js expects for heatmap z values.
+    """
+    values = np.asarray(values)
+    if values.dtype == bool:
+        values = values.astype(np.uint8)
+    elif values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        fits = values.size == 0 or (values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max)
+        values = values.astype(np.int32 if fits else np.float64)
+    elif values.dtype.kind not in 'fiu':
+        return to_spec(values.tolist())
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    if values.dtype not in _TYPED_ARRAY_DTYPES:
+        values = values.astype('<f8')
+    spec = {
+        'dtype': _TYPED_ARRAY_DTYPES[values.dtype],
+        'bdata': base64.b64encode(values.tobytes()).decode('ascii'),
+    }
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(size) for size in values.shape)
+    return spec
+
+
+def to_spec(value):
+    """Recursively turn a figure made of dicts, lists, NumPy and pandas values into plain JSON types"""
+    if isinstance(value, dict):
+        return {key: to_spec(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_spec(item) for item in value]
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray):
+        return encode_array(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def figure(traces, title=None, xaxis_title=None, yaxis_title=None, template=DEFAULT_TEMPLATE, **layout):
+    """Plotly figure spec ({'data', 'layout'}) built from plain trace dicts, without go.Figure validation
+
+    Traces need their 'type'. The template is referenced by name; the page
+    supplies its definition once (see template_specs) instead of every figure
+    repeating it.
+    """
+    layout = dict(layout, template=template)
+    if title is not None:
+        layout['title'] = {'text': title}
+    for axis, axis_title in (('xaxis', xaxis_title), ('yaxis', yaxis_title)):
+        if axis_title is not None:
+            layout[axis] = dict(layout.get(axis, {}), title={'text': axis_title})
+    return {'data': to_spec(list(traces)), 'layout': to_spec(layout)}
+
+
+@lru_cache(maxsize=None)
+def colorscale(name):
+    """Plotly.py's named colorscale as explicit [position, color] pairs (Plotly.js's own names differ)"""
+    return [[float(position), color] for position, color in get_colorscale(name)]
+
+
+@lru_cache(maxsize=None)
+def _template_json(name):
+    return json.dumps(json.loads(go.Figure(layout={'template': name}).to_json())['layout']['template'])
+
+
+def template_specs(names=(DEFAULT_TEMPLATE,)):
+    """{name: template} definitions for the templates figures refer to by name"""
+    return {name: json.loads(_template_json(name)) for name in names}
+
+
+def to_plotly_figure(spec):
+    """go.Figure of a spec with its template resolved, e.g. to render it outside the dashboard"""
+    layout = dict(spec['layout'])
+    if isinstance(layout.get('template'), str):
+        layout['template'] = template_specs((layout['template'],))[layout['template']]
+    return go.Figure(data=spec['data'], layout=layout)
@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Row, Column, Submit, HTML
 from .models import UploadedFile
@@ -19,6 +20,20 @@ class AnalysisForm(forms.Form):
         ('purple', 'Purple'),
     ]
     
+    DISTRIBUTION_CHOICES = [
+        ('normal', 'Normal'),
+        ('uniform', 'Uniform'),
+        ('exponential', 'Exponential'),
+        ('lognormal', 'Log-normal'),
+        ('student_t', "Student's t (5 df)"),
+    ]
+    
+    CORRELATION_METHOD_CHOICES = [
+        ('pearson', 'Pearson'),
+        ('spearman', 'Spearman (rank)'),
+        ('kendall', 'Kendall (tau-b)'),
+    ]
+    
     SVM_KERNEL_CHOICES = [
         ('linear', 'Linear'),
         ('poly', 'Polynomial'),
@@ -53,11 +68,28 @@ class AnalysisForm(forms.Form):
     sample_size = forms.IntegerField(
         initial=1000,
         min_value=100,
-        max_value=10000,
+        max_value=settings.RANDOM_MAX_SAMPLE_SIZE,
         required=False,
         widget=forms.NumberInput(attrs={'class': 'form-control'})
     )
     
+    random_distribution = forms.ChoiceField(
+        choices=DISTRIBUTION_CHOICES,
+        initial='normal',
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    random_seed = forms.IntegerField(
+        initial=123,
+        min_value=0,
+        # AnalysisSession.random_seed is a 32-bit IntegerField
+        max_value=2 ** 31 - 1,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+        help_text='The same seed, size and distribution always give the same data'
+    )
+    
     # Column selection (will be populated dynamically)
     selected_column = forms.ChoiceField(
         choices=[],
@@ -102,6 +134,13 @@ class AnalysisForm(forms.Form):
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
     
+    correlation_method = forms.ChoiceField(
+        choices=CORRELATION_METHOD_CHOICES,
+        initial='pearson',
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
     # SVM Configuration Fields
     svm_target_column = forms.ChoiceField(
         choices=[],
@@ -162,7 +201,11 @@ class AnalysisForm(forms.Form):
             HTML('</div>'),
             
             HTML('<div id="random-section" style="display:none;">'),
-            Row(Column('sample_size', css_class='col-md-6')),
+            Row(
+                Column('sample_size', css_class='col-md-4'),
+                Column('random_distribution', css_class='col-md-4'),
+                Column('random_seed', css_class='col-md-4'),
+            ),
             HTML('</div>'),
             
             HTML('<div id="column-section" style="display:none;">'),
@@ -192,6 +235,9 @@ class AnalysisForm(forms.Form):
                 Column('show_stats', css_class='col-md-4'),
                 Column('show_correlation', css_class='col-md-4'),
             ),
+            Row(
+                Column('correlation_method', css_class='col-md-4'),
+            ),
             
             HTML('<hr>'),
             
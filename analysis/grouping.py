@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+GROUP_QUANTILES = (('q25', 0.25), ('median', 0.5), ('q75', 0.75))
+
+
+def group_codes(keys):
+    """Integer group code per row for the combinations of one or more key columns
+
+    Each key is factorized into sorted categorical codes and the codes are
+    combined into one integer, so no Python-level loop over groups is needed.
+    Returns (codes, levels): codes is -1 for rows with a missing key (dropped,
+    as in pandas' groupby), and levels is a DataFrame with one row per observed
+    combination, in sorted key order, indexed by group code.
+    """
+    factorized = [pd.factorize(keys[key], sort=True) for key in keys.columns]
+    shape = tuple(max(len(uniques), 1) for _, uniques in factorized)
+    missing = np.zeros(len(keys), dtype=bool)
+    for codes, _ in factorized:
+        missing |= codes < 0
+    combined = np.ravel_multi_index(
+        tuple(np.where(missing, 0, codes) for codes, _ in factorized), shape
+    )
+    observed, inverse = np.unique(combined[~missing], return_inverse=True)
+    codes = np.full(len(keys), -1, dtype=np.int64)
+    codes[~missing] = inverse
+    level_codes = np.unravel_index(observed, shape)
+    levels = pd.DataFrame({
+        key: np.asarray(uniques)[level_codes[k]]
+        for k, (key, (_, uniques)) in enumerate(zip(keys.columns, factorized))
+    })
+    return codes, levels
+
+
+def group_statistics(values, codes, n_groups):
+    """Per-group counts, moments and quantiles from one sort and segment reductions
+
+    Rows are sorted once by (group, value), which makes every group a contiguous,
+    ordered segment: moments come from np.bincount over the segments and
+    quantiles from index arithmetic on their bounds. Returns a dict of arrays of
+    length n_groups (NaN where a group has too few values) plus the centered
+    sums of squares needed by the ANOVA.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    grouped = codes >= 0
+    missing = np.bincount(codes[grouped & np.isnan(values)], minlength=n_groups)
+    valid = grouped & ~np.isnan(values)
+    values, codes = values[valid], codes[valid]
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+
+    count = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(count)[:-1]])
+    has_values = count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=values, minlength=n_groups) / count
+        delta = values - mean[codes]
+        delta2 = delta * delta
+        m2 = np.bincount(codes, weights=delta2, minlength=n_groups)
+        m3 = np.bincount(codes, weights=delta2 * delta, minlength=n_groups)
+        m4 = np.bincount(codes, weights=delta2 * delta2, minlength=n_groups)
+        var = np.where(count > 1, m2 / (count - 1), np.nan)
+        # Biased skewness and excess kurtosis, matching scipy.stats defaults
+        skewness = np.where(m2 > 0, np.sqrt(count) * m3 / m2 ** 1.5, np.nan)
+        kurtosis = np.where(m2 > 0, count * m4 / (m2 * m2) - 3.0, np.nan)
+
+    result = {
+        'count': count,
+        'missing': missing,
+        'mean': mean,
+        'std': np.sqrt(var),
+        'var': var,
+        'skewness': skewness,
+        'kurtosis': kurtosis,
+        'm2': m2,
+    }
+    last = np.where(has_values, starts + count - 1, 0)
+    first = np.where(has_values, starts, 0)
+    if len(values) == 0:
+        values = np.full(1, np.nan)
+    result['min'] = np.where(has_values, values[first], np.nan)
+    result['max'] = np.where(has_values, values[last], np.nan)
+    for name, q in GROUP_QUANTILES:
+        # Linear interpolation between order statistics, as pandas' quantile()
+        position = first + q * np.maximum(count - 1, 0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, last)
+        fraction = position - lower
+        quantile = values[lower] + (values[upper] - values[lower]) * fraction
+        result[name] = np.where(has_values, quantile, np.nan)
+    return result
+
+
+def one_way_anova(count, mean, m2):
+    """One-way ANOVA F-test from per-group counts, means and centered sums of squares
+
+    Returns (F, p_value, df_between, df_within), as scipy.stats.f_oneway.
+    """
+    tested = count > 0
+    count, mean, m2 = count[tested], mean[tested], m2[tested]
+    k, n = len(count), int(count.sum())
+    if k < 2 or n <= k:
+        return np.nan, np.nan, k - 1, n - k
+    grand_mean = (count * mean).sum() / n
+    between = (count * (mean - grand_mean) ** 2).sum() / (k - 1)
+    within = m2.sum() / (n - k)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        statistic = between / within
+    return float(statistic), float(stats.f.sf(statistic, k - 1, n - k)), k - 1, n - k
+
+
+def kruskal_wallis(values, codes, n_groups):
+    """Kruskal-Wallis H-test from per-group rank sums, with the tie correction
+
+    Ranks are computed once over every grouped value and summed per group with
+    np.bincount. Returns (H, p_value, df), as scipy.stats.kruskal.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[valid], codes[valid]
+    count = np.bincount(codes, minlength=n_groups)
+    tested = count > 0
+    k, n = int(tested.sum()), len(values)
+    if k < 2:
+        return np.nan, np.nan, k - 1
+
+    ranks = stats.rankdata(values)
+    rank_sums = np.bincount(codes, weights=ranks, minlength=n_groups)[tested]
+    statistic = 12.0 / (n * (n + 1)) * (rank_sums ** 2 / count[tested]).sum() - 3 * (n + 1)
+    ties = np.unique(values, return_counts=True)[1].astype(np.float64)
+    correction = 1 - (ties ** 3 - ties).sum() / (n ** 3 - n)
+    if correction == 0:
+        return np.nan, np.nan, k - 1
+    statistic /= correction
+    return float(statistic), float(stats.chi2.sf(statistic, k - 1)), k - 1
@@ -0,0 +1,138 @@
+import numpy as np
+from scipy import stats
+
+from .kernels import moment_sums
+
+
+CORRECTION_METHODS = ('bonferroni', 'holm', 'bh')
+
+
+def adjust_p_values(p_values, method='holm'):
+    """Adjust p-values for multiple comparisons (Bonferroni, Holm or Benjamini-Hochberg)
+
+    NaN p-values (untestable columns) are left as NaN and do not count towards
+    the number of comparisons.
+    """
+    if method not in CORRECTION_METHODS:
+        raise ValueError(f"Unknown correction method: {method}")
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    m = len(tested)
+    if m == 0:
+        return adjusted
+    
+    p = p_values[tested]
+    if method == 'bonferroni':
+        result = p * m
+    else:
+        order = np.argsort(p, kind='stable')
+        ranked = p[order]
+        if method == 'holm':
+            # Step-down: the k-th smallest p-value is scaled by (m - k + 1), kept monotone
+            stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+        else:
+            # Step-up: the k-th smallest p-value is scaled by m / k, kept monotone from the top
+            stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = stepped
+    adjusted[tested] = np.minimum(result, 1.0)
+    return adjusted
+
+
+def _t_test(n, mean, var, hypothesised=0.0):
+    """Vectorized one-sample t statistics, degrees of freedom and two-sided p-values"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        statistic = (mean - hypothesised) / np.sqrt(var / n)
+    df = n - 1.0
+    p_value = 2 * stats.t.sf(np.abs(statistic), df)
+    return statistic, df, p_value
+
+
+def _sample_moments(block):
+    """Per-column valid counts, means and sample variances (ddof=1), ignoring NaNs"""
+    n, mean, m2, _, _ = moment_sums(block, np.isnan(block))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = np.where(n > 1, m2 / (n - 1), np.nan)
+    return n.astype(np.float64), mean, var
+
+
+def one_sample_tests(block, test_value=0.0):
+    """One-sample t-tests of every column of a 2-D block against test_value
+
+    Equivalent to scipy.stats.ttest_1samp(column, test_value, nan_policy='omit')
+    for each column, computed in one vectorized pass.
+    """
+    block = np.asarray(block, dtype=np.float64)
+    n, mean, var = _sample_moments(block)
+    statistic, df, p_value = _t_test(n, mean, var, test_value)
+    return {'n': n, 'mean': mean, 'statistic': statistic, 'df': df, 'p_value': p_value}
+
+
+def one_sample_tests_from_moments(accumulators, test_value=0.0):
+    """One-sample t-tests from streaming MomentAccumulators, one per column"""
+    n = np.array([acc.n for acc in accumulators], dtype=np.float64)
+    mean = np.array([acc.mean for acc in accumulators], dtype=np.float64)
+    var = np.array([acc.var for acc in accumulators], dtype=np.float64)
+    statistic, df, p_value = _t_test(n, mean, var, test_value)
+    return {'n': n, 'mean': mean, 'statistic': statistic, 'df': df, 'p_value': p_value}
+
+
+def two_sample_tests(block, in_first_group, in_second_group, equal_var=False):
+    """Two-sample t-tests of every column between two row groups
+
+    Welch's test by default, the pooled-variance test with equal_var=True; each
+    column matches scipy.stats.ttest_ind(..., nan_policy='omit').
+    """
+    block = np.asarray(block, dtype=np.float64)
+    n1, mean1, var1 = _sample_moments(block[in_first_group])
+    n2, mean2, var2 = _sample_moments(block[in_second_group])
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if equal_var:
+            df = n1 + n2 - 2.0
+            pooled = ((n1 - 1) * var1 + (n2 - 1) * var2) / df
+            standard_error = np.sqrt(pooled * (1.0 / n1 + 1.0 / n2))
+        else:
+            se1, se2 = var1 / n1, var2 / n2
+            standard_error = np.sqrt(se1 + se2)
+            # Welch-Satterthwaite degrees of freedom
+            df = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+        statistic = (mean1 - mean2) / standard_error
+    p_value = 2 * stats.t.sf(np.abs(statistic), df)
+    return {
+        'n': n1 + n2, 'n_first': n1, 'n_second': n2, 'mean_first': mean1, 'mean_second': mean2,
+        'mean_difference': mean1 - mean2, 'statistic': statistic, 'df': df, 'p_value': p_value,
+    }
+
+
+def paired_tests(block, reference):
+    """Paired t-tests of every column against a reference column
+
+    Rows missing either value are dropped pair by pair, matching
+    scipy.stats.ttest_rel(column, reference, nan_policy='omit').
+    """
+    block = np.asarray(block, dtype=np.float64)
+    differences = block - np.asarray(reference, dtype=np.float64)[:, np.newaxis]
+    n, mean, var = _sample_moments(differences)
+    statistic, df, p_value = _t_test(n, mean, var)
+    return {'n': n, 'mean_difference': mean, 'statistic': statistic, 'df': df, 'p_value': p_value}
+
+
+def results_table(columns, results, correction='holm', alpha=0.05):
+    """Rows of per-column test results with adjusted p-values and decisions
+
+    Non-finite values (columns with too few observations) become None so the
+    table serialises to valid JSON.
+    """
+    adjusted = adjust_p_values(results['p_value'], correction)
+    table = []
+    for j, column in enumerate(columns):
+        row = {'column': column}
+        for key, values in results.items():
+            value = float(values[j])
+            row[key] = value if np.isfinite(value) else None
+        row['p_adjusted'] = float(adjusted[j]) if np.isfinite(adjusted[j]) else None
+        row['reject'] = bool(row['p_adjusted'] is not None and row['p_adjusted'] < alpha)
+        table.append(row)
+    return table
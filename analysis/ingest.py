@@ -0,0 +1,459 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from pyarrow import ArrowException
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from .cache import dataset_cache, file_fingerprint
+from .columnstore import append_column_store, column_store_path_for, remove_column_store, write_column_store
+from .models import DatasetProfile
+from .streaming import (
+    CorrelationAccumulator, HistogramAccumulator, MomentAccumulator, QuantileSketch, StreamingSummary, sketch_seed
+)
+from .timeseries import TimeSeriesPyramid
+from .utils import (
+    columnar_parts, columnar_path_for, find_columnar_copy, load_csv_file, publish_columnar_part, read_csv_with_dialect,
+    remove_columnar_copy, sniff_csv, stage_columnar_part, summarize_stream, write_columnar_copy
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def file_dataset_fingerprint(file_path):
+    """Fingerprint of a file-backed dataset derived from its path, size and mtime"""
+    return 'file:' + hashlib.sha1(repr(file_fingerprint(file_path)).encode()).hexdigest()
+
+
+def upload_dataset_fingerprint(file_obj):
+    """Fingerprint of an upload, content-addressed when its hash is known"""
+    if file_obj.content_hash:
+        return 'sha256:' + file_obj.content_hash
+    return file_dataset_fingerprint(file_obj.file.path)
+
+
+def column_kind(series):
+    """Classify a column as 'numeric', 'datetime' or 'categorical'"""
+    if pd.api.types.is_bool_dtype(series):
+        return 'categorical'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'categorical'
+
+
+def profile_columns(data):
+    """Per-column schema, null counts, cardinalities, moments, histograms and quantile sketches
+
+    data is a DataFrame or a StreamingSummary.
+    """
+    if isinstance(data, StreamingSummary):
+        return [
+            {
+                'name': str(name),
+                'dtype': dtype,
+                'kind': 'numeric' if name in data.moments else 'categorical',
+                'missing': int(data.missing.get(name, 0)),
+                'cardinality': None,
+                'moments': data.moments[name].to_dict() if name in data.moments else None,
+                'histogram': data.histograms[name].to_dict() if name in data.histograms else None,
+                'sketch': data.sketches[name].to_dict() if name in data.sketches else None,
+            }
+            for name, dtype in data.dtypes.items()
+        ]
+
+    columns = []
+    for name in data.columns:
+        series = data[name]
+        kind = column_kind(series)
+        moments = histogram = sketch = None
+        if kind == 'numeric':
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            moments = MomentAccumulator.from_values(values).to_dict()
+            histogram = HistogramAccumulator().update(values).to_dict()
+            sketch = QuantileSketch.from_values(values, seed=sketch_seed(name)).to_dict()
+        columns.append({
+            'name': str(name),
+            'dtype': str(series.dtype),
+            'kind': kind,
+            'missing': int(series.isna().sum()),
+            'cardinality': int(series.nunique()),
+            'moments': moments,
+            'histogram': histogram,
+            'sketch': sketch,
+        })
+    return columns
+
+
+def profile_correlation(data):
+    """Pairwise correlation sums over the numeric columns of a DataFrame or StreamingSummary"""
+    if isinstance(data, StreamingSummary):
+        if data.correlation is None:
+            return None
+        state = data.correlation.to_dict()
+        state['columns'] = [str(name) for name in state['columns']]
+        return state
+    
+    numeric = [name for name in data.columns if column_kind(data[name]) == 'numeric']
+    block = data[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+    return CorrelationAccumulator([str(name) for name in numeric]).update(block).to_dict()
+
+
+def profile_time_series(data):
+    """Time-series pyramid state of a DataFrame with a date column, or None"""
+    if isinstance(data, StreamingSummary):
+        return None
+    pyramid = TimeSeriesPyramid.from_frame(data)
+    return None if pyramid is None else pyramid.to_dict()
+
+
+def build_profile(data, fingerprint, source_name):
+    """Compute and store the DatasetProfile for a loaded dataset"""
+    memory_usage = {} if isinstance(data, StreamingSummary) else data.attrs.get('memory_usage', {})
+    profile, _ = DatasetProfile.objects.update_or_create(
+        fingerprint=fingerprint,
+        defaults={
+            'source_name': source_name,
+            'n_rows': len(data),
+            'n_columns': len(data.columns),
+            'columns': profile_columns(data),
+            'correlation': profile_correlation(data),
+            'time_series': profile_time_series(data),
+            'memory_before': memory_usage.get('before'),
+            'memory_after': memory_usage.get('after'),
+        }
+    )
+    return profile
+
+
+def profile_for_file(file_path, source_name, loader):
+    """Return the stored profile for a file, calling loader() to build it the first time"""
+    fingerprint = file_dataset_fingerprint(file_path)
+    profile = DatasetProfile.objects.filter(fingerprint=fingerprint).first()
+    if profile is None:
+        data, error = loader()
+        if data is None:
+            logger.warning("Unable to profile %s: %s", source_name, error)
+            return None
+        profile = build_profile(data, fingerprint, source_name)
+    return profile
+
+
+def ingest_uploaded_file(file_obj):
+    """Run the ingest stage for a newly stored UploadedFile
+
+    Sniffs the CSV dialect, parses the original upload once and writes two derived
+    copies next to it: a typed Parquet file, so later loads skip re-parsing CSV
+    text or Excel XML, and a memory-mapped store of the numeric columns that
+    worker processes share through the OS page cache. The dataset profile is
+    computed from the same parse. Ingest failures are logged and leave the upload
+    usable in its original form.
+    """
+    source_path = file_obj.file.path
+    fingerprint = upload_dataset_fingerprint(file_obj)
+    if not source_path.lower().endswith(('.xlsx', '.xls')):
+        try:
+            file_obj.csv_dialect = sniff_csv(source_path)
+        except OSError as e:
+            logger.warning("Unable to sniff %s: %s", file_obj.original_name, e)
+
+    threshold = getattr(settings, 'STREAMING_THRESHOLD_BYTES', None)
+    if threshold is not None and file_obj.file.size > threshold:
+        # Too large to parse in one piece: profile it from a chunked pass instead
+        summary, error = summarize_stream(source_path, dialect=file_obj.csv_dialect)
+        if summary is not None:
+            file_obj.profile = build_profile(summary, fingerprint, file_obj.original_name)
+        file_obj.save(update_fields=['csv_dialect', 'profile'])
+        return None
+
+    # The parse may correct the sniffed encoding in place, so save the dialect afterwards
+    data, error = load_csv_file(source_path, prefer_columnar=False, dialect=file_obj.csv_dialect)
+    if data is None:
+        logger.warning("Skipping columnar ingest for %s: %s", file_obj.original_name, error)
+        file_obj.save(update_fields=['csv_dialect'])
+        return None
+
+    file_obj.profile = build_profile(data, fingerprint, file_obj.original_name)
+
+    storage_root = file_obj.file.storage.location
+    try:
+        columnar_path = write_columnar_copy(data, source_path)
+        file_obj.columnar_file.name = os.path.relpath(columnar_path, storage_root)
+    except Exception as e:
+        logger.warning("Columnar conversion failed for %s: %s", file_obj.original_name, e)
+
+    try:
+        file_obj.column_store = os.path.relpath(write_column_store(data, source_path), storage_root)
+    except Exception as e:
+        logger.warning("Column store creation failed for %s: %s", file_obj.original_name, e)
+
+    file_obj.save(update_fields=['csv_dialect', 'columnar_file', 'column_store', 'profile'])
+    return data
+
+
+def _detach_shared_blob(file_obj):
+    """Give a record that shares its stored file with others a private copy of it and its derived copies"""
+    storage = file_obj.file.storage
+    shared_path = file_obj.file.path
+    with open(shared_path, 'rb') as f:
+        file_obj.file.name = storage.save(file_obj.file.name, File(f))
+    source_path = file_obj.file.path
+    if file_obj.column_store:
+        # Plain copies get fresh mtimes, so the store is not mistaken for stale
+        shutil.copytree(column_store_path_for(shared_path), column_store_path_for(source_path),
+                        copy_function=shutil.copy)
+        file_obj.column_store = os.path.relpath(column_store_path_for(source_path), storage.location)
+    file_obj.columnar_file.name = ''
+    if find_columnar_copy(shared_path):
+        for path in columnar_parts(columnar_path_for(shared_path)):
+            target = source_path + path[len(shared_path):]
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy(path, target)
+        file_obj.columnar_file.name = os.path.relpath(columnar_path_for(source_path), storage.location)
+    return source_path
+
+
+def _own_profile(file_obj):
+    """The record's profile, cloned first if other uploads share it; it no longer matches a content hash"""
+    profile = file_obj.profile
+    if profile.uploads.exclude(pk=file_obj.pk).exists():
+        profile.pk = None
+        profile._state.adding = True
+    profile.fingerprint = f'upload:{file_obj.pk}'
+    return profile
+
+
+def update_profile(profile, rows):
+    """Fold appended rows into a stored profile in time proportional to the new rows
+
+    Null counts, moments, histograms, quantile sketches, correlation sums and
+    time-series aggregates are merged with state computed from the new rows
+    only. Distinct counts cannot be maintained this way, so cardinalities become
+    unknown (None), as they are for streamed datasets.
+    """
+    by_name = {str(name): name for name in rows.columns}
+    for column in profile.columns:
+        series = rows[by_name[column['name']]]
+        column['missing'] += int(series.isna().sum())
+        column['cardinality'] = None
+        if column['kind'] != 'numeric':
+            continue
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        column['moments'] = MomentAccumulator.from_dict(column['moments']).update(values).to_dict()
+        for key, accumulator in (('histogram', HistogramAccumulator), ('sketch', QuantileSketch)):
+            if column.get(key):
+                column[key] = accumulator.from_dict(column[key]).update(values).to_dict()
+    
+    if profile.correlation is not None:
+        correlation = CorrelationAccumulator.from_dict(profile.correlation)
+        block = rows[[by_name[name] for name in correlation.columns]].to_numpy(dtype=np.float64, na_value=np.nan)
+        profile.correlation = correlation.update(block).to_dict()
+    
+    if profile.time_series is not None:
+        profile.time_series = TimeSeriesPyramid.from_dict(profile.time_series).update(rows).to_dict()
+    
+    profile.n_rows += len(rows)
+    profile.memory_before = profile.memory_after = None
+    profile.save()
+    return profile
+
+
+def _write_appended_rows(file_obj, rows, payload, staged_part):
+    """Write rows recorded by a committed append to the stored CSV file and its derived copies
+
+    Runs once the transaction that updated the profile has committed, holding the
+    record's lock so concurrent appends write their rows in turn. The CSV file is
+    extended first, then the column store, and the Parquet part staged before the
+    commit is moved into place, so the derived copies stay newer than the file.
+    If the CSV file cannot be written it is cut back to its old length and the
+    profile, which already counts the rows, is dropped to be rebuilt from the
+    file. A derived copy that cannot be extended is removed instead.
+    """
+    source_path = file_obj.file.path
+    with transaction.atomic():
+        record = type(file_obj).objects.select_for_update().get(pk=file_obj.pk)
+        original_stat = os.stat(source_path)
+        try:
+            with open(source_path, 'ab+') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(payload)
+        except OSError as e:
+            logger.error("Appending rows to %s failed: %s", record.original_name, e)
+            _discard_append(record, source_path, original_stat, staged_part)
+            return
+        record.file_size = os.path.getsize(source_path)
+        
+        dtypes = {}
+        if record.column_store:
+            try:
+                dtypes = append_column_store(rows.rename(columns=str), source_path)
+            except Exception as e:
+                logger.warning("Column store append failed for %s: %s", record.original_name, e)
+                remove_column_store(source_path)
+                record.column_store = ''
+        
+        if record.columnar_file:
+            try:
+                if staged_part is not None:
+                    publish_columnar_part(staged_part, source_path)
+                else:
+                    # A column changed to a type its stored one cannot widen to, so rebuild the copy
+                    data, error = load_csv_file(source_path, prefer_columnar=False, dialect=dict(record.csv_dialect))
+                    if data is None:
+                        raise ValueError(error)
+                    write_columnar_copy(data, source_path)
+            except Exception as e:
+                logger.warning("Columnar append failed for %s: %s", record.original_name, e)
+                remove_columnar_copy(source_path)
+                record.columnar_file.name = ''
+        record.save(update_fields=['file_size', 'column_store', 'columnar_file'])
+        
+        # Integer columns of the column store may have been widened to hold the new values
+        profile = record.profile
+        if profile is not None and dtypes:
+            for column in profile.columns:
+                if column['name'] in dtypes:
+                    column['dtype'] = str(np.dtype(dtypes[column['name']]))
+            profile.save(update_fields=['columns'])
+    
+    dataset_cache.invalidate_path(source_path)
+
+
+def _discard_append(record, source_path, original_stat, staged_part):
+    """Undo the file side of a failed append and drop the profile that already counts its rows"""
+    try:
+        with open(source_path, 'r+b') as f:
+            f.truncate(original_stat.st_size)
+        # Same contents, same mtime: the derived copies stay current
+        os.utime(source_path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+    except OSError as e:
+        logger.error("Unable to restore %s after a failed append: %s", record.original_name, e)
+    if staged_part is not None and os.path.isfile(staged_part):
+        os.remove(staged_part)
+    
+    profile = record.profile
+    record.profile = None
+    record.file_size = os.path.getsize(source_path)
+    record.save(update_fields=['profile', 'file_size'])
+    if profile is not None and not profile.uploads.exists():
+        profile.delete()
+    dataset_cache.invalidate_path(source_path)
+
+
+def _remove_staged_files(staged_part, detached_path):
+    """Delete the files an append wrote before a commit that did not happen"""
+    if staged_part is not None:
+        if os.path.isfile(staged_part):
+            os.remove(staged_part)
+        try:
+            os.rmdir(os.path.dirname(staged_part))
+        except OSError:
+            # Earlier parts are still in it
+            pass
+    if detached_path is not None:
+        if os.path.isfile(detached_path):
+            os.remove(detached_path)
+        remove_column_store(detached_path)
+        remove_columnar_copy(detached_path)
+
+
+def append_to_upload(file_obj, content):
+    """Append CSV rows (bytes or text, header included when the dataset has one) to an upload
+
+    The rows are parsed with the upload's dialect and the profile is updated from
+    the new rows alone, so the cost is proportional to the rows appended. The new
+    rows are also staged as a part of the Parquet copy before the commit; once the
+    database work has committed they are written to the end of the stored CSV file
+    and its column store and the part is moved into place. A stored file shared
+    with deduplicated uploads is copied first. Returns (rows_appended, error).
+    """
+    detached_path = staged_part = None
+    try:
+        with transaction.atomic():
+            file_obj = type(file_obj).objects.select_for_update().get(pk=file_obj.pk)
+            source_path = file_obj.file.path
+            if source_path.lower().endswith(('.xlsx', '.xls')):
+                return None, "Rows can only be appended to CSV uploads"
+            dialect = file_obj.csv_dialect or sniff_csv(source_path)
+            if dialect['encoding'] == 'utf-16':
+                return None, "Rows cannot be appended to UTF-16 files"
+            
+            if isinstance(content, bytes):
+                try:
+                    content = content.decode(dialect['encoding'])
+                except UnicodeDecodeError:
+                    content = content.decode('latin-1')
+            try:
+                columns = read_csv_with_dialect(source_path, dict(dialect), nrows=0).columns
+                rows = pd.read_csv(
+                    io.StringIO(content), sep=dialect['delimiter'],
+                    header=0 if dialect['header'] else None, decimal=dialect['decimal']
+                )
+            except (ValueError, pd.errors.ParserError) as e:
+                return None, f"Unable to parse appended rows: {str(e)}"
+            
+            if dialect['header']:
+                if set(map(str, rows.columns)) != set(map(str, columns)):
+                    return None, f"Appended rows must have the columns: {', '.join(map(str, columns))}"
+                rows = rows[list(columns)]
+            elif len(rows.columns) != len(columns):
+                return None, f"Appended rows must have {len(columns)} columns"
+            else:
+                rows.columns = columns
+            if len(rows) == 0:
+                return 0, None
+            
+            profile = file_obj.profile
+            if profile is not None:
+                by_name = {str(name): name for name in rows.columns}
+                for column in profile.columns:
+                    series = rows[by_name[column['name']]]
+                    if column['kind'] == 'numeric' and series.notna().any() and column_kind(series) != 'numeric':
+                        return None, f"Column {column['name']} only accepts numeric values"
+            
+            if file_obj.is_shared():
+                source_path = detached_path = _detach_shared_blob(file_obj)
+            if file_obj.columnar_file and find_columnar_copy(source_path):
+                try:
+                    staged_part = stage_columnar_part(rows, source_path)
+                except (ValueError, TypeError, ArrowException) as e:
+                    # The copy is rebuilt from the CSV file after the commit instead
+                    logger.info("New rows do not fit the Parquet copy of %s: %s", file_obj.original_name, e)
+            
+            encoding = 'utf-8' if dialect['encoding'] == 'utf-8-sig' else dialect['encoding']
+            payload = rows.to_csv(
+                sep=dialect['delimiter'], decimal=dialect['decimal'],
+                header=False, index=False, lineterminator='\n'
+            ).encode(encoding)
+            
+            if profile is not None:
+                file_obj.profile = update_profile(_own_profile(file_obj), rows)
+            
+            file_obj.csv_dialect = dialect
+            # The content no longer matches its hash, so new uploads must not be deduplicated onto it
+            file_obj.content_hash = ''
+            file_obj.save(update_fields=[
+                'file', 'csv_dialect', 'columnar_file', 'column_store', 'profile', 'content_hash'
+            ])
+            transaction.on_commit(partial(_write_appended_rows, file_obj, rows, payload, staged_part))
+    except OSError as e:
+        _remove_staged_files(staged_part, detached_path)
+        return None, f"Unable to store appended rows: {str(e)}"
+    except Exception:
+        _remove_staged_files(staged_part, detached_path)
+        raise
+    
+    return len(rows), None
@@ -0,0 +1,138 @@
+import math
+
+import numpy as np
+
+
+SUMMARY_QUANTILES = (0.25, 0.5, 0.75)
+_EPS = np.finfo(np.float64).eps
+
+
+def moment_sums(block, mask):
+    """Per-column valid counts, means and central moment sums of a 2-D block"""
+    has_missing = bool(mask.any())
+    n = block.shape[0] - mask.sum(axis=0) if has_missing else np.full(block.shape[1], block.shape[0])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (np.where(mask, 0.0, block) if has_missing else block).sum(axis=0) / n
+        delta = block - mean
+    if has_missing:
+        delta[mask] = 0.0
+    delta2 = delta * delta
+    return n, mean, delta2.sum(axis=0), (delta2 * delta).sum(axis=0), (delta2 * delta2).sum(axis=0)
+
+
+def _interpolate(ordered, n, q):
+    """Linear-interpolated quantile of the first n ordered values (pandas' default method)"""
+    position = q * (n - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, n - 1)
+    fraction = position - lower
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * fraction)
+
+
+def _quantile_ranks(n):
+    """Order-statistic ranks needed for min, max and the summary quantiles"""
+    ranks = {0, n - 1}
+    for q in SUMMARY_QUANTILES:
+        lower = math.floor(q * (n - 1))
+        ranks.update((lower, min(lower + 1, n - 1)))
+    return sorted(ranks)
+
+
+def _statistics(count, n, mean, m2, m3, m4, ordered, has_missing):
+    """Assemble the get_summary_statistics dictionary for one column"""
+    n = int(n)
+    if n == 0:
+        nan = math.nan
+        return {
+            'count': count, 'mean': nan, 'median': nan, 'std': nan, 'var': nan,
+            'min': nan, 'max': nan, 'q25': nan, 'q75': nan, 'skewness': nan, 'kurtosis': nan,
+        }
+
+    var = m2 / (n - 1) if n > 1 else math.nan
+    # scipy.stats propagates NaN and treats (numerically) constant data as undefined
+    biased_m2 = m2 / n
+    if has_missing or biased_m2 <= (_EPS * mean) ** 2:
+        skewness = kurtosis = math.nan
+    else:
+        skewness = (m3 / n) / biased_m2 ** 1.5
+        kurtosis = (m4 / n) / (biased_m2 * biased_m2) - 3.0
+
+    return {
+        'count': count,
+        'mean': float(mean),
+        'median': _interpolate(ordered, n, 0.5),
+        'std': math.sqrt(var) if n > 1 else math.nan,
+        'var': float(var),
+        'min': float(ordered[0]),
+        'max': float(ordered[n - 1]),
+        'q25': _interpolate(ordered, n, 0.25),
+        'q75': _interpolate(ordered, n, 0.75),
+        'skewness': float(skewness),
+        'kurtosis': float(kurtosis),
+    }
+
+
+def describe_array(values):
+    """Summary statistics of a 1-D array from one moment pass and one partition
+
+    Returns the same values as the pandas/scipy calls in get_summary_statistics:
+    NaNs are skipped, except by skewness and kurtosis, which propagate them like
+    scipy.stats does. count is the length including missing values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mask = np.isnan(values)
+    has_missing = bool(mask.any())
+    n, mean, m2, m3, m4 = moment_sums(values.reshape(-1, 1), mask.reshape(-1, 1))
+
+    valid = values[~mask] if has_missing else values
+    # A single partition places every needed order statistic, instead of a sort per quantile
+    ordered = np.partition(valid, _quantile_ranks(len(valid))) if len(valid) else valid
+    return _statistics(len(values), n[0], mean[0], m2[0], m3[0], m4[0], ordered, has_missing)
+
+
+def describe_block(block):
+    """Summary statistics for every column of a 2-D float array in one call
+
+    Moments for all columns come from one vectorized pass and order statistics
+    from one sort along the rows (NaNs sort last, so each column's valid values
+    are its leading entries). Returns one describe_array-style dict per column.
+    """
+    block = np.asarray(block, dtype=np.float64)
+    mask = np.isnan(block)
+    n, mean, m2, m3, m4 = moment_sums(block, mask)
+    ordered = np.sort(block, axis=0)
+    missing = mask.any(axis=0)
+    return [
+        _statistics(block.shape[0], n[j], mean[j], m2[j], m3[j], m4[j], ordered[:, j], bool(missing[j]))
+        for j in range(block.shape[1])
+    ]
+
+
+def box_summary(values, max_outliers=100):
+    """Quartiles, Tukey whiskers and a sample of outliers of a 1-D array, or None when it has no finite values
+
+    Quartiles are linear-interpolated (Plotly's default quartile method) from one
+    partition; the whiskers end at the most extreme values within 1.5 IQR of the
+    box. At most max_outliers outliers are kept, evenly spaced by rank so the
+    most extreme ones on both sides are always included.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    n = len(values)
+    if n == 0:
+        return None
+    ordered = np.partition(values, _quantile_ranks(n))
+    q1, median, q3 = (_interpolate(ordered, n, q) for q in SUMMARY_QUANTILES)
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (values >= low) & (values <= high)
+    outliers = np.sort(values[~inside])
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(np.int64)]
+    return {
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': float(values[inside].min()), 'upperfence': float(values[inside].max()),
+        'mean': float(values.mean()),
+        'outliers': outliers,
+        'n_outliers': int(n - inside.sum()),
+    }
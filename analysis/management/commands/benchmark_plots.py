@@ -0,0 +1,71 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from analysis.figures import to_plotly_figure
+from analysis.randomdata import generate_random_data
+from analysis.utils import (
+    create_boxplot_plotly, create_confusion_matrix_plotly, create_correlation_plot_plotly,
+    create_histogram_plotly, create_qq_plot_plotly, create_svm_metrics_plot
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time building and serializing each dashboard figure as a lean spec (one JSON encoding) "
+        "against the previous path: a validated go.Figure, fig.to_json() and a second JSON encoding"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Rows of random data to plot')
+        parser.add_argument('--columns', type=int, default=20, help='Columns in the correlation heatmap')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the fastest is reported')
+
+    def handle(self, *args, **options):
+        data = generate_random_data(options['rows'])
+        rng = np.random.default_rng(0)
+        wide = pd.DataFrame(
+            rng.standard_normal((max(options['rows'] // options['columns'], 2), options['columns'])),
+            columns=[f'c{k}' for k in range(options['columns'])]
+        )
+        confusion = rng.integers(0, 100, size=(4, 4)).tolist()
+        builders = {
+            'histogram': lambda: create_histogram_plotly(data, 'x', 30, 'blue'),
+            'boxplot': lambda: create_boxplot_plotly(data),
+            'qqplot': lambda: create_qq_plot_plotly(data, 'x'),
+            'correlation': lambda: create_correlation_plot_plotly(wide),
+            'confusion_matrix': lambda: create_confusion_matrix_plotly(confusion, ['a', 'b', 'c', 'd']),
+            'metrics_chart': lambda: create_svm_metrics_plot(
+                {'accuracy': 0.9, 'precision': 0.8, 'recall': 0.7, 'f1_score': 0.75}
+            ),
+        }
+
+        self.stdout.write(
+            f"{'plot':<18}{'lean ms':>10}{'go.Figure ms':>14}{'speedup':>9}{'lean bytes':>12}{'go.Figure bytes':>17}"
+        )
+        for name, build in builders.items():
+            def lean():
+                return json.dumps({name: build()}, cls=DjangoJSONEncoder)
+
+            def validated():
+                # The builders used to return fig.to_json(), which JsonResponse then encoded again
+                return json.dumps({name: to_plotly_figure(build()).to_json()}, cls=DjangoJSONEncoder)
+
+            lean_seconds, lean_payload = self._time(lean, options['repeat'])
+            validated_seconds, validated_payload = self._time(validated, options['repeat'])
+            self.stdout.write(
+                f"{name:<18}{lean_seconds * 1000:>10.2f}{validated_seconds * 1000:>14.2f}"
+                f"{validated_seconds / lean_seconds:>8.1f}x{len(lean_payload):>12,}{len(validated_payload):>17,}"
+            )
+
+    def _time(self, run, repeat):
+        best, result = float('inf'), None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - start)
+        return best, result
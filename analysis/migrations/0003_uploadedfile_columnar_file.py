@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0002_analysissession_svm_kernel_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='columnar_file',
+            field=models.FileField(blank=True, upload_to='uploads/'),
+        ),
+    ]
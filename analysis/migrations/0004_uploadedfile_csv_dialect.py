@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0003_uploadedfile_columnar_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='csv_dialect',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0004_uploadedfile_csv_dialect'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='column_store',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0005_uploadedfile_column_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=128, unique=True)),
+                ('source_name', models.CharField(max_length=255)),
+                ('n_rows', models.BigIntegerField()),
+                ('n_columns', models.IntegerField()),
+                ('columns', models.JSONField(default=list)),
+                ('memory_before', models.BigIntegerField(blank=True, null=True)),
+                ('memory_after', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='profile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploads', to='analysis.datasetprofile'),
+        ),
+    ]
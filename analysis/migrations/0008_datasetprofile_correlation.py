@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0007_uploadedfile_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetprofile',
+            name='correlation',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0008_datasetprofile_correlation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='correlation_method',
+            field=models.CharField(choices=[('pearson', 'Pearson'), ('spearman', 'Spearman'), ('kendall', 'Kendall')], default='pearson', max_length=20),
+        ),
+    ]
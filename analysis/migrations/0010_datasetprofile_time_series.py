@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0009_analysissession_correlation_method'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetprofile',
+            name='time_series',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
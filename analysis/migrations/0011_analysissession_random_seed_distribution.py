@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0010_datasetprofile_time_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='random_distribution',
+            field=models.CharField(choices=[('normal', 'Normal'), ('uniform', 'Uniform'), ('exponential', 'Exponential'), ('lognormal', 'Log-normal'), ('student_t', "Student's t (5 df)")], default='normal', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='analysissession',
+            name='random_seed',
+            field=models.IntegerField(default=123),
+        ),
+    ]
@@ -1,6 +1,131 @@
 from django.db import models
 from django.core.validators import FileExtensionValidator
+import hashlib
 import os
+from .cache import dataset_cache
+from .columnstore import remove_column_store
+from .utils import remove_columnar_copy
+from .streaming import (
+    CorrelationAccumulator, HistogramAccumulator, MomentAccumulator, QuantileSketch, StreamingSummary
+)
+
+
+class DatasetProfile(models.Model):
+    """Schema and per-column statistics computed once when a dataset is ingested"""
+    fingerprint = models.CharField(max_length=128, unique=True)
+    source_name = models.CharField(max_length=255)
+    n_rows = models.BigIntegerField()
+    n_columns = models.IntegerField()
+    # One entry per column: name, dtype, kind, missing, cardinality and (numeric kind only)
+    # the moments, histogram and quantile sketch state
+    columns = models.JSONField(default=list)
+    # Pairwise correlation sums over the numeric columns (CorrelationAccumulator state)
+    correlation = models.JSONField(null=True, blank=True)
+    # Weekly/monthly/yearly aggregates when the dataset has a date column (TimeSeriesPyramid state)
+    time_series = models.JSONField(null=True, blank=True)
+    memory_before = models.BigIntegerField(null=True, blank=True)
+    memory_after = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-updated_at']
+    
+    def __str__(self):
+        return f"Profile of {self.source_name} ({self.n_rows} rows)"
+    
+    @property
+    def column_names(self):
+        return [column['name'] for column in self.columns]
+    
+    @property
+    def numeric_columns(self):
+        return [column['name'] for column in self.columns if column['kind'] == 'numeric']
+    
+    @property
+    def categorical_columns(self):
+        return [column['name'] for column in self.columns if column['kind'] == 'categorical']
+    
+    @property
+    def datetime_columns(self):
+        return [column['name'] for column in self.columns if column['kind'] == 'datetime']
+    
+    def column(self, name):
+        return next((column for column in self.columns if column['name'] == name), None)
+    
+    @property
+    def has_streaming_state(self):
+        """Whether every numeric column carries the state needed by streaming_summary()"""
+        return self.correlation is not None and all(
+            column.get('moments') and column.get('histogram') and column.get('sketch')
+            for column in self.columns if column['kind'] == 'numeric'
+        )
+    
+    def streaming_summary(self, preview=None):
+        """Rebuild the StreamingSummary of the dataset from the stored state, without reading it"""
+        summary = StreamingSummary()
+        summary.n_rows = self.n_rows
+        for column in self.columns:
+            name = column['name']
+            summary.dtypes[name] = column['dtype']
+            summary.missing[name] = column['missing']
+            if column['kind'] == 'numeric':
+                summary.moments[name] = MomentAccumulator.from_dict(column['moments'])
+                summary.histograms[name] = HistogramAccumulator.from_dict(column['histogram'])
+                summary.sketches[name] = QuantileSketch.from_dict(column['sketch'])
+        if self.correlation is not None:
+            summary.correlation = CorrelationAccumulator.from_dict(self.correlation)
+        summary.preview = preview
+        return summary
+    
+    def data_info(self):
+        """Dataset information in the shape returned by utils.get_data_info"""
+        return {
+            'shape': (self.n_rows, self.n_columns),
+            'columns': self.column_names,
+            'dtypes': {column['name']: column['dtype'] for column in self.columns},
+            'missing_values': {column['name']: column['missing'] for column in self.columns},
+            'numeric_columns': self.numeric_columns,
+            'categorical_columns': self.categorical_columns,
+            'datetime_columns': self.datetime_columns,
+            'memory_before': self.memory_before,
+            'memory_after': self.memory_after,
+        }
+
+
+class UploadedFileManager(models.Manager):
+    def create_from_upload(self, uploaded_file):
+        """Store an upload, sharing the blob of any earlier upload with identical content
+
+        Returns (file_obj, created). When created is False the new record points at
+        an existing stored file and reuses its dialect, derived copies and profile,
+        so the caller can skip the ingest stage.
+        """
+        hasher = hashlib.sha256()
+        for chunk in uploaded_file.chunks():
+            hasher.update(chunk)
+        uploaded_file.seek(0)
+        content_hash = hasher.hexdigest()
+
+        existing = self.filter(content_hash=content_hash).order_by('uploaded_at').first()
+        if existing is not None and existing.file and existing.file.storage.exists(existing.file.name):
+            return self.create(
+                file=existing.file.name,
+                original_name=uploaded_file.name,
+                file_size=uploaded_file.size,
+                content_hash=content_hash,
+                columnar_file=existing.columnar_file.name,
+                csv_dialect=existing.csv_dialect,
+                column_store=existing.column_store,
+                profile=existing.profile,
+            ), False
+
+        return self.create(
+            file=uploaded_file,
+            original_name=uploaded_file.name,
+            file_size=uploaded_file.size,
+            content_hash=content_hash,
+        ), True
 
 
 class UploadedFile(models.Model):
@@ -12,6 +137,17 @@ class UploadedFile(models.Model):
     original_name = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     file_size = models.IntegerField()
+    # SHA-256 of the upload; records with equal hashes share one stored file
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    # Typed Parquet copy written at ingest; preferred over re-parsing the original
+    columnar_file = models.FileField(upload_to='uploads/', blank=True)
+    # Sniffed CSV conventions (encoding, delimiter, header, decimal) reused on every parse
+    csv_dialect = models.JSONField(null=True, blank=True)
+    # Directory (relative to MEDIA_ROOT) of the memory-mapped numeric column store
+    column_store = models.CharField(max_length=500, blank=True, default='')
+    profile = models.ForeignKey(DatasetProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+    
+    objects = UploadedFileManager()
     
     class Meta:
         ordering = ['-uploaded_at']
@@ -19,12 +155,35 @@ class UploadedFile(models.Model):
     def __str__(self):
         return f"{self.original_name} ({self.uploaded_at.strftime('%Y-%m-%d %H:%M')})"
     
+    def save(self, *args, **kwargs):
+        # Drop cached parses of the previous file when the stored file is replaced
+        if self.pk:
+            previous = UploadedFile.objects.filter(pk=self.pk).values_list('file', flat=True).first()
+            if previous and previous != self.file.name:
+                dataset_cache.invalidate_path(self.file.storage.path(previous))
+        super().save(*args, **kwargs)
+    
+    def is_shared(self):
+        """Whether another record points at the same stored file"""
+        return bool(self.file) and UploadedFile.objects.filter(file=self.file.name).exclude(pk=self.pk).exists()
+    
     def delete(self, *args, **kwargs):
+        # Keep the stored file and its derived copies while other records still reference them
+        if self.is_shared():
+            return super().delete(*args, **kwargs)
+        
         # Delete the file from filesystem when model is deleted
+        profile = self.profile
         if self.file:
+            dataset_cache.invalidate_path(self.file.path)
+            remove_column_store(self.file.path)
+            remove_columnar_copy(self.file.path)
             if os.path.isfile(self.file.path):
                 os.remove(self.file.path)
-        super().delete(*args, **kwargs)
+        result = super().delete(*args, **kwargs)
+        if profile is not None and not profile.uploads.exists():
+            profile.delete()
+        return result
 
 
 class AnalysisSession(models.Model):
@@ -36,12 +195,25 @@ class AnalysisSession(models.Model):
         ('local', 'Tumor Dataset')
     ])
     sample_size = models.IntegerField(null=True, blank=True)
+    random_distribution = models.CharField(max_length=20, default='normal', choices=[
+        ('normal', 'Normal'),
+        ('uniform', 'Uniform'),
+        ('exponential', 'Exponential'),
+        ('lognormal', 'Log-normal'),
+        ('student_t', "Student's t (5 df)")
+    ])
+    random_seed = models.IntegerField(default=123)
     selected_column = models.CharField(max_length=100, null=True, blank=True)
     color = models.CharField(max_length=20, default='blue')
     bins = models.IntegerField(default=30)
     show_plot = models.BooleanField(default=True)
     show_stats = models.BooleanField(default=True)
     show_correlation = models.BooleanField(default=True)
+    correlation_method = models.CharField(max_length=20, default='pearson', choices=[
+        ('pearson', 'Pearson'),
+        ('spearman', 'Spearman'),
+        ('kendall', 'Kendall')
+    ])
     # SVM configuration fields
     svm_target_column = models.CharField(max_length=100, null=True, blank=True)
     svm_kernel = models.CharField(max_length=20, default='rbf', choices=[
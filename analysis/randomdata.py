@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from .streaming import StreamingSummary
+
+
+RANDOM_COLUMNS = ('x', 'y', 'z')
+DEFAULT_RANDOM_SEED = 123
+DEFAULT_DISTRIBUTION = 'normal'
+# Rows drawn per chunk; fixed so the values do not depend on how a sample is consumed
+RANDOM_CHUNK_ROWS = 1000000
+RANDOM_DISTRIBUTIONS = {
+    'normal': lambda rng, size: rng.standard_normal(size),
+    'uniform': lambda rng, size: rng.random(size),
+    'exponential': lambda rng, size: rng.standard_exponential(size),
+    'lognormal': lambda rng, size: rng.lognormal(0.0, 1.0, size),
+    'student_t': lambda rng, size: rng.standard_t(5, size),
+}
+
+
+def iter_random_chunks(sample_size, seed=DEFAULT_RANDOM_SEED, distribution=DEFAULT_DISTRIBUTION):
+    """Yield a random dataset of sample_size rows as DataFrames of at most RANDOM_CHUNK_ROWS rows
+
+    Every column of every chunk draws from its own numpy Generator, spawned from
+    `seed` by chunk and column index, so the same (seed, size, distribution)
+    always gives the same values, a smaller sample is a prefix of a larger one,
+    and any prefix of chunks can be generated without the rest.
+    """
+    if distribution not in RANDOM_DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    draw = RANDOM_DISTRIBUTIONS[distribution]
+    n_chunks = -(-sample_size // RANDOM_CHUNK_ROWS)
+    for index, chunk_seed in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        size = min(RANDOM_CHUNK_ROWS, sample_size - index * RANDOM_CHUNK_ROWS)
+        column_seeds = chunk_seed.spawn(len(RANDOM_COLUMNS))
+        yield pd.DataFrame({
+            name: draw(np.random.default_rng(column_seed), size)
+            for name, column_seed in zip(RANDOM_COLUMNS, column_seeds)
+        }, copy=False)
+
+
+def generate_random_data(sample_size=1000, seed=DEFAULT_RANDOM_SEED, distribution=DEFAULT_DISTRIBUTION):
+    """Generate a random x/y/z dataset in memory (normal by default, like R's rnorm)"""
+    chunks = list(iter_random_chunks(sample_size, seed, distribution))
+    if not chunks:
+        return pd.DataFrame({name: np.empty(0) for name in RANDOM_COLUMNS})
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def summarize_random(sample_size, seed=DEFAULT_RANDOM_SEED, distribution=DEFAULT_DISTRIBUTION):
+    """StreamingSummary of a random dataset, drawn chunk by chunk without materialising it"""
+    summary = StreamingSummary()
+    for chunk in iter_random_chunks(sample_size, seed, distribution):
+        summary.update(chunk)
+    return summary
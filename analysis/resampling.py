@@ -0,0 +1,193 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+RESAMPLING_METHODS = ('bootstrap', 'permutation')
+RESAMPLING_STATISTICS = ('mean', 'median')
+DEFAULT_RESAMPLES = 10000
+# Resamples per task; fixed so results do not depend on how tasks are spread over workers
+RESAMPLE_CHUNK = 1000
+# Upper bound on the elements of one index matrix (about 32MB of int64 indices)
+MAX_BATCH_ELEMENTS = 2 ** 22
+# Below this many resampled elements in total the pool's start-up cost outweighs the gain
+PARALLEL_MIN_ELEMENTS = 2 ** 25
+
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+
+def _statistic(samples, statistic):
+    """Row-wise statistic of a (resamples x observations) matrix"""
+    if statistic == 'median':
+        return np.median(samples, axis=1)
+    return samples.mean(axis=1)
+
+
+def _resample_chunk(kind, statistic, samples, size, seed):
+    """Statistics of `size` resamples drawn with one seed; runs in worker processes
+
+    kind is 'bootstrap' (samples = (x,)), 'bootstrap_difference' (samples = (x, y)),
+    'sign_flip' (samples = (x - test_value,)) or 'permutation' (samples = (x, y)).
+    Each batch of resamples is a single index (or sign) matrix, so thousands of
+    resamples are evaluated per NumPy call.
+    """
+    rng = np.random.default_rng(seed)
+    n = sum(len(sample) for sample in samples)
+    batch = max(1, MAX_BATCH_ELEMENTS // max(n, 1))
+    result = np.empty(size)
+    for start in range(0, size, batch):
+        count = min(batch, size - start)
+        if kind == 'bootstrap':
+            x, = samples
+            values = _statistic(x[rng.integers(0, len(x), (count, len(x)))], statistic)
+        elif kind == 'bootstrap_difference':
+            x, y = samples
+            values = (_statistic(x[rng.integers(0, len(x), (count, len(x)))], statistic)
+                      - _statistic(y[rng.integers(0, len(y), (count, len(y)))], statistic))
+        elif kind == 'sign_flip':
+            x, = samples
+            signs = rng.integers(0, 2, (count, len(x))) * 2 - 1
+            values = _statistic(signs * x, statistic)
+        elif kind == 'permutation':
+            x, y = samples
+            shuffled = rng.permuted(np.broadcast_to(np.concatenate([x, y]), (count, len(x) + len(y))), axis=1)
+            values = _statistic(shuffled[:, :len(x)], statistic) - _statistic(shuffled[:, len(x):], statistic)
+        else:
+            raise ValueError(f"Unknown resampling kind: {kind}")
+        result[start:start + count] = values
+    return result
+
+
+def get_executor(workers):
+    """Process pool shared by all requests, recreated only when the worker count changes"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # forkserver avoids forking a multi-threaded web server process
+            _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('forkserver'))
+            _executor_workers = workers
+        return _executor
+
+
+def iter_resampled_statistics(kind, samples, statistic, n_resamples, seed=0, workers=1):
+    """Yield (completed, total, statistics) as resample chunks finish
+
+    statistics is None until the last item, which carries all n_resamples values.
+    Chunk seeds are spawned from `seed` by chunk index, so results are identical
+    whether chunks run serially or across a process pool of any size.
+    """
+    samples = tuple(np.ascontiguousarray(sample, dtype=np.float64) for sample in samples)
+    sizes = [min(RESAMPLE_CHUNK, n_resamples - start) for start in range(0, n_resamples, RESAMPLE_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    results = [None] * len(sizes)
+    elements = n_resamples * sum(len(sample) for sample in samples)
+
+    if workers > 1 and len(sizes) > 1 and elements >= PARALLEL_MIN_ELEMENTS:
+        executor = get_executor(workers)
+        futures = {
+            executor.submit(_resample_chunk, kind, statistic, samples, size, chunk_seed): index
+            for index, (size, chunk_seed) in enumerate(zip(sizes, seeds))
+        }
+        completed = 0
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            completed += len(results[futures[future]])
+            if completed < n_resamples:
+                yield completed, n_resamples, None
+    else:
+        completed = 0
+        for index, (size, chunk_seed) in enumerate(zip(sizes, seeds)):
+            results[index] = _resample_chunk(kind, statistic, samples, size, chunk_seed)
+            completed += size
+            if completed < n_resamples:
+                yield completed, n_resamples, None
+
+    yield n_resamples, n_resamples, np.concatenate(results) if results else np.empty(0)
+
+
+def iter_resampling(x, y=None, method='bootstrap', statistic='mean', n_resamples=DEFAULT_RESAMPLES,
+                    confidence=0.95, test_value=0.0, seed=0, workers=1):
+    """Run a bootstrap or permutation analysis, yielding progress events and then the result
+
+    With one sample, the bootstrap gives a percentile confidence interval for the
+    statistic and the permutation test is a sign-flip test of the statistic
+    against test_value (assuming symmetry about it). With two samples both work
+    on the difference of the statistic between x and y: a bootstrap interval for
+    the difference and a label-permutation p-value for no difference. Events are
+    dicts: {'progress': fraction} while running, then {'result': {...}}.
+
+    Arguments are validated before the generator is returned, so bad input
+    raises ValueError here rather than part-way through a streamed response.
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unknown resampling method: {method}")
+    if statistic not in RESAMPLING_STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}")
+    if n_resamples < 1:
+        raise ValueError("At least one resample is required")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    if seed < 0:
+        raise ValueError("The seed must be a non-negative integer")
+    x = np.asarray(x, dtype=np.float64)
+    x = x[~np.isnan(x)]
+    if y is not None:
+        y = np.asarray(y, dtype=np.float64)
+        y = y[~np.isnan(y)]
+    if len(x) < 2 or (y is not None and len(y) < 2):
+        raise ValueError("At least 2 values per sample are required for resampling")
+
+    observed = _statistic(x[np.newaxis, :], statistic)[0]
+    if y is not None:
+        observed -= _statistic(y[np.newaxis, :], statistic)[0]
+
+    if method == 'bootstrap':
+        kind, samples = ('bootstrap', (x,)) if y is None else ('bootstrap_difference', (x, y))
+    elif y is None:
+        kind, samples = 'sign_flip', (x - test_value,)
+    else:
+        kind, samples = 'permutation', (x, y)
+
+    return _resampling_events(kind, samples, x, y, method, statistic, observed, n_resamples,
+                              confidence, test_value, seed, workers)
+
+
+def _resampling_events(kind, samples, x, y, method, statistic, observed, n_resamples,
+                       confidence, test_value, seed, workers):
+    for completed, total, values in iter_resampled_statistics(kind, samples, statistic, n_resamples, seed, workers):
+        if values is None:
+            yield {'progress': completed / total}
+
+    result = {
+        'method': method,
+        'statistic': statistic,
+        'observed': float(observed),
+        'n_resamples': n_resamples,
+        'seed': seed,
+        'n': len(x) if y is None else [len(x), len(y)],
+    }
+    if method == 'bootstrap':
+        tail = (1 - confidence) / 2
+        low, high = np.quantile(values, [tail, 1 - tail])
+        result.update({
+            'confidence': confidence,
+            'ci_low': float(low),
+            'ci_high': float(high),
+            'standard_error': float(values.std(ddof=1)),
+        })
+    else:
+        reference = observed - test_value if y is None else observed
+        # Relative tolerance so resamples equal to the observed value are not lost to rounding
+        extreme = np.count_nonzero(np.abs(values) >= abs(reference) * (1 - 1e-12))
+        # The +1 counts the observed arrangement, so p-values are never exactly zero
+        result.update({
+            'test_value': float(test_value) if y is None else 0.0,
+            'p_value': (extreme + 1) / (n_resamples + 1),
+        })
+    yield {'result': result}
@@ -0,0 +1,669 @@
+import math
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_HISTOGRAM_BINS = 1024
+DEFAULT_SKETCH_K = 200
+PREVIEW_ROWS = 100
+
+
+def sketch_seed(column):
+    """Fixed seed for a column's quantile sketch, so its compactions are the same on every run"""
+    return zlib.crc32(str(column).encode())
+
+
+class MomentAccumulator:
+    """Mergeable running count, mean, central moments, min/max and missing count
+
+    Uses the pairwise update formulas of Chan et al. / Pébay, so chunks (or workers)
+    can be summarised independently and merged without loss of precision.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.missing = 0
+
+    @classmethod
+    def from_values(cls, values):
+        acc = cls()
+        acc.update(values)
+        return acc
+
+    def update(self, values):
+        """Fold a batch of values into the accumulator"""
+        values = np.asarray(values, dtype=np.float64)
+        mask = np.isnan(values)
+        missing = int(mask.sum())
+        if missing:
+            values = values[~mask]
+        batch = MomentAccumulator()
+        batch.missing = missing
+        if len(values):
+            mean = values.mean()
+            delta = values - mean
+            delta2 = delta * delta
+            batch.n = len(values)
+            batch.mean = float(mean)
+            batch.m2 = float(delta2.sum())
+            batch.m3 = float((delta2 * delta).sum())
+            batch.m4 = float((delta2 * delta2).sum())
+            batch.min = float(values.min())
+            batch.max = float(values.max())
+        self.merge(batch)
+        return self
+
+    def merge(self, other):
+        """Combine another accumulator's state into this one"""
+        self.missing += other.missing
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean = other.n, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * na * nb
+
+        m4 = (self.m4 + other.m4
+              + term * delta_n2 * (na * na - na * nb + nb * nb)
+              + 6.0 * delta_n2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4.0 * delta_n * (na * other.m3 - nb * self.m3))
+        m3 = (self.m3 + other.m3
+              + term * delta_n * (na - nb)
+              + 3.0 * delta_n * (na * other.m2 - nb * self.m2))
+        m2 = self.m2 + other.m2 + term
+
+        self.n = n
+        self.mean = self.mean + delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def var(self):
+        """Sample variance (ddof=1), matching pandas"""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.var) if self.n > 1 else math.nan
+
+    @property
+    def skewness(self):
+        """Biased skewness, matching scipy.stats.skew defaults"""
+        if self.n == 0 or self.m2 == 0:
+            return math.nan
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self):
+        """Biased Fisher (excess) kurtosis, matching scipy.stats.kurtosis defaults"""
+        if self.n == 0 or self.m2 == 0:
+            return math.nan
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def to_dict(self):
+        """JSON-safe state (empty accumulators store None for min/max)"""
+        return {
+            'n': self.n, 'mean': self.mean, 'm2': self.m2, 'm3': self.m3, 'm4': self.m4,
+            'min': self.min if self.n else None, 'max': self.max if self.n else None,
+            'missing': self.missing,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        acc = cls()
+        for key, value in state.items():
+            setattr(acc, key, value)
+        if acc.min is None:
+            acc.min, acc.max = math.inf, -math.inf
+        return acc
+
+
+class HistogramAccumulator:
+    """Mergeable fixed-size histogram with power-of-two bin widths
+
+    Bins are aligned to multiples of 2**exponent, so two histograms can always be
+    brought to a common width and added. When new values fall outside the covered
+    span the width doubles (adjacent bins are merged) until everything fits within
+    max_bins, keeping memory constant regardless of row count.
+    """
+
+    def __init__(self, max_bins=DEFAULT_HISTOGRAM_BINS):
+        self.max_bins = max_bins
+        self.exponent = None
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def width(self):
+        return 2.0 ** self.exponent
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def _required_exponent(self, low, high):
+        span = high - low
+        if span <= 0:
+            # A single distinct value: pick a width relative to its magnitude
+            scale = abs(low) if low != 0 else 1.0
+            return math.floor(math.log2(scale)) - 20
+        # Leave two bins of slack for grid alignment at either end
+        return math.ceil(math.log2(span / (self.max_bins - 2)))
+
+    def _coarsen(self, steps):
+        if steps <= 0:
+            return
+        positions = (self.offset + np.arange(len(self.counts), dtype=np.int64)) >> steps
+        new_offset = self.offset >> steps
+        if len(self.counts):
+            self.counts = np.bincount(positions - new_offset, weights=self.counts).astype(np.int64)
+        self.offset = new_offset
+        self.exponent += steps
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        low = min(self.min, float(values.min()))
+        high = max(self.max, float(values.max()))
+        required = self._required_exponent(low, high)
+        if self.exponent is None:
+            self.exponent = required
+        elif required > self.exponent:
+            self._coarsen(required - self.exponent)
+        self.min, self.max = low, high
+
+        indices = np.floor(values / self.width).astype(np.int64)
+        self._add_indexed(indices, np.ones(len(indices), dtype=np.int64))
+        return self
+
+    def _add_indexed(self, indices, weights):
+        while True:
+            existing_high = self.offset + len(self.counts) - 1 if len(self.counts) else indices.max()
+            existing_low = self.offset if len(self.counts) else indices.min()
+            low = min(existing_low, indices.min())
+            high = max(existing_high, indices.max())
+            if high - low + 1 <= self.max_bins:
+                break
+            self._coarsen(1)
+            indices = indices >> 1
+        counts = np.zeros(high - low + 1, dtype=np.int64)
+        if len(self.counts):
+            start = self.offset - low
+            counts[start:start + len(self.counts)] = self.counts
+        counts += np.bincount(indices - low, weights=weights, minlength=len(counts)).astype(np.int64)
+        self.counts = counts
+        self.offset = int(low)
+
+    def merge(self, other):
+        if other.exponent is None:
+            return self
+        other_counts, other_offset = other.counts, other.offset
+        if self.exponent is None:
+            self.exponent = other.exponent
+        elif other.exponent > self.exponent:
+            self._coarsen(other.exponent - self.exponent)
+        if other.exponent < self.exponent:
+            shift = self.exponent - other.exponent
+            positions = (other_offset + np.arange(len(other_counts), dtype=np.int64)) >> shift
+        else:
+            positions = other_offset + np.arange(len(other_counts), dtype=np.int64)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(positions):
+            self._add_indexed(positions, other_counts)
+        return self
+
+    def _cdf_points(self):
+        """Bin edges clipped to [min, max] and the cumulative counts at each edge"""
+        edges = (self.offset + np.arange(len(self.counts) + 1)) * self.width
+        edges = np.clip(edges, self.min, self.max)
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        return edges, cumulative
+
+    def counts_for_bins(self, bins):
+        """Re-bin into `bins` equal-width bins over [min, max], spreading counts uniformly within each fine bin"""
+        display_edges = np.linspace(self.min, self.max, bins + 1)
+        if self.total == 0:
+            return display_edges, np.zeros(bins, dtype=np.int64)
+        if self.min == self.max:
+            counts = np.zeros(bins, dtype=np.int64)
+            counts[0] = self.total
+            return display_edges, counts
+        edges, cumulative = self._cdf_points()
+        cdf_at_edges = np.interp(display_edges, edges, cumulative)
+        counts = np.diff(np.round(cdf_at_edges)).astype(np.int64)
+        return display_edges, counts
+
+    def quantile(self, q):
+        """Approximate quantile by linear interpolation of the binned CDF"""
+        if self.total == 0:
+            return math.nan
+        if self.min == self.max:
+            return self.min
+        edges, cumulative = self._cdf_points()
+        return float(np.interp(q * self.total, cumulative, edges))
+
+    def to_dict(self):
+        """JSON-safe state (empty histograms store None for min/max)"""
+        empty = self.exponent is None
+        return {
+            'max_bins': self.max_bins, 'exponent': self.exponent, 'offset': self.offset,
+            'counts': self.counts.tolist(),
+            'min': None if empty else self.min, 'max': None if empty else self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        hist = cls(state['max_bins'])
+        hist.exponent = state['exponent']
+        hist.offset = state['offset']
+        hist.counts = np.asarray(state['counts'], dtype=np.int64)
+        if state['min'] is not None:
+            hist.min, hist.max = state['min'], state['max']
+        return hist
+
+
+class QuantileSketch:
+    """Mergeable KLL quantile sketch
+
+    Values are kept in levels of sorted compactors; an item at level h stands for
+    2**h original values. When a level outgrows its capacity (k at the top level,
+    shrinking by a factor of 2/3 per level below) it is sorted and every other
+    item, starting at a random offset, is promoted to the next level. Each
+    compaction moves any rank by at most the level weight, which keeps the
+    normalized rank error of a returned quantile at about 1.65% for k=200 with
+    99% confidence (the bound published for KLL by Apache DataSketches), while
+    the sketch holds O(k) items regardless of how many values it has seen.
+    Min and max are tracked exactly. The offsets are drawn from a generator with
+    a fixed seed, so the same values fed in the same order give the same sketch.
+    """
+
+    CAPACITY_DECAY = 2.0 / 3.0
+
+    def __init__(self, k=DEFAULT_SKETCH_K, seed=0):
+        self.k = k
+        self.seed = seed
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [np.zeros(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(cls, values, k=DEFAULT_SKETCH_K, seed=0):
+        return cls(k, seed).update(values)
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+
+    def _compress(self):
+        while True:
+            level = next((h for h in range(len(self.levels)) if len(self.levels[h]) > self._capacity(h)), None)
+            if level is None:
+                return
+            if level + 1 == len(self.levels):
+                self.levels.append(np.zeros(0, dtype=np.float64))
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind so the promoted pairs stay unbiased
+            keep = items[len(items) - len(items) % 2:]
+            paired = items[:len(items) - len(items) % 2]
+            promoted = paired[self._rng.integers(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values):
+        """Fold a batch of values into the sketch; NaNs and infinities are ignored"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Combine another sketch's state into this one"""
+        if other.n == 0:
+            return self
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Approximate quantiles for an array of probabilities in [0, 1]"""
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        # The extremes are known exactly
+        result = np.where(qs <= 0, self.min, result)
+        result = np.where(qs >= 1, self.max, result)
+        return np.clip(result, self.min, self.max)
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def sorted_items(self):
+        """The retained items in ascending order (each stands in for one or more values)"""
+        return np.sort(np.concatenate(self.levels))
+
+    def to_dict(self):
+        """JSON-safe state (empty sketches store None for min/max)"""
+        return {
+            'k': self.k, 'n': self.n, 'seed': self.seed,
+            'min': self.min if self.n else None, 'max': self.max if self.n else None,
+            'levels': [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state['k'], state.get('seed', 0))
+        sketch.n = state['n']
+        if state['min'] is not None:
+            sketch.min, sketch.max = state['min'], state['max']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state['levels']]
+        return sketch
+
+
+class CorrelationAccumulator:
+    """Mergeable pairwise-complete Pearson correlation sums
+
+    For every pair of columns it keeps the number of rows where both are present
+    and the sums of x, x**2 and x*y over those rows, matching pandas'
+    DataFrame.corr() handling of missing values. Values are shifted by a fixed
+    per-column offset (the first batch's means) before summing, which avoids the
+    cancellation raw power sums suffer when the mean is large relative to the spread.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, block):
+        """Fold a 2-D float block (rows x columns, NaN for missing) into the sums"""
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) == 0:
+            return self
+        valid = ~np.isnan(block)
+        if self.shift is None:
+            counts = valid.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                shift = np.where(valid, block, 0.0).sum(axis=0) / counts
+            self.shift = np.where(counts > 0, shift, 0.0)
+        centered = np.where(valid, block - self.shift, 0.0)
+        present = valid.astype(np.float64)
+        self.n += present.T @ present
+        self.sx += centered.T @ present
+        self.sxx += (centered * centered).T @ present
+        self.sxy += centered.T @ centered
+        return self
+
+    def _reshift(self, shift):
+        """Re-express the sums relative to a different per-column shift"""
+        delta = self.shift - shift
+        sx = self.sx
+        self.sxy = (self.sxy + sx * delta[np.newaxis, :] + delta[:, np.newaxis] * sx.T
+                    + self.n * np.outer(delta, delta))
+        self.sxx = self.sxx + 2.0 * delta[:, np.newaxis] * sx + self.n * (delta * delta)[:, np.newaxis]
+        self.sx = sx + self.n * delta[:, np.newaxis]
+        self.shift = shift
+
+    def select(self, columns):
+        """Restrict (and reorder) the sums to the given subset of columns"""
+        keep = [self.columns.index(col) for col in columns]
+        self.columns = list(columns)
+        index = np.ix_(keep, keep)
+        self.n, self.sx, self.sxx, self.sxy = self.n[index], self.sx[index], self.sxx[index], self.sxy[index]
+        if self.shift is not None:
+            self.shift = self.shift[keep]
+        return self
+
+    def merge(self, other):
+        """Combine another accumulator over the same columns into this one"""
+        if other.shift is None:
+            return self
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation sums over different columns")
+        if self.shift is None:
+            self.shift = other.shift.copy()
+            self.n, self.sx, self.sxx, self.sxy = other.n.copy(), other.sx.copy(), other.sxx.copy(), other.sxy.copy()
+            return self
+        other = CorrelationAccumulator.from_dict(other.to_dict())
+        other._reshift(self.shift)
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+        return self
+
+    def matrix(self):
+        """Pearson correlation matrix as a DataFrame, NaN where fewer than two rows overlap"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sy, syy = self.sx.T, self.sxx.T
+            covariance = self.sxy - self.sx * sy / self.n
+            var_x = self.sxx - self.sx * self.sx / self.n
+            var_y = syy - sy * sy / self.n
+            corr = covariance / np.sqrt(var_x * var_y)
+        corr = np.where((self.n >= 2) & (var_x > 0) & (var_y > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        # Each column correlates perfectly with itself wherever it varies
+        np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def to_dict(self):
+        """JSON-safe state"""
+        return {
+            'columns': list(self.columns),
+            'shift': None if self.shift is None else self.shift.tolist(),
+            'n': self.n.tolist(), 'sx': self.sx.tolist(), 'sxx': self.sxx.tolist(), 'sxy': self.sxy.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        acc = cls(state['columns'])
+        if state['shift'] is not None:
+            acc.shift = np.asarray(state['shift'], dtype=np.float64)
+        k = len(acc.columns)
+        for key in ('n', 'sx', 'sxx', 'sxy'):
+            setattr(acc, key, np.asarray(state[key], dtype=np.float64).reshape(k, k))
+        return acc
+
+
+class StreamingSummary:
+    """Constant-memory summary of a dataset built from bounded chunks
+
+    Stands in for a DataFrame when a dataset is too large to materialise: it keeps
+    per-column missing counts, moments, histograms and quantile sketches, pairwise
+    correlation sums over the numeric columns, plus the first rows for previews,
+    and can be merged with summaries of other chunks or workers.
+    """
+
+    def __init__(self, histogram_bins=DEFAULT_HISTOGRAM_BINS):
+        self.histogram_bins = histogram_bins
+        self.n_rows = 0
+        self.dtypes = {}
+        self.missing = {}
+        self.moments = {}
+        self.histograms = {}
+        self.sketches = {}
+        self.correlation = None
+        self.preview = None
+
+    @property
+    def columns(self):
+        return pd.Index(list(self.dtypes))
+
+    @property
+    def shape(self):
+        return (self.n_rows, len(self.dtypes))
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def numeric_columns(self):
+        return [col for col in self.dtypes if col in self.moments]
+
+    @property
+    def categorical_columns(self):
+        return [col for col in self.dtypes if col not in self.moments]
+
+    def head(self, n=PREVIEW_ROWS):
+        if self.preview is None:
+            return pd.DataFrame(columns=self.columns)
+        return self.preview.head(n)
+
+    def update(self, chunk):
+        """Fold one DataFrame chunk into the summary"""
+        if self.preview is None:
+            self.preview = chunk.head(PREVIEW_ROWS).copy()
+        elif len(self.preview) < PREVIEW_ROWS:
+            self.preview = pd.concat([self.preview, chunk.head(PREVIEW_ROWS - len(self.preview))])
+
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            series = chunk[col]
+            self.missing[col] = self.missing.get(col, 0) + int(series.isna().sum())
+            is_numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+            first_chunk = col not in self.dtypes
+            if first_chunk:
+                self.dtypes[col] = str(series.dtype)
+                if is_numeric:
+                    self.moments[col] = MomentAccumulator()
+                    self.histograms[col] = HistogramAccumulator(self.histogram_bins)
+                    self.sketches[col] = QuantileSketch(seed=sketch_seed(col))
+            elif col in self.moments and not is_numeric:
+                # Per-chunk type inference found text in a numeric column: demote it
+                del self.moments[col]
+                del self.histograms[col]
+                del self.sketches[col]
+                self.dtypes[col] = str(series.dtype)
+            elif col in self.moments and str(series.dtype) != self.dtypes[col]:
+                self.dtypes[col] = 'float64'
+
+            if col in self.moments:
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                self.moments[col].update(values)
+                self.histograms[col].update(values)
+                self.sketches[col].update(values)
+
+        numeric = [col for col in chunk.columns if col in self.moments]
+        if self.correlation is None:
+            self.correlation = CorrelationAccumulator(numeric)
+        elif self.correlation.columns != numeric:
+            self.correlation.select([col for col in self.correlation.columns if col in numeric])
+        block = chunk[self.correlation.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.correlation.update(block)
+        return self
+
+    def merge(self, other):
+        """Combine a summary of later rows into this one"""
+        if self.preview is None:
+            self.preview = other.preview
+        self.n_rows += other.n_rows
+        for col, dtype in other.dtypes.items():
+            self.missing[col] = self.missing.get(col, 0) + other.missing.get(col, 0)
+            if col not in self.dtypes:
+                self.dtypes[col] = dtype
+                if col in other.moments:
+                    self.moments[col] = MomentAccumulator().merge(other.moments[col])
+                    self.histograms[col] = HistogramAccumulator(self.histogram_bins).merge(other.histograms[col])
+                    self.sketches[col] = QuantileSketch(seed=sketch_seed(col)).merge(other.sketches[col])
+            elif col in self.moments and col in other.moments:
+                self.moments[col].merge(other.moments[col])
+                self.histograms[col].merge(other.histograms[col])
+                self.sketches[col].merge(other.sketches[col])
+            elif col in self.moments:
+                del self.moments[col]
+                del self.histograms[col]
+                del self.sketches[col]
+                self.dtypes[col] = dtype
+
+        if other.correlation is not None:
+            if self.correlation is None:
+                self.correlation = CorrelationAccumulator(other.correlation.columns).merge(other.correlation)
+            else:
+                common = [col for col in self.correlation.columns
+                          if col in other.correlation.columns and col in self.moments]
+                theirs = CorrelationAccumulator.from_dict(other.correlation.to_dict()).select(common)
+                self.correlation.select(common).merge(theirs)
+        return self
+
+    def summary_statistics(self, column):
+        """Summary statistics in the shape returned by get_summary_statistics
+
+        Moments, min and max are exact; quantiles come from the column's quantile
+        sketch and are flagged as approximate.
+        """
+        moments = self.moments[column]
+        q25, median, q75 = self.sketches[column].quantiles([0.25, 0.5, 0.75])
+        return {
+            'count': int(moments.n + moments.missing),
+            'mean': float(moments.mean),
+            'median': float(median),
+            'std': float(moments.std),
+            'var': float(moments.var),
+            'min': float(moments.min),
+            'max': float(moments.max),
+            'q25': float(q25),
+            'q75': float(q75),
+            'skewness': float(moments.skewness),
+            'kurtosis': float(moments.kurtosis),
+            'approximate_quantiles': True,
+        }
+
+    def data_info(self):
+        """Dataset information in the shape returned by get_data_info"""
+        return {
+            'shape': self.shape,
+            'columns': list(self.dtypes),
+            'dtypes': dict(self.dtypes),
+            'missing_values': dict(self.missing),
+            'numeric_columns': self.numeric_columns,
+            'categorical_columns': self.categorical_columns,
+            'streaming': True,
+        }
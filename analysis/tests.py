@@ -1,10 +1,63 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from django.core.management import call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import UploadedFile, AnalysisSession
-from .utils import generate_random_data, get_summary_statistics
+from django.db import DatabaseError
+from pyarrow import ArrowException
+from .models import UploadedFile, AnalysisSession, DatasetProfile
+from .kernels import describe_array
+from .hypothesis import adjust_p_values
+from .normality import QQ_MAX_POINTS, anderson_darling, normality_tests, qq_points
+from .correlation import correlation_matrix
+from .figures import encode_array, figure, to_plotly_figure
+from .timeseries import TimeSeriesPyramid, period_series
+from .randomdata import iter_random_chunks, summarize_random
+from .resampling import iter_resampling
+from .utils import (
+    BOX_MAX_OUTLIERS, generate_random_data, get_summary_statistics, load_csv_file, find_columnar_copy, sniff_csv,
+    summarize_stream, get_data_info, optimize_dtypes, perform_hypothesis_test, create_histogram_plotly,
+    create_boxplot_plotly, create_qq_plot_plotly, create_correlation_plot_plotly,
+    count_rows, write_columnar_copy, perform_batch_hypothesis_tests, perform_group_statistics,
+    columnar_parts, read_columnar_file, stage_columnar_part, publish_columnar_part
+)
+from .columnstore import ColumnStore, write_column_store
+from .streaming import MomentAccumulator, HistogramAccumulator, QuantileSketch, StreamingSummary
+from .cache import FigureCache, LRUCache, dataset_cache, figure_cache
+from .ingest import append_to_upload, ingest_uploaded_file
+from .views import PLOT_TYPES, load_data, load_file_cached, load_numeric_data, render_plot
 import pandas as pd
+import numpy as np
+from scipy import stats
+import base64
+import importlib
+import io
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import warnings
+from unittest import mock
+
+
+def plotly_array(value):
+    """Decode an array from figure JSON, where Plotly writes NumPy arrays as base64 typed arrays"""
+    if isinstance(value, dict):
+        return np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+    return np.asarray(value)
+
+
+class TemporaryMediaTestCase(TestCase):
+    """TestCase storing uploads under a temporary MEDIA_ROOT that is removed after each test"""
+    
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
 
 
 class AnalysisViewTests(TestCase):
@@ -51,7 +104,7 @@ class AnalysisViewTests(TestCase):
         self.assertIsInstance(data, dict)
 
 
-class ModelTests(TestCase):
+class ModelTests(TemporaryMediaTestCase):
     def test_uploaded_file_creation(self):
         """Test UploadedFile model creation"""
         # Create a simple CSV file
@@ -116,6 +169,42 @@ class UtilityTests(TestCase):
         self.assertEqual(stats['count'], 10)
         self.assertEqual(stats['mean'], 5.5)
     
+    def test_histogram_is_binned_server_side(self):
+        """Test that the histogram carries one bar per bin whatever the row count"""
+        values = np.random.default_rng(0).normal(size=50000)
+        values[:10] = np.nan
+        data = pd.DataFrame({'value': values})
+        
+        trace = create_histogram_plotly(data, 'value', bins=25)['data'][0]
+        self.assertEqual(trace['type'], 'bar')
+        expected, edges = np.histogram(values[10:], bins=25)
+        np.testing.assert_array_equal(plotly_array(trace['y']), expected)
+        np.testing.assert_allclose(plotly_array(trace['x']), (edges[:-1] + edges[1:]) / 2)
+        self.assertIsNone(create_histogram_plotly(pd.DataFrame({'text': ['a', 'b']}), 'text'))
+    
+    def test_boxplot_is_precomputed(self):
+        """Test that box plots carry quartiles, whiskers and a capped outlier sample instead of raw values"""
+        values = np.random.default_rng(1).standard_t(2, size=20000)
+        data = pd.DataFrame({'value': values, 'other': np.arange(20000.0)})
+        
+        traces = create_boxplot_plotly(data, 'value')['data']
+        box, outliers = traces
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        self.assertAlmostEqual(box['q1'][0], q1)
+        self.assertAlmostEqual(box['median'][0], median)
+        self.assertAlmostEqual(box['q3'][0], q3)
+        inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+        self.assertEqual(box['upperfence'][0], inside.max())
+        self.assertNotIn('y', box)
+        
+        sample = plotly_array(outliers['y'])
+        self.assertEqual(len(sample), BOX_MAX_OUTLIERS)
+        self.assertEqual(sample.min(), values.min())
+        self.assertEqual(sample.max(), values.max())
+        
+        traces = create_boxplot_plotly(data)['data']
+        self.assertEqual([trace['name'] for trace in traces if trace['type'] == 'box'], ['value', 'other'])
+    
     def test_get_summary_statistics_non_numeric(self):
         """Test summary statistics with non-numeric data"""
         data = pd.DataFrame({
@@ -146,6 +235,10 @@ class FormTests(TestCase):
         
         form = AnalysisForm(data=form_data)
         self.assertTrue(form.is_valid())
+        
+        # Seeds must fit AnalysisSession.random_seed, a 32-bit integer column
+        self.assertTrue(AnalysisForm(data=dict(form_data, random_seed=2 ** 31 - 1)).is_valid())
+        self.assertIn('random_seed', AnalysisForm(data=dict(form_data, random_seed=2 ** 31)).errors)
     
     def test_analysis_form_upload_validation(self):
         """Test form validation for file upload"""
@@ -163,4 +256,1489 @@ class FormTests(TestCase):
         
         form = AnalysisForm(data=form_data)
         self.assertFalse(form.is_valid())
-        self.assertIn('Please upload a file', str(form.errors)) 
\ No newline at end of file
+        self.assertIn('Please upload a file', str(form.errors)) 
+
+class DatasetCacheTests(TemporaryMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        dataset_cache.clear()
+    
+    def test_lru_eviction_respects_memory_budget(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = LRUCache(max_bytes=100)
+        cache.set('a', 'A', size=40)
+        cache.set('b', 'B', size=40)
+        cache.get('a')
+        cache.set('c', 'C', size=40)
+        
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertFalse(cache.set('huge', 'X', size=500))
+    
+    def test_get_or_load_skips_loader_on_hit(self):
+        """Test that a cached dataset is not parsed again"""
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return pd.DataFrame({'a': [1, 2, 3]}), None
+        
+        first, _ = dataset_cache.get_or_load(('random', 3), loader)
+        second, _ = dataset_cache.get_or_load(('random', 3), loader)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertIs(first, second)
+        self.assertEqual(dataset_cache.stats()['hits'], 1)
+    
+    def test_concurrent_misses_load_once(self):
+        """Test that simultaneous requests for an uncached dataset share one load"""
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return pd.DataFrame({'a': [1, 2, 3]}), None
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(dataset_cache.get_or_load(('random', 4), loader)[0]))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(dataset_cache._loading, {})
+    
+    def test_failed_loads_are_not_cached(self):
+        """Test that loader errors are returned but not stored"""
+        data, error = dataset_cache.get_or_load(('random', 5), lambda: (None, 'boom'))
+        self.assertIsNone(data)
+        self.assertEqual(error, 'boom')
+        self.assertEqual(len(dataset_cache), 0)
+    
+    def test_uploaded_file_delete_invalidates_cache(self):
+        """Test that deleting an UploadedFile drops its cached parse"""
+        file_obj = UploadedFile.objects.create(
+            file=SimpleUploadedFile("cached.csv", b"a,b\n1,2\n3,4", content_type="text/csv"),
+            original_name="cached.csv",
+            file_size=11
+        )
+        data, error = load_file_cached(file_obj.file.path)
+        self.assertIsNone(error)
+        self.assertEqual(len(dataset_cache), 1)
+        
+        file_obj.delete()
+        self.assertEqual(len(dataset_cache), 0)
+
+
+class ColumnarIngestTests(TemporaryMediaTestCase):
+    def test_ingest_writes_columnar_copy(self):
+        """Test that ingest records a Parquet copy that load_csv_file prefers"""
+        file_obj = UploadedFile.objects.create(
+            file=SimpleUploadedFile("ingest.csv", b"a,b\n1,x\n2,y\n3,z", content_type="text/csv"),
+            original_name="ingest.csv",
+            file_size=16
+        )
+        ingest_uploaded_file(file_obj)
+        file_obj.refresh_from_db()
+        
+        self.assertTrue(file_obj.columnar_file.name.endswith('.parquet'))
+        self.assertEqual(list(ColumnStore.open(file_obj.file.path).columns), ['a'])
+        self.assertEqual(find_columnar_copy(file_obj.file.path), file_obj.columnar_file.path)
+        
+        data, error = load_csv_file(file_obj.file.path)
+        self.assertIsNone(error)
+        self.assertEqual(list(data['a']), [1, 2, 3])
+        self.assertEqual(list(data['b']), ['x', 'y', 'z'])
+        
+        columnar_path = file_obj.columnar_file.path
+        source_path = file_obj.file.path
+        file_obj.delete()
+        self.assertFalse(os.path.exists(columnar_path))
+        self.assertIsNone(ColumnStore.open(source_path))
+    
+    def test_stale_columnar_copy_is_ignored(self):
+        """Test that a columnar copy older than its source is not used"""
+        file_obj = UploadedFile.objects.create(
+            file=SimpleUploadedFile("stale.csv", b"a\n1\n2", content_type="text/csv"),
+            original_name="stale.csv",
+            file_size=6
+        )
+        ingest_uploaded_file(file_obj)
+        source_path = file_obj.file.path
+        columnar_mtime = os.path.getmtime(file_obj.columnar_file.path)
+        os.utime(source_path, (columnar_mtime + 10, columnar_mtime + 10))
+        
+        self.assertIsNone(find_columnar_copy(source_path))
+        file_obj.delete()
+
+
+class CsvSniffingTests(TemporaryMediaTestCase):
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+    
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_sniff_european_csv(self):
+        """Test detection of latin-1, semicolon-delimited, decimal-comma files"""
+        path = self._write('eu.csv', 'name;value\nJosé;1,5\nRenée;2,25\n'.encode('latin-1'))
+        dialect = sniff_csv(path)
+        
+        self.assertEqual(dialect, {'encoding': 'latin-1', 'delimiter': ';', 'header': True, 'decimal': ','})
+        data, error = load_csv_file(path, dialect=dialect)
+        self.assertIsNone(error)
+        self.assertEqual(list(data['value']), [1.5, 2.25])
+        self.assertEqual(data['name'][0], 'José')
+    
+    def test_sniff_headerless_numeric_csv(self):
+        """Test that an all-numeric first row is treated as data"""
+        path = self._write('plain.csv', b'1,2\n3,4\n')
+        dialect = sniff_csv(path)
+        
+        self.assertFalse(dialect['header'])
+        data, _ = load_csv_file(path, dialect=dialect)
+        self.assertEqual(data.shape, (2, 2))
+    
+    def test_late_decode_error_falls_back_to_latin1(self):
+        """Test that non-UTF-8 bytes beyond the sniffed prefix do not fail the parse"""
+        content = b'a,b\n' + b'1,x\n' * 100 + '2,\xe9\n'.encode('latin-1')
+        path = self._write('late.csv', content)
+        dialect = sniff_csv(path, sample_bytes=64)
+        self.assertEqual(dialect['encoding'], 'utf-8')
+        
+        data, error = load_csv_file(path, dialect=dialect)
+        self.assertIsNone(error)
+        self.assertEqual(len(data), 101)
+        self.assertEqual(dialect['encoding'], 'latin-1')
+    
+    def test_ingest_caches_dialect_on_upload(self):
+        """Test that ingest stores the sniffed dialect on the UploadedFile"""
+        file_obj = UploadedFile.objects.create(
+            file=SimpleUploadedFile("tabs.csv", b"a\tb\n1\t2\n3\t4", content_type="text/csv"),
+            original_name="tabs.csv",
+            file_size=13
+        )
+        ingest_uploaded_file(file_obj)
+        file_obj.refresh_from_db()
+        
+        self.assertEqual(file_obj.csv_dialect['delimiter'], '\t')
+        file_obj.delete()
+
+
+class StreamingStatisticsTests(TestCase):
+    def test_moment_accumulator_merge_matches_full_pass(self):
+        """Test that merged chunk moments equal moments of the whole column"""
+        rng = np.random.default_rng(0)
+        values = rng.gamma(2.0, 3.0, 5000)
+        values[::97] = np.nan
+        
+        merged = MomentAccumulator()
+        for chunk in np.array_split(values, 7):
+            merged.merge(MomentAccumulator.from_values(chunk))
+        clean = pd.Series(values).dropna()
+        
+        self.assertEqual(merged.n, len(clean))
+        self.assertEqual(merged.missing, int(np.isnan(values).sum()))
+        self.assertAlmostEqual(merged.mean, clean.mean(), places=10)
+        self.assertAlmostEqual(merged.var, clean.var(), places=8)
+        self.assertAlmostEqual(merged.skewness, stats.skew(clean), places=10)
+        self.assertAlmostEqual(merged.kurtosis, stats.kurtosis(clean), places=10)
+    
+    def test_histogram_accumulator_merges_different_scales(self):
+        """Test that histograms with different widths merge without losing counts"""
+        rng = np.random.default_rng(1)
+        narrow = HistogramAccumulator(64).update(rng.normal(0, 1, 1000))
+        wide = HistogramAccumulator(64).update(rng.normal(500, 100, 1000))
+        narrow.merge(wide)
+        
+        self.assertEqual(narrow.total, 2000)
+        self.assertLessEqual(len(narrow.counts), 64)
+        edges, counts = narrow.counts_for_bins(10)
+        self.assertEqual(int(counts.sum()), 2000)
+    
+    def test_summarize_stream_matches_in_memory_statistics(self):
+        """Test that chunked summaries agree with statistics on the loaded DataFrame"""
+        rng = np.random.default_rng(2)
+        df = pd.DataFrame({'value': rng.normal(10, 2, 3000), 'label': rng.choice(['a', 'b'], 3000)})
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'big.csv')
+            df.to_csv(path, index=False)
+            summary, error = summarize_stream(path, chunksize=250)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        
+        self.assertIsNone(error)
+        self.assertEqual(summary.shape, (3000, 2))
+        self.assertEqual(summary.numeric_columns, ['value'])
+        streamed = get_summary_statistics(summary, 'value')
+        exact = get_summary_statistics(df, 'value')
+        for key in ['count', 'mean', 'std', 'var', 'min', 'max', 'skewness', 'kurtosis']:
+            self.assertAlmostEqual(streamed[key], exact[key], places=6)
+        self.assertAlmostEqual(streamed['median'], exact['median'], delta=0.05)
+        self.assertEqual(get_data_info(summary)['categorical_columns'], ['label'])
+    
+    @override_settings(STREAMING_THRESHOLD_BYTES=0)
+    def test_large_dataset_endpoints_use_streaming(self):
+        """Test that endpoints answer from a streaming summary above the size threshold"""
+        dataset_cache.clear()
+        session = self.client.session
+        session['analysis_session_id'] = 'stream-session'
+        session.save()
+        AnalysisSession.objects.create(
+            session_id='stream-session', data_source='local', selected_column='Age'
+        )
+        
+        statistics = json.loads(self.client.get(reverse('analysis:get_statistics')).content)
+        self.assertTrue(statistics['summary']['approximate_quantiles'])
+        self.assertIn('t_statistic', statistics['hypothesis_test'])
+        
+        plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+        self.assertIn('histogram', plots)
+        self.assertIn('boxplot', plots)
+        self.assertIn('qqplot', plots)
+        self.assertIn('correlation', plots)
+        dataset_cache.clear()
+    
+    def test_quantile_sketch_rank_error_and_merge(self):
+        """Test that merged sketches answer quantiles within the documented rank error"""
+        rng = np.random.default_rng(4)
+        values = rng.lognormal(size=200000)
+        sketch = QuantileSketch()
+        for part in np.array_split(values, 16):
+            sketch.merge(QuantileSketch.from_values(part))
+        
+        self.assertEqual(sketch.n, len(values))
+        self.assertLess(len(sketch), 1000)
+        probabilities = np.linspace(0, 1, 41)
+        estimates = sketch.quantiles(probabilities)
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        self.assertLess(np.max(np.abs(ranks - probabilities)), 0.0165)
+        self.assertEqual((estimates[0], estimates[-1]), (values.min(), values.max()))
+        
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        np.testing.assert_array_equal(restored.quantiles(probabilities), estimates)
+    
+    def test_quantile_sketch_is_reproducible(self):
+        """Test that sketches compact the same way on every run, including after a round trip"""
+        values = np.random.default_rng(5).normal(size=50000)
+        first = QuantileSketch.from_values(values)
+        self.assertEqual(first.to_dict(), QuantileSketch.from_values(values).to_dict())
+        
+        restored = QuantileSketch.from_dict(QuantileSketch.from_values(values, seed=7).to_dict())
+        again = QuantileSketch.from_dict(QuantileSketch.from_values(values, seed=7).to_dict())
+        self.assertEqual(restored.update(values).to_dict(), again.update(values).to_dict())
+        
+        chunks = [pd.DataFrame({'x': part}) for part in np.array_split(values, 8)]
+        summaries = [StreamingSummary(), StreamingSummary()]
+        for summary in summaries:
+            for chunk in chunks:
+                summary.update(chunk)
+        self.assertEqual(summaries[0].sketches['x'].to_dict(), summaries[1].sketches['x'].to_dict())
+    
+    def test_sketch_box_and_qq_plots(self):
+        """Test that box and Q-Q plots are drawn from a streaming summary's sketches"""
+        rng = np.random.default_rng(5)
+        summary = StreamingSummary().update(pd.DataFrame({'value': rng.normal(0, 1, 5000)}))
+        
+        box = create_boxplot_plotly(summary, 'value')['data'][0]
+        self.assertAlmostEqual(box['median'][0], 0, delta=0.1)
+        self.assertLessEqual(box['lowerfence'][0], box['q1'][0])
+        qq = create_qq_plot_plotly(summary, 'value')['data'][0]
+        sample_quantiles = plotly_array(qq['y'])
+        self.assertLessEqual(len(sample_quantiles), QQ_MAX_POINTS)
+        self.assertTrue(np.all(np.diff(sample_quantiles) >= 0))
+
+
+class ColumnStoreTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmpdir, 'data.csv')
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({
+            'Tumor Size': rng.normal(5, 1, 500),
+            'Age': rng.integers(20, 80, 500),
+            'Gender': rng.choice(['Male', 'Female'], 500),
+        })
+        self.df.to_csv(self.source, index=False)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_store_round_trip_is_memory_mapped(self):
+        """Test that numeric columns are persisted and reopened as memory maps"""
+        write_column_store(self.df, self.source)
+        store = ColumnStore.open(self.source)
+        
+        self.assertEqual(list(store.columns), ['Tumor Size', 'Age'])
+        self.assertEqual(len(store), 500)
+        self.assertIsInstance(store.array('Age'), np.memmap)
+        self.assertTrue(np.shares_memory(store['Age'].to_numpy(), store.array('Age')))
+        np.testing.assert_array_equal(store['Tumor Size'].to_numpy(), self.df['Tumor Size'].to_numpy())
+        
+        selected = store.select(['Age'])
+        self.assertEqual(list(selected.columns), ['Age'])
+        self.assertIs(selected.array('Age'), store.array('Age'))
+        with self.assertRaises(KeyError):
+            store.select(['Gender'])
+    
+    def test_analysis_functions_accept_column_store(self):
+        """Test that statistics and plot builders work directly on a column store"""
+        write_column_store(self.df, self.source)
+        store = ColumnStore.open(self.source)
+        
+        self.assertEqual(
+            get_summary_statistics(store, 'Tumor Size'),
+            get_summary_statistics(self.df, 'Tumor Size')
+        )
+        self.assertEqual(
+            perform_hypothesis_test(store, 'Age', 50)['t_statistic'],
+            perform_hypothesis_test(self.df, 'Age', 50)['t_statistic']
+        )
+        self.assertIsNotNone(create_histogram_plotly(store, 'Age'))
+        self.assertIsNotNone(create_boxplot_plotly(store))
+        self.assertIsNotNone(create_qq_plot_plotly(store, 'Age'))
+        self.assertIsNotNone(create_correlation_plot_plotly(store))
+    
+    def test_stale_store_is_not_opened(self):
+        """Test that a store older than its source file is ignored"""
+        directory = write_column_store(self.df, self.source)
+        manifest_mtime = os.path.getmtime(os.path.join(directory, 'manifest.json'))
+        os.utime(self.source, (manifest_mtime + 10, manifest_mtime + 10))
+        
+        self.assertIsNone(ColumnStore.open(self.source))
+
+
+class DtypeOptimizationTests(TestCase):
+    def test_optimize_dtypes_compacts_losslessly(self):
+        """Test that ingest dtype compaction keeps values while shrinking memory"""
+        df = pd.DataFrame({
+            'age': np.arange(200) % 90,
+            'ratio': np.linspace(0, 1, 200),
+            'half': np.repeat([0.5, 1.5], 100),
+            'gender': ['Male', 'Female'] * 100,
+            'flag': ['Yes', 'No', 'No', 'Yes'] * 50,
+            'flag_missing': ['Yes', None] * 100,
+            'patient': [f'P{i}' for i in range(200)],
+        })
+        original = df.copy()
+        optimize_dtypes(df)
+        
+        self.assertEqual(df['age'].dtype, np.int8)
+        self.assertEqual(df['ratio'].dtype, np.float64)
+        self.assertEqual(df['half'].dtype, np.float32)
+        self.assertIsInstance(df['gender'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['flag'].dtype, bool)
+        self.assertEqual(list(df['flag'][:2]), [True, False])
+        self.assertNotEqual(df['flag_missing'].dtype, bool)
+        self.assertFalse(isinstance(df['patient'].dtype, pd.CategoricalDtype))
+        np.testing.assert_array_equal(df['half'].to_numpy(dtype=np.float64), original['half'].to_numpy())
+        
+        memory = df.attrs['memory_usage']
+        self.assertLess(memory['after'], memory['before'])
+        info = get_data_info(df)
+        self.assertEqual(info['memory_before'], memory['before'])
+        self.assertIn('gender', info['categorical_columns'])
+        self.assertIn('flag', info['categorical_columns'])
+
+
+class ColumnProjectionTests(TestCase):
+    def setUp(self):
+        dataset_cache.clear()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'wide.csv')
+        pd.DataFrame({
+            'a': range(250), 'b': np.linspace(0, 1, 250), 'c': ['x', 'y'] * 125
+        }).to_csv(self.path, index=False)
+    
+    def tearDown(self):
+        dataset_cache.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_projection_is_pushed_into_reader(self):
+        """Test that only requested columns and rows are parsed and cached"""
+        data, error = load_file_cached(self.path, columns=['b'], nrows=10)
+        
+        self.assertIsNone(error)
+        self.assertEqual(list(data.columns), ['b'])
+        self.assertEqual(len(data), 10)
+        self.assertNotIn(dataset_cache.file_key(self.path), dataset_cache)
+    
+    def test_projection_served_from_cached_full_dataset(self):
+        """Test that a cached full dataset answers projected loads without parsing"""
+        full, _ = load_file_cached(self.path)
+        data, _ = load_file_cached(self.path, columns=['a'])
+        
+        self.assertEqual(list(data.columns), ['a'])
+        self.assertEqual(len(dataset_cache), 1)
+    
+    def test_unknown_column_falls_back_to_full_dataset(self):
+        """Test that a stale column selection still loads the dataset"""
+        data, error = load_file_cached(self.path, columns=['missing'])
+        self.assertIsNone(error)
+        self.assertEqual(list(data.columns), ['a', 'b', 'c'])
+    
+    def test_count_rows_without_parsing(self):
+        """Test row counting from raw line breaks and Parquet metadata"""
+        self.assertEqual(count_rows(self.path), 250)
+        data, _ = load_csv_file(self.path)
+        write_columnar_copy(data.head(7), self.path)
+        self.assertEqual(count_rows(self.path), 7)
+    
+    def test_data_preview_reports_total_rows(self):
+        """Test that the preview endpoint reads 100 rows but reports the full count"""
+        session = self.client.session
+        session['analysis_session_id'] = 'preview-session'
+        session.save()
+        AnalysisSession.objects.create(session_id='preview-session', data_source='local')
+        
+        data = json.loads(self.client.get(reverse('analysis:get_data_preview')).content)
+        self.assertEqual(data['preview_rows'], 100)
+        self.assertEqual(data['total_rows'], 20000)
+
+
+class DatasetProfileTests(TemporaryMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        dataset_cache.clear()
+    
+    def tearDown(self):
+        dataset_cache.clear()
+    
+    def _use_session(self, **fields):
+        session = self.client.session
+        session['analysis_session_id'] = 'profile-session'
+        session.save()
+        return AnalysisSession.objects.create(session_id='profile-session', **fields)
+    
+    def test_ingest_builds_profile(self):
+        """Test that ingest stores schema, null counts, cardinalities and moments"""
+        file_obj = UploadedFile.objects.create(
+            file=SimpleUploadedFile("profile.csv", b"score,group\n1,a\n2,b\n,a\n4,a", content_type="text/csv"),
+            original_name="profile.csv",
+            file_size=27
+        )
+        ingest_uploaded_file(file_obj)
+        profile = UploadedFile.objects.get(pk=file_obj.pk).profile
+        
+        self.assertEqual((profile.n_rows, profile.n_columns), (4, 2))
+        self.assertEqual(profile.numeric_columns, ['score'])
+        self.assertEqual(profile.categorical_columns, ['group'])
+        score = profile.column('score')
+        self.assertEqual(score['missing'], 1)
+        self.assertEqual(score['cardinality'], 3)
+        self.assertAlmostEqual(MomentAccumulator.from_dict(score['moments']).mean, 7 / 3)
+        self.assertEqual(profile.column('group')['cardinality'], 2)
+        file_obj.delete()
+    
+    def test_column_choices_read_from_profile(self):
+        """Test that column choices come from the stored profile without loading data"""
+        self._use_session(data_source='local')
+        first = json.loads(self.client.get(reverse('analysis:get_column_choices')).content)
+        self.assertEqual(DatasetProfile.objects.count(), 1)
+        
+        dataset_cache.clear()
+        second = json.loads(self.client.get(reverse('analysis:get_column_choices')).content)
+        self.assertEqual(first, second)
+        self.assertIn({'value': 'Survival_Rate', 'label': 'Survival Rate'}, second['columns'])
+        self.assertEqual(len(dataset_cache), 0)
+    
+    def test_dashboard_uses_profile_data_info(self):
+        """Test that the dashboard shows dataset information from the profile"""
+        self._use_session(data_source='local')
+        self.client.get(reverse('analysis:get_column_choices'))
+        dataset_cache.clear()
+        
+        response = self.client.get(reverse('analysis:dashboard'))
+        self.assertEqual(response.context['data_info']['shape'], (20000, 19))
+        self.assertEqual(len(dataset_cache), 0)
+
+
+class UploadDeduplicationTests(TemporaryMediaTestCase):
+    CONTENT = b"x,y\n1,2\n3,4\n5,6"
+    
+    def _upload(self, name="dedup.csv"):
+        file_obj, created = UploadedFile.objects.create_from_upload(
+            SimpleUploadedFile(name, self.CONTENT, content_type="text/csv")
+        )
+        if created:
+            ingest_uploaded_file(file_obj)
+            file_obj.refresh_from_db()
+        return file_obj, created
+    
+    def test_identical_uploads_share_blob_and_profile(self):
+        """Test that re-uploading the same content reuses the stored file and derived artifacts"""
+        first, first_created = self._upload()
+        second, second_created = self._upload("renamed.csv")
+        
+        self.assertTrue(first_created)
+        self.assertFalse(second_created)
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.column_store, second.column_store)
+        self.assertEqual(first.profile_id, second.profile_id)
+        self.assertEqual(second.original_name, "renamed.csv")
+        self.assertEqual(second.file_size, len(self.CONTENT))
+        self.assertTrue(first.profile.fingerprint.startswith('sha256:'))
+        first.delete()
+        second.delete()
+    
+    def test_delete_keeps_blob_until_last_reference(self):
+        """Test that the stored file is removed only with its last referencing record"""
+        first, _ = self._upload()
+        second, _ = self._upload()
+        path = first.file.path
+        
+        first.delete()
+        self.assertTrue(os.path.isfile(path))
+        self.assertIsNotNone(ColumnStore.open(path))
+        
+        second.delete()
+        self.assertFalse(os.path.isfile(path))
+        self.assertIsNone(ColumnStore.open(path))
+        self.assertEqual(DatasetProfile.objects.count(), 0)
+    
+    def test_upload_endpoint_records_name_and_size(self):
+        """Test that the AJAX upload endpoint stores the original name and size"""
+        response = self.client.post(
+            reverse('analysis:upload_file'),
+            {'file': SimpleUploadedFile("ajax.csv", self.CONTENT, content_type="text/csv")}
+        )
+        data = json.loads(response.content)
+        self.assertTrue(data['success'])
+        file_obj = UploadedFile.objects.get(pk=data['file_id'])
+        self.assertEqual((file_obj.original_name, file_obj.file_size), ("ajax.csv", len(self.CONTENT)))
+        file_obj.delete()
+
+
+class SummaryKernelTests(TestCase):
+    def _reference(self, series):
+        with warnings.catch_warnings():
+            # scipy warns about constant input before returning NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return self._reference_values(series)
+    
+    def _reference_values(self, series):
+        return {
+            'count': int(len(series)),
+            'mean': float(series.mean()),
+            'median': float(series.median()),
+            'std': float(series.std()),
+            'var': float(series.var()),
+            'min': float(series.min()),
+            'max': float(series.max()),
+            'q25': float(series.quantile(0.25)),
+            'q75': float(series.quantile(0.75)),
+            'skewness': float(stats.skew(series)),
+            'kurtosis': float(stats.kurtosis(series)),
+        }
+    
+    def _assert_matches(self, result, expected):
+        self.assertEqual(set(result), set(expected))
+        for key, value in expected.items():
+            if np.isnan(value):
+                self.assertTrue(np.isnan(result[key]), key)
+            else:
+                self.assertAlmostEqual(result[key], value, places=9, msg=key)
+    
+    def test_describe_array_matches_pandas_and_scipy(self):
+        """Test that the fused kernel returns the separate pandas/scipy results"""
+        rng = np.random.default_rng(7)
+        for values in (rng.gamma(2.0, 3.0, 1001), np.arange(10.0), np.array([4.0]), np.full(5, 2.5)):
+            series = pd.Series(values)
+            self._assert_matches(describe_array(values), self._reference(series))
+    
+    def test_describe_array_with_missing_values(self):
+        """Test that NaNs are skipped except by skewness and kurtosis"""
+        series = pd.Series([3.0, np.nan, 1.0, 7.0, np.nan, 2.0])
+        self._assert_matches(describe_array(series.to_numpy()), self._reference(series))
+    
+    def test_multi_column_summary(self):
+        """Test that the multi-column branch returns rich statistics for every numeric column"""
+        rng = np.random.default_rng(3)
+        data = pd.DataFrame({
+            'a': rng.normal(size=200),
+            'b': rng.integers(0, 50, 200),
+            'label': ['x', 'y'] * 100,
+        })
+        data.loc[5, 'a'] = np.nan
+        
+        summary = get_summary_statistics(data)
+        self.assertEqual(list(summary), ['a', 'b'])
+        for column in ('a', 'b'):
+            self._assert_matches(summary[column], self._reference(data[column]))
+
+
+class AppendRowsTests(TemporaryMediaTestCase):
+    BASE = b"day,riders,stations\n1,100,5\n2,120,5\n3,,6\n4,90,6\n"
+    DELTA = b"day,riders,stations\n5,150,7\n6,80.5,\n"
+    
+    def setUp(self):
+        super().setUp()
+        dataset_cache.clear()
+    
+    def tearDown(self):
+        dataset_cache.clear()
+    
+    def _upload(self, name="ridership.csv"):
+        file_obj, created = UploadedFile.objects.create_from_upload(
+            SimpleUploadedFile(name, self.BASE, content_type="text/csv")
+        )
+        if created:
+            ingest_uploaded_file(file_obj)
+        return UploadedFile.objects.get(pk=file_obj.pk)
+    
+    def _append(self, file_obj, content, session=True):
+        if session:
+            self._use_session(file_obj)
+        # Files are written once the append commits, which TestCase transactions never do
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('analysis:append_rows', args=[file_obj.pk]),
+                {'file': SimpleUploadedFile("delta.csv", content, content_type="text/csv")}
+            )
+        return json.loads(response.content)
+    
+    def _use_session(self, file_obj):
+        session = self.client.session
+        session['analysis_session_id'] = 'append-session'
+        session.save()
+        analysis_session, _ = AnalysisSession.objects.update_or_create(
+            session_id='append-session', defaults=dict(
+                data_source='upload', uploaded_file=file_obj, selected_column='riders', show_correlation=True
+            )
+        )
+        return analysis_session
+    
+    def test_append_updates_profile_and_column_store(self):
+        """Test that appended rows are merged into the stored state without re-ingesting"""
+        file_obj = self._upload()
+        result = self._append(file_obj, self.DELTA)
+        self.assertEqual((result['success'], result['rows_appended'], result['total_rows']), (True, 2, 6))
+        
+        file_obj.refresh_from_db()
+        expected = pd.read_csv(file_obj.file.path)
+        self.assertEqual(len(expected), 6)
+        profile = file_obj.profile
+        riders = MomentAccumulator.from_dict(profile.column('riders')['moments'])
+        self.assertAlmostEqual(riders.mean, expected['riders'].mean())
+        self.assertAlmostEqual(riders.var, expected['riders'].var())
+        self.assertEqual(profile.column('stations')['missing'], 1)
+        pd.testing.assert_frame_equal(
+            profile.streaming_summary().correlation.matrix(), expected.corr(), check_exact=False
+        )
+        
+        store = ColumnStore.open(file_obj.file.path)
+        self.assertEqual(len(store), 6)
+        self.assertEqual(store['riders'].iloc[-1], 80.5)
+        self.assertEqual(file_obj.file_size, os.path.getsize(file_obj.file.path))
+        self.assertEqual(file_obj.content_hash, '')
+        
+        # The new rows are a separate Parquet part; the copy written at ingest is not rewritten
+        columnar_path = find_columnar_copy(file_obj.file.path)
+        self.assertEqual(columnar_path, file_obj.columnar_file.path)
+        self.assertEqual(len(columnar_parts(columnar_path)), 2)
+        self.assertEqual(len(pd.read_parquet(columnar_path)), 4)
+        pd.testing.assert_frame_equal(read_columnar_file(columnar_path), expected, check_dtype=False)
+        self.assertEqual(count_rows(file_obj.file.path), 6)
+        
+        # Statistics and figures come from the updated profile without reading the rows again
+        self._use_session(file_obj)
+        with mock.patch('analysis.views.load_numeric_data') as load:
+            statistics = json.loads(self.client.get(reverse('analysis:get_statistics')).content)
+            plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+        load.assert_not_called()
+        self.assertEqual(statistics['summary']['count'], 6)
+        self.assertAlmostEqual(statistics['summary']['mean'], expected['riders'].mean())
+        self.assertAlmostEqual(statistics['summary']['max'], 150)
+        self.assertEqual(set(plots), {'histogram', 'boxplot', 'qqplot', 'correlation'})
+        file_obj.delete()
+    
+    def test_append_copies_shared_blob(self):
+        """Test that appending to a deduplicated upload leaves the other records untouched"""
+        first = self._upload()
+        second = self._upload("again.csv")
+        self.assertTrue(self._append(second, self.DELTA)['success'])
+        
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertNotEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.profile_id, second.profile_id)
+        self.assertEqual(first.profile.n_rows, 4)
+        self.assertEqual(len(pd.read_csv(first.file.path)), 4)
+        self.assertEqual(len(ColumnStore.open(first.file.path)), 4)
+        self.assertEqual(second.profile.n_rows, 6)
+        self.assertEqual(len(read_columnar_file(find_columnar_copy(first.file.path))), 4)
+        self.assertEqual(len(read_columnar_file(find_columnar_copy(second.file.path))), 6)
+        first.delete()
+        second.delete()
+    
+    def test_parquet_parts_widen_and_compact(self):
+        """Test that parts keep values their stored column type cannot hold and are merged once numerous"""
+        file_obj = self._upload()
+        self.assertEqual(str(pd.read_parquet(file_obj.columnar_file.path)['riders'].dtype), 'float32')
+        self.assertTrue(self._append(file_obj, b"day,riders,stations\n5,80.1,7\n")['success'])
+        data, _ = load_csv_file(file_obj.file.path)
+        self.assertEqual(data['riders'].iloc[-1], 80.1)
+        
+        # With two parts allowed, the next append merges them into the copy before adding its own
+        with mock.patch('analysis.utils.COLUMNAR_MAX_PARTS', 2):
+            for day in (6, 7):
+                self.assertTrue(self._append(file_obj, f"day,riders,stations\n{day},1,1\n".encode())['success'])
+        columnar_path = find_columnar_copy(file_obj.file.path)
+        self.assertEqual(len(columnar_parts(columnar_path)), 2)
+        self.assertEqual(len(pd.read_parquet(columnar_path)), 6)
+        pd.testing.assert_frame_equal(
+            read_columnar_file(columnar_path), pd.read_csv(file_obj.file.path), check_dtype=False
+        )
+        
+        dates = os.path.join(os.path.dirname(file_obj.file.path), 'dates.csv')
+        write_columnar_copy(pd.DataFrame({'when': pd.to_datetime(['2024-01-01', '2024-01-02'])}), dates)
+        with self.assertRaises(ArrowException):
+            stage_columnar_part(pd.DataFrame({'when': ['soon']}), dates)
+        file_obj.delete()
+    
+    def test_failed_file_write_drops_the_profile(self):
+        """Test that rows the CSV file did not receive are not left counted in the profile"""
+        file_obj = self._upload()
+        with open(file_obj.file.path, 'rb') as f:
+            original = f.read()
+        
+        def full_disk(path, mode='r', *args, **kwargs):
+            if mode == 'ab+':
+                raise OSError(28, 'No space left on device')
+            return open(path, mode, *args, **kwargs)
+        
+        with mock.patch('analysis.ingest.open', full_disk, create=True), self.assertLogs('analysis.ingest', 'ERROR'):
+            self.assertTrue(self._append(file_obj, self.DELTA)['success'])
+        
+        file_obj.refresh_from_db()
+        with open(file_obj.file.path, 'rb') as f:
+            self.assertEqual(f.read(), original)
+        self.assertIsNone(file_obj.profile)
+        self.assertEqual(len(read_columnar_file(find_columnar_copy(file_obj.file.path))), 4)
+        statistics = json.loads(self.client.get(reverse('analysis:get_statistics')).content)
+        self.assertEqual(statistics['summary']['count'], 4)
+        file_obj.delete()
+    
+    def test_append_requires_the_sessions_upload(self):
+        """Test that a client can only append to the upload of its own analysis session"""
+        file_obj = self._upload()
+        self.assertFalse(self._append(file_obj, self.DELTA, session=False)['success'])
+        other = self._upload("other.csv")
+        self._use_session(other)
+        self.assertFalse(self._append(file_obj, self.DELTA, session=False)['success'])
+        self.assertEqual(len(pd.read_csv(file_obj.file.path)), 4)
+        file_obj.delete()
+    
+    def test_failed_append_leaves_files_untouched(self):
+        """Test that no file is written when the database work of an append fails"""
+        first = self._upload()
+        second = self._upload("again.csv")
+        with open(first.file.path, 'rb') as f:
+            original = f.read()
+        blobs = set(os.listdir(os.path.dirname(first.file.path)))
+        
+        with mock.patch('analysis.ingest.update_profile', side_effect=DatabaseError("disk full")):
+            for file_obj in (first, second):
+                with self.assertRaises(DatabaseError), self.captureOnCommitCallbacks(execute=True):
+                    append_to_upload(file_obj, self.DELTA)
+        
+        with open(first.file.path, 'rb') as f:
+            self.assertEqual(f.read(), original)
+        self.assertEqual(set(os.listdir(os.path.dirname(first.file.path))), blobs)
+        self.assertEqual(len(ColumnStore.open(first.file.path)), 4)
+        self.assertEqual(len(read_columnar_file(find_columnar_copy(first.file.path))), 4)
+        first.delete()
+        second.delete()
+    
+    def test_append_rejects_mismatched_rows(self):
+        """Test that rows with other columns or text in numeric columns are refused"""
+        file_obj = self._upload()
+        self.assertFalse(self._append(file_obj, b"day,riders\n5,150\n")['success'])
+        self.assertFalse(self._append(file_obj, b"day,riders,stations\n5,many,7\n")['success'])
+        self.assertEqual(len(pd.read_csv(file_obj.file.path)), 4)
+        file_obj.delete()
+    
+    @override_settings(STREAMING_THRESHOLD_BYTES=0)
+    def test_streamed_dataset_reflects_appended_rows(self):
+        """Test that large datasets are summarised from the updated profile after an append"""
+        file_obj = self._upload()
+        self.assertTrue(self._append(file_obj, self.DELTA)['success'])
+        self._use_session(UploadedFile.objects.get(pk=file_obj.pk))
+        
+        statistics = json.loads(self.client.get(reverse('analysis:get_statistics')).content)
+        self.assertTrue(statistics['summary']['approximate_quantiles'])
+        self.assertEqual(statistics['summary']['count'], 6)
+        self.assertEqual(statistics['summary']['max'], 150)
+        plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+        self.assertIn('correlation', plots)
+        file_obj.delete()
+
+
+class BatchHypothesisTestTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.data = pd.DataFrame({
+            'a': rng.normal(0.3, 1, 300),
+            'b': rng.exponential(1, 300),
+            'c': rng.normal(0, 2, 300),
+            'group': rng.choice(['x', 'y'], 300),
+        })
+        self.data.loc[[3, 50, 77], 'a'] = np.nan
+    
+    def test_one_sample_matches_scipy(self):
+        """Test that vectorized one-sample tests match scipy column by column"""
+        result = perform_batch_hypothesis_tests(self.data, test_value=0.1, correction='bonferroni')
+        self.assertEqual([row['column'] for row in result['results']], ['a', 'b', 'c'])
+        for row in result['results']:
+            expected = stats.ttest_1samp(self.data[row['column']], 0.1, nan_policy='omit')
+            self.assertAlmostEqual(row['statistic'], expected.statistic)
+            self.assertAlmostEqual(row['p_value'], expected.pvalue)
+            self.assertAlmostEqual(row['p_adjusted'], min(expected.pvalue * 3, 1.0))
+    
+    def test_two_sample_and_paired_match_scipy(self):
+        """Test that grouped (Welch) and paired tests match scipy"""
+        grouped = perform_batch_hypothesis_tests(self.data, test='two_sample', group_column='group')
+        first = self.data[self.data['group'] == grouped['groups'][0]]
+        second = self.data[self.data['group'] == grouped['groups'][1]]
+        for row in grouped['results']:
+            expected = stats.ttest_ind(first[row['column']], second[row['column']], equal_var=False, nan_policy='omit')
+            self.assertAlmostEqual(row['statistic'], expected.statistic)
+            self.assertAlmostEqual(row['p_value'], expected.pvalue)
+        
+        paired = perform_batch_hypothesis_tests(self.data, test='paired', pair_column='c')
+        self.assertEqual([row['column'] for row in paired['results']], ['a', 'b'])
+        for row in paired['results']:
+            expected = stats.ttest_rel(self.data[row['column']], self.data['c'], nan_policy='omit')
+            self.assertAlmostEqual(row['statistic'], expected.statistic)
+            self.assertAlmostEqual(row['p_value'], expected.pvalue)
+    
+    def test_p_value_corrections(self):
+        """Test Holm and Benjamini-Hochberg adjustments against their definitions"""
+        p = np.array([0.01, 0.04, np.nan, 0.03, 0.005])
+        np.testing.assert_allclose(adjust_p_values(p, 'holm'), [0.03, 0.06, np.nan, 0.06, 0.02])
+        tested = ~np.isnan(p)
+        np.testing.assert_allclose(adjust_p_values(p, 'bh')[tested], stats.false_discovery_control(p[tested]))
+        with self.assertRaises(ValueError):
+            adjust_p_values(p, 'sidak')
+    
+    def test_endpoint_returns_results_table(self):
+        """Test that the endpoint tests every numeric column of the session's dataset"""
+        session = self.client.session
+        session['analysis_session_id'] = 'batch-session'
+        session.save()
+        AnalysisSession.objects.create(session_id='batch-session', data_source='random', sample_size=200)
+        
+        response = json.loads(self.client.get(reverse('analysis:get_hypothesis_tests'), {'correction': 'bh'}).content)
+        self.assertEqual(response['correction'], 'bh')
+        self.assertEqual([row['column'] for row in response['results']], ['x', 'y', 'z'])
+        self.assertIn('reject', response['results'][0])
+        
+        response = json.loads(self.client.get(reverse('analysis:get_hypothesis_tests'), {'test': 'paired'}).content)
+        self.assertIn('error', response)
+
+
+class ResamplingTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.skewed = rng.lognormal(0, 1, 400)
+        self.shifted = rng.lognormal(0.4, 1, 300)
+    
+    def _result(self, *args, **kwargs):
+        return list(iter_resampling(*args, **kwargs))[-1]['result']
+    
+    def test_bootstrap_is_seeded_and_covers_statistic(self):
+        """Test that bootstrap intervals are reproducible for a seed and bracket the estimate"""
+        first = self._result(self.skewed, n_resamples=2500, seed=3)
+        again = self._result(self.skewed, n_resamples=2500, seed=3)
+        other = self._result(self.skewed, n_resamples=2500, seed=4)
+        
+        self.assertEqual(first, again)
+        self.assertNotEqual(first['ci_low'], other['ci_low'])
+        self.assertLess(first['ci_low'], self.skewed.mean())
+        self.assertGreater(first['ci_high'], self.skewed.mean())
+        expected_se = self.skewed.std(ddof=1) / np.sqrt(len(self.skewed))
+        self.assertAlmostEqual(first['standard_error'], expected_se, delta=expected_se * 0.1)
+    
+    def test_pool_matches_serial_execution(self):
+        """Test that splitting resamples across worker processes does not change results"""
+        serial = self._result(self.skewed, self.shifted, statistic='median', n_resamples=3000, seed=8)
+        with mock.patch('analysis.resampling.PARALLEL_MIN_ELEMENTS', 0):
+            pooled = self._result(self.skewed, self.shifted, statistic='median', n_resamples=3000, seed=8, workers=2)
+        self.assertEqual(serial, pooled)
+    
+    def test_permutation_p_values(self):
+        """Test that permutation p-values separate shifted from identical distributions"""
+        shifted = self._result(self.skewed, self.shifted, method='permutation', n_resamples=2000)
+        self.assertLess(shifted['p_value'], 0.01)
+        same = self._result(self.skewed[:200], self.skewed[200:], method='permutation', n_resamples=2000)
+        self.assertGreater(same['p_value'], 0.05)
+        centred = self._result(self.skewed - np.median(self.skewed), method='permutation', statistic='median')
+        self.assertGreater(centred['p_value'], 0.5)
+        with self.assertRaises(ValueError):
+            iter_resampling(self.skewed, method='jackknife')
+        with self.assertRaises(ValueError):
+            iter_resampling(self.skewed, seed=-1)
+    
+    def test_endpoint_streams_progress(self):
+        """Test that the endpoint streams progress events before the result"""
+        session = self.client.session
+        session['analysis_session_id'] = 'resampling-session'
+        session.save()
+        AnalysisSession.objects.create(
+            session_id='resampling-session', data_source='random', sample_size=300, selected_column='x'
+        )
+        
+        response = self.client.get(reverse('analysis:get_resampling'), {'n_resamples': 3000, 'stream': 'true'})
+        events = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([event['progress'] for event in events[:-1]], [1 / 3, 2 / 3])
+        self.assertEqual(events[-1]['result']['column'], 'x')
+        self.assertLess(events[-1]['result']['ci_low'], events[-1]['result']['ci_high'])
+        
+        result = json.loads(self.client.get(reverse('analysis:get_resampling'), {'n_resamples': 3000}).content)
+        self.assertEqual(result, events[-1]['result'])
+        
+        result = json.loads(self.client.get(reverse('analysis:get_resampling'), {'seed': -1}).content)
+        self.assertIn('error', result)
+
+
+class NormalityTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.normal = rng.normal(10, 2, 20000)
+        self.skewed = rng.exponential(1, 20000)
+    
+    def test_moment_tests_match_scipy(self):
+        """Test that K² and Jarque-Bera from moments match scipy on the full column"""
+        for values in (self.normal, self.skewed, self.normal[:40]):
+            result = normality_tests(values)['tests']
+            expected = stats.normaltest(values)
+            self.assertAlmostEqual(result['dagostino_k2']['statistic'], expected.statistic, places=6)
+            self.assertAlmostEqual(result['dagostino_k2']['p_value'], expected.pvalue, places=6)
+            expected = stats.jarque_bera(values)
+            self.assertAlmostEqual(result['jarque_bera']['statistic'], expected.statistic, places=6)
+            self.assertAlmostEqual(result['jarque_bera']['p_value'], expected.pvalue, places=6)
+    
+    def test_anderson_darling_matches_scipy(self):
+        """Test the Anderson-Darling statistic against scipy and its p-value against the verdict"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected = stats.anderson(self.normal[:500], 'norm')
+        statistic, p_value = anderson_darling(self.normal[:500])
+        self.assertAlmostEqual(statistic, expected.statistic, places=6)
+        self.assertGreater(p_value, 0.05)
+        self.assertLess(anderson_darling(self.skewed)[1], 1e-6)
+    
+    def test_large_columns_use_the_full_column(self):
+        """Test that large columns are judged by K² on every row, with a random Shapiro subsample"""
+        result = normality_tests(self.skewed)
+        self.assertEqual((result['test'], result['n']), ('dagostino_k2', 20000))
+        self.assertFalse(result['is_normal'])
+        self.assertEqual(result['tests']['shapiro']['n'], 5000)
+        self.assertTrue(result['tests']['shapiro']['sampled'])
+        
+        # A column whose first 5000 rows look normal is no longer judged on its head
+        values = np.concatenate([self.normal[:5000], self.skewed * 50])
+        test = perform_hypothesis_test(pd.DataFrame({'x': values}), 'x')
+        self.assertFalse(test['is_normal'])
+        self.assertEqual(test['normality_n'], len(values))
+        
+        small = perform_hypothesis_test(pd.DataFrame({'x': self.normal[:1000]}), 'x')
+        self.assertEqual((small['normality_test'], small['normality_n']), ('Shapiro-Wilk', 1000))
+        self.assertAlmostEqual(small['shapiro_p_value'], stats.shapiro(self.normal[:1000]).pvalue)
+    
+    def test_streaming_summary_reports_normality(self):
+        """Test that the moments-only path reports K² over all rows"""
+        summary = StreamingSummary()
+        summary.update(pd.DataFrame({'x': self.skewed}))
+        result = perform_hypothesis_test(summary, 'x')
+        self.assertEqual(result['normality_n'], 20000)
+        self.assertFalse(result['is_normal'])
+        self.assertIsNone(result['shapiro_p_value'])
+
+
+class QQPlotTests(TestCase):
+    def test_small_samples_match_probplot(self):
+        """Test that every order statistic is drawn at scipy's plotting positions, with a quartile line"""
+        values = np.random.default_rng(2).normal(3, 2, 150)
+        points = qq_points(values)
+        (theoretical, ordered), _ = stats.probplot(values)
+        np.testing.assert_allclose(points['theoretical'], theoretical)
+        np.testing.assert_array_equal(points['sample'], ordered)
+        q1, q3 = np.quantile(values, [0.25, 0.75])
+        self.assertAlmostEqual(points['slope'], (q3 - q1) / (stats.norm.ppf(0.75) - stats.norm.ppf(0.25)), delta=0.05)
+    
+    def test_large_samples_are_thinned_to_exact_order_statistics(self):
+        """Test that a large column gives a bounded number of exact order statistics, denser in the tails"""
+        values = np.random.default_rng(3).exponential(size=200000)
+        points = qq_points(values, distribution='expon')
+        ordered = np.sort(values)
+        self.assertLessEqual(len(points['sample']), QQ_MAX_POINTS)
+        np.testing.assert_array_equal(points['sample'][:10], ordered[:10])
+        self.assertEqual(points['sample'][-1], ordered[-1])
+        ranks = np.searchsorted(ordered, points['sample'])
+        gaps = np.diff(ranks)
+        self.assertLess(gaps[len(gaps) - 20:].mean(), gaps[len(gaps) // 2 - 10:len(gaps) // 2 + 10].mean())
+        self.assertAlmostEqual(points['slope'], 1, delta=0.05)
+        
+        figure = create_qq_plot_plotly(pd.DataFrame({'value': values}), 'value', 'expon')
+        self.assertEqual(len(plotly_array(figure['data'][0]['y'])), len(points['sample']))
+        self.assertIn('Exponential', figure['layout']['title']['text'])
+        with self.assertRaises(ValueError):
+            qq_points(values, distribution='cauchy')
+
+
+class CorrelationEngineTests(TestCase):
+    def setUp(self):
+        dataset_cache.clear()
+        figure_cache.clear()
+        rng = np.random.default_rng(8)
+        self.data = pd.DataFrame(rng.normal(size=(500, 4)), columns=['a', 'b', 'c', 'd'])
+        self.data['b'] += self.data['a']
+        self.data['d'] = np.round(self.data['d'])
+        self.data.loc[rng.choice(500, 60), 'a'] = np.nan
+        self.data.loc[rng.choice(500, 40), 'c'] = np.nan
+        self.data['constant'] = 1.0
+        self.data['label'] = 'x'
+    
+    def tearDown(self):
+        dataset_cache.clear()
+    
+    def test_methods_match_pandas_pairwise(self):
+        """Test every method against DataFrame.corr(), including missing values and constant columns"""
+        numeric = self.data.drop(columns='label')
+        for method in ('pearson', 'spearman', 'kendall'):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                expected = numeric.corr(method=method)
+            pd.testing.assert_frame_equal(correlation_matrix(self.data, method), expected, check_exact=False)
+        with self.assertRaises(ValueError):
+            correlation_matrix(self.data, 'distance')
+    
+    def test_plot_matrix_is_cached_per_method(self):
+        """Test that repeated plot requests reuse the cached matrix for the session's method"""
+        session = self.client.session
+        session['analysis_session_id'] = 'correlation-session'
+        session.save()
+        analysis_session = AnalysisSession.objects.create(
+            session_id='correlation-session', data_source='random', sample_size=300,
+            selected_column='x', correlation_method='spearman'
+        )
+        
+        with mock.patch('analysis.views.correlation_matrix', wraps=correlation_matrix) as compute:
+            for _ in range(2):
+                plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+                self.assertIn('Spearman', plots['correlation']['layout']['title']['text'])
+            self.assertEqual(compute.call_count, 1)
+            
+            analysis_session.correlation_method = 'kendall'
+            analysis_session.save()
+            self.client.get(reverse('analysis:get_plots'))
+            self.assertEqual(compute.call_count, 2)
+
+
+class GroupStatisticsTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(17)
+        self.data = pd.DataFrame({
+            'value': rng.normal(50, 10, 1000).round(1),
+            'type': rng.choice(['Benign', 'Malignant'], 1000),
+            'stage': pd.Categorical(rng.choice(['I', 'II', 'III'], 1000)),
+        })
+        self.data.loc[[1, 20, 300], 'value'] = np.nan
+        self.data.loc[[5, 6], 'type'] = None
+    
+    def test_matches_groupby_and_scipy(self):
+        """Test per-group statistics against pandas groupby and the tests against scipy"""
+        result = perform_group_statistics(self.data, 'value', ['type', 'stage'])
+        grouped = self.data.groupby(['type', 'stage'], observed=True)['value']
+        expected = grouped.agg(['count', 'mean', 'std', 'min', 'median', 'max'])
+        expected['q25'] = grouped.quantile(0.25)
+        self.assertEqual(result['n_groups'], len(expected))
+        for row, (keys, reference) in zip(result['groups'], expected.iterrows()):
+            self.assertEqual((row['group']['type'], row['group']['stage']), keys)
+            self.assertEqual(row['count'], reference['count'])
+            for key in ('mean', 'std', 'min', 'q25', 'median', 'max'):
+                self.assertAlmostEqual(row[key], reference[key])
+        
+        samples = [values.dropna() for _, values in grouped]
+        self.assertAlmostEqual(result['anova']['p_value'], stats.f_oneway(*samples).pvalue)
+        self.assertAlmostEqual(result['kruskal']['statistic'], stats.kruskal(*samples).statistic)
+        self.assertAlmostEqual(result['kruskal']['p_value'], stats.kruskal(*samples).pvalue)
+    
+    def test_errors_and_truncation(self):
+        """Test input validation and that large group tables are capped"""
+        self.assertIn('error', perform_group_statistics(self.data, 'type', ['stage']))
+        self.assertIn('error', perform_group_statistics(self.data, 'value', ['grade']))
+        self.assertIn('error', perform_group_statistics(self.data, 'value', []))
+        result = perform_group_statistics(self.data, 'value', ['type', 'stage'], max_groups=2)
+        self.assertTrue(result['truncated'])
+        self.assertEqual(len(result['groups']), 2)
+    
+    def test_endpoint_groups_session_dataset(self):
+        """Test the endpoint on the tumor dataset grouped by two columns"""
+        session = self.client.session
+        session['analysis_session_id'] = 'group-session'
+        session.save()
+        AnalysisSession.objects.create(
+            session_id='group-session', data_source='local', selected_column='Survival_Rate'
+        )
+        response = json.loads(self.client.get(
+            reverse('analysis:get_group_statistics'), {'group_column': ['Tumor_Type', 'Stage']}
+        ).content)
+        self.assertEqual(response['column'], 'Survival_Rate')
+        self.assertEqual(sum(row['count'] for row in response['groups']), 20000)
+        self.assertIsNotNone(response['anova']['p_value'])
+
+
+class TimeSeriesTests(TemporaryMediaTestCase):
+    SOURCE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'MTA_Daily_Ridership.csv')
+    COLUMN = 'Subways: Total Estimated Ridership'
+    
+    def setUp(self):
+        super().setUp()
+        dataset_cache.clear()
+        with open(self.SOURCE, 'rb') as f:
+            self.lines = f.read().splitlines(keepends=True)
+    
+    def tearDown(self):
+        dataset_cache.clear()
+    
+    def _upload(self, rows):
+        file_obj, _ = UploadedFile.objects.create_from_upload(SimpleUploadedFile(
+            "ridership.csv", b"".join(self.lines[:rows + 1]), content_type="text/csv"
+        ))
+        ingest_uploaded_file(file_obj)
+        return UploadedFile.objects.get(pk=file_obj.pk)
+    
+    def test_pyramid_matches_resampled_rows(self):
+        """Test that ISO dates are parsed and pyramid levels equal resampling the daily rows"""
+        data, _ = load_csv_file(self.SOURCE)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data['Date']))
+        pyramid = TimeSeriesPyramid.from_dict(TimeSeriesPyramid.from_frame(data).to_dict())
+        
+        daily = data.set_index('Date')[self.COLUMN].astype(float)
+        monthly = daily.resample('MS').mean()
+        series = period_series(pyramid.levels['M'], self.COLUMN, 'M', window=3, yoy=True)
+        np.testing.assert_allclose(series['mean'], monthly.to_numpy())
+        np.testing.assert_allclose(series['rolling_mean'][2], daily['2020-03':'2020-05'].mean())
+        np.testing.assert_allclose(series['yoy_change'][12], monthly.iloc[12] / monthly.iloc[0] - 1)
+        weekly = daily.resample('W-SUN').mean()
+        np.testing.assert_allclose(period_series(pyramid.levels['W'], self.COLUMN, 'W')['mean'], weekly.to_numpy())
+    
+    def test_append_folds_rows_into_pyramid(self):
+        """Test that appended rows update the stored pyramid as if the file had been ingested whole"""
+        file_obj = self._upload(600)
+        session = self.client.session
+        session['analysis_session_id'] = 'timeseries-session'
+        session.save()
+        AnalysisSession.objects.create(session_id='timeseries-session', data_source='upload', uploaded_file=file_obj)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('analysis:append_rows', args=[file_obj.pk]),
+                {'file': SimpleUploadedFile("delta.csv", b"".join(self.lines[:1] + self.lines[601:701]))}
+            )
+        self.assertEqual(json.loads(response.content)['rows_appended'], 100)
+        
+        file_obj.refresh_from_db()
+        appended = TimeSeriesPyramid.from_dict(file_obj.profile.time_series)
+        source, _ = load_csv_file(self.SOURCE, nrows=700)
+        expected = TimeSeriesPyramid.from_frame(source)
+        for resolution, level in expected.levels.items():
+            pd.testing.assert_frame_equal(appended.levels[resolution], level, check_names=False)
+        
+        # The Parquet copy keeps its dates typed after the new rows are added to it
+        columnar = read_columnar_file(find_columnar_copy(file_obj.file.path))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(columnar['Date']))
+        pd.testing.assert_series_equal(columnar[self.COLUMN], source[self.COLUMN], check_dtype=False)
+    
+    def test_endpoint_picks_resolution_for_the_span(self):
+        """Test that wide spans are served from the pyramid and short ones from the daily rows"""
+        file_obj = self._upload(len(self.lines) - 1)
+        session = self.client.session
+        session['analysis_session_id'] = 'timeseries-session'
+        session.save()
+        AnalysisSession.objects.create(
+            session_id='timeseries-session', data_source='upload', uploaded_file=file_obj,
+            selected_column=self.COLUMN
+        )
+        url = reverse('analysis:get_time_series')
+        
+        with mock.patch('analysis.views.load_data', wraps=load_data) as loads:
+            overview = json.loads(self.client.get(url).content)
+            self.assertEqual(overview['resolution'], 'W')
+            self.assertEqual(json.loads(self.client.get(url, {'resolution': 'Y', 'yoy': 'true'}).content)['resolution'], 'Y')
+            loads.assert_not_called()
+        
+        zoomed = json.loads(self.client.get(url, {'start': '2023-01-01', 'end': '2023-03-31', 'window': 7}).content)
+        self.assertEqual(zoomed['resolution'], 'D')
+        self.assertEqual(len(zoomed['periods']), 90)
+        self.assertEqual(zoomed['periods'][0], '2023-01-01T00:00:00')
+        self.assertIn('rolling_mean', zoomed)
+        self.assertIn('error', json.loads(self.client.get(url, {'resolution': 'H'}).content))
+
+
+class RandomDataTests(TestCase):
+    def setUp(self):
+        dataset_cache.clear()
+    
+    def test_generation_is_deterministic(self):
+        """Test that the same seed, size and distribution give the same data and a new seed does not"""
+        first = generate_random_data(500, seed=7)
+        pd.testing.assert_frame_equal(first, generate_random_data(500, seed=7))
+        self.assertFalse(first.equals(generate_random_data(500, seed=8)))
+        self.assertFalse(first.equals(generate_random_data(500, seed=7, distribution='uniform')))
+    
+    def test_chunks_do_not_depend_on_sample_size(self):
+        """Test that chunked samples are prefixes of each other and match the in-memory frame"""
+        with mock.patch('analysis.randomdata.RANDOM_CHUNK_ROWS', 100):
+            chunks = list(iter_random_chunks(250, seed=3))
+            self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 50])
+            longer = generate_random_data(300, seed=3)
+            summary = summarize_random(250, seed=3)
+        data = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(data, longer.head(250))
+        self.assertEqual(len(summary), 250)
+        self.assertAlmostEqual(summary.moments['x'].mean, data['x'].mean())
+    
+    def test_distributions(self):
+        """Test that every distribution has the expected support"""
+        self.assertTrue(generate_random_data(1000, distribution='uniform').stack().between(0, 1).all())
+        self.assertTrue((generate_random_data(1000, distribution='exponential') >= 0).all().all())
+        self.assertTrue((generate_random_data(1000, distribution='lognormal') > 0).all().all())
+        with self.assertRaises(ValueError):
+            generate_random_data(10, distribution='cauchy')
+    
+    @override_settings(RANDOM_STREAMING_ROWS=1000)
+    def test_large_samples_stream_into_a_cached_summary(self):
+        """Test that sessions above the streaming threshold get a summary generated once"""
+        session = AnalysisSession.objects.create(
+            session_id='random-session', data_source='random', sample_size=2500,
+            random_seed=5, random_distribution='exponential'
+        )
+        with mock.patch('analysis.views.summarize_random', wraps=summarize_random) as summarize:
+            data, error = load_data(session)
+            self.assertIs(load_data(session)[0], data)
+        self.assertIsNone(error)
+        self.assertIsInstance(data, StreamingSummary)
+        self.assertEqual(len(data), 2500)
+        summarize.assert_called_once_with(2500, 5, 'exponential')
+        
+        session.sample_size = 500
+        data, _ = load_data(session)
+        pd.testing.assert_frame_equal(data, generate_random_data(500, seed=5, distribution='exponential'))
+    
+    @override_settings(RANDOM_STREAMING_ROWS=1000, RANDOM_WAIT_SECONDS=0)
+    def test_slow_generation_continues_after_the_request(self):
+        """Test that a request does not wait for a large dataset, which is cached once generated"""
+        session = AnalysisSession.objects.create(session_id='random-session', data_source='random', sample_size=3000)
+        release = threading.Event()
+        
+        def slow_summary(*args):
+            release.wait(5)
+            return summarize_random(*args)
+        
+        with mock.patch('analysis.views.summarize_random', side_effect=slow_summary) as summarize:
+            data, error = load_data(session)
+            self.assertIsNone(data)
+            self.assertIn('Still generating', error)
+            self.assertIsNone(load_data(session)[0])
+            release.set()
+            for _ in range(100):
+                data, error = load_data(session)
+                if data is not None:
+                    break
+                time.sleep(0.05)
+        self.assertIsInstance(data, StreamingSummary)
+        self.assertEqual(len(data), 3000)
+        summarize.assert_called_once()
+
+
+class FigureCacheTests(TestCase):
+    def setUp(self):
+        dataset_cache.clear()
+        figure_cache.clear()
+        session = self.client.session
+        session['analysis_session_id'] = 'figure-session'
+        session.save()
+        self.analysis_session = AnalysisSession.objects.create(
+            session_id='figure-session', data_source='random', sample_size=2000,
+            selected_column='x', show_correlation=True
+        )
+    
+    def test_repeat_views_and_color_changes_skip_rendering(self):
+        """Test that unchanged figures come from the cache and a colour change re-renders only the histogram"""
+        url = reverse('analysis:get_plots')
+        first = json.loads(self.client.get(url).content)
+        self.assertEqual(set(first), {'histogram', 'boxplot', 'qqplot', 'correlation'})
+        
+        with mock.patch('analysis.views.load_numeric_data', wraps=load_numeric_data) as loads:
+            self.assertEqual(json.loads(self.client.get(url).content), first)
+            loads.assert_not_called()
+        self.assertEqual(figure_cache.stats()['hits'], 4)
+        
+        self.analysis_session.color = 'red'
+        self.analysis_session.save()
+        with mock.patch('analysis.views.render_plot', wraps=render_plot) as renders:
+            recolored = json.loads(self.client.get(url).content)
+        self.assertEqual([call.args[2] for call in renders.call_args_list], ['histogram'])
+        self.assertNotEqual(recolored['histogram'], first['histogram'])
+        self.assertEqual(recolored['correlation'], first['correlation'])
+        
+        stats = json.loads(self.client.get(reverse('analysis:cache_stats')).content)['figures']
+        self.assertEqual(stats['misses'], 5)
+    
+    def test_settings_without_a_figures_cache(self):
+        """Test that plots still work when CACHES has no 'figures' entry, using the default cache"""
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            plots = json.loads(self.client.get(reverse('analysis:get_plot', args=['histogram'])).content)
+            self.assertIn('histogram', plots)
+            self.assertEqual(figure_cache.stats()['backend'], 'LocMemCache')
+    
+    def test_deployment_settings_keep_the_figures_cache(self):
+        """Test that the Docker and production settings keep the figures cache of settings.py"""
+        for name in ('settings_docker', 'settings_production'):
+            with mock.patch.dict(os.environ, {'REDIS_URL': 'redis://redis:6379/0'}):
+                module = importlib.reload(importlib.import_module(f'statistical_analysis.{name}'))
+            self.assertIn('figures', module.CACHES, name)
+            self.assertNotEqual(module.CACHES['default'], module.CACHES['figures'], name)
+    
+    def test_file_backend_is_shared_between_caches(self):
+        """Test that figures stored through the file backend are visible to another process's cache"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+        with override_settings(CACHES={'default': backend, 'figures': backend}):
+            writer, reader = FigureCache('figures'), FigureCache('figures')
+            dataset_key = ('random', 10, 1, 'normal')
+            writer.set(dataset_key, 'boxplot', {'column': 'x'}, '{"data": []}')
+            self.assertEqual(reader.get_many(dataset_key, {'boxplot': {'column': 'x'}, 'qqplot': {}}),
+                             {'boxplot': '{"data": []}'})
+            self.assertEqual(reader.get_many(dataset_key, {'boxplot': {'column': 'y'}}), {})
+            self.assertEqual(reader.stats()['backend'], 'FileBasedCache')
+            self.assertEqual((reader.hits, reader.misses), (1, 2))
+
+
+class FigureSpecTests(TestCase):
+    def test_arrays_are_encoded_as_typed_arrays(self):
+        """Test that numeric arrays become base64 typed arrays Plotly.js can decode, and others lists"""
+        values = np.array([1.5, np.nan, -2.0])
+        np.testing.assert_array_equal(plotly_array(encode_array(values)), values)
+        self.assertEqual(encode_array(np.arange(3))['dtype'], 'i4')
+        self.assertEqual(encode_array(np.array([2 ** 40]))['dtype'], 'f8')
+        self.assertEqual(encode_array(np.ones((2, 3)))['shape'], '2, 3')
+        self.assertEqual(encode_array(np.array(['a', 'b'], dtype=object)), ['a', 'b'])
+    
+    def test_specs_render_like_validated_figures(self):
+        """Test that a spec is plain JSON, names its template and is accepted by go.Figure"""
+        spec = figure(
+            [{'type': 'bar', 'x': np.arange(3.0), 'y': [np.int64(1), 2, 3]}],
+            title='Counts', yaxis_title='Count', bargap=0
+        )
+        self.assertEqual(json.loads(json.dumps(spec)), spec)
+        self.assertEqual(spec['layout']['template'], 'plotly_white')
+        self.assertEqual(spec['layout']['yaxis']['title']['text'], 'Count')
+        
+        fig = to_plotly_figure(spec)
+        self.assertEqual(fig.layout.title.text, 'Counts')
+        self.assertEqual(fig.layout.template.layout.plot_bgcolor, 'white')
+    
+    def test_plots_are_encoded_once(self):
+        """Test that the plots endpoint returns figures as JSON objects rather than JSON strings"""
+        figure_cache.clear()
+        self.assertContains(self.client.get(reverse('analysis:dashboard')), 'id="plot-templates"')
+        plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+        self.assertIsInstance(plots['histogram'], dict)
+        self.assertEqual(plots['histogram']['data'][0]['type'], 'bar')
+    
+    def test_benchmark_command(self):
+        """Test that the plot benchmark reports every figure"""
+        out = io.StringIO()
+        call_command('benchmark_plots', rows=2000, columns=4, repeat=1, stdout=out)
+        for plot in ('histogram', 'boxplot', 'qqplot', 'correlation', 'confusion_matrix', 'metrics_chart'):
+            self.assertIn(plot, out.getvalue())
+
+
+@override_settings(PLOT_WORKERS=4)
+class PlotEndpointTests(TestCase):
+    def setUp(self):
+        dataset_cache.clear()
+        figure_cache.clear()
+        session = self.client.session
+        session['analysis_session_id'] = 'plot-session'
+        session.save()
+        AnalysisSession.objects.create(
+            session_id='plot-session', data_source='random', sample_size=1000,
+            selected_column='y', show_correlation=True
+        )
+    
+    def test_single_plot_endpoint(self):
+        """Test that a plot can be requested on its own"""
+        plots = json.loads(self.client.get(reverse('analysis:get_plot', args=['qqplot'])).content)
+        self.assertEqual(list(plots), ['qqplot'])
+        self.assertIn('error', json.loads(self.client.get(reverse('analysis:get_plot', args=['pie'])).content))
+        plots = json.loads(self.client.get(reverse('analysis:get_plots'), {'plots': 'histogram,boxplot'}).content)
+        self.assertEqual(set(plots), {'histogram', 'boxplot'})
+    
+    def test_batch_renders_plots_concurrently(self):
+        """Test that the figures of one batch are rendered at the same time"""
+        barrier = threading.Barrier(len(PLOT_TYPES), timeout=5)
+        
+        def render(*args):
+            barrier.wait()
+            return render_plot(*args)
+        
+        with mock.patch('analysis.views.render_plot', side_effect=render):
+            plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+        self.assertNotIn('errors', plots)
+        self.assertEqual(set(plots), set(PLOT_TYPES))
+    
+    @override_settings(PLOT_TIMEOUT_SECONDS=0.2)
+    def test_slow_plots_time_out_into_the_cache(self):
+        """Test that a slow figure is left out of the response and served from the cache once done"""
+        release, finished = threading.Event(), threading.Event()
+        
+        def render(analysis_session, data, plot, params):
+            if plot == 'correlation':
+                release.wait(5)
+            return render_plot(analysis_session, data, plot, params)
+        
+        original_set = figure_cache.set
+        
+        def record_set(dataset_key, plot, params, figure):
+            original_set(dataset_key, plot, params, figure)
+            if plot == 'correlation':
+                finished.set()
+        
+        with mock.patch('analysis.views.render_plot', side_effect=render), \
+                mock.patch.object(figure_cache, 'set', side_effect=record_set):
+            plots = json.loads(self.client.get(reverse('analysis:get_plots')).content)
+            self.assertEqual(set(plots), {'histogram', 'boxplot', 'qqplot', 'errors'})
+            self.assertIn('correlation', plots['errors'])
+            release.set()
+            self.assertTrue(finished.wait(5))
+        
+        with mock.patch('analysis.views.load_numeric_data') as loads:
+            plots = json.loads(self.client.get(reverse('analysis:get_plot', args=['correlation'])).content)
+            loads.assert_not_called()
+        self.assertIn('correlation', plots)
@@ -0,0 +1,194 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# Precomputed pyramid levels and their pandas period frequencies; days are served from the rows
+PYRAMID_RESOLUTIONS = {'W': 'W-SUN', 'M': 'M', 'Y': 'Y'}
+RESOLUTIONS = ('D', 'W', 'M', 'Y')
+PERIOD_FREQUENCIES = {'D': 'D', **PYRAMID_RESOLUTIONS}
+# Lag used for year-over-year comparisons: whole weeks keep weekdays aligned
+PERIODS_PER_YEAR = {'D': 364, 'W': 52, 'M': 12, 'Y': 1}
+APPROXIMATE_DAYS = {'D': 1, 'W': 7, 'M': 30.44, 'Y': 365.25}
+PERIOD_STATISTICS = ('count', 'sum', 'min', 'max')
+MAX_SERIES_POINTS = 1000
+
+
+def find_date_column(data):
+    """Name of the first datetime column of a DataFrame, or None"""
+    for name in data.columns:
+        if pd.api.types.is_datetime64_any_dtype(data[name]):
+            return name
+    return None
+
+
+def aggregate_periods(data, date_column, columns, resolution):
+    """Per-period count, sum, min and max of the columns, indexed by pandas Period
+
+    Rows need not be sorted and may share a period; rows without a date are
+    dropped. Columns of the result are a (column, statistic) MultiIndex.
+    """
+    dates = pd.to_datetime(data[date_column], errors='coerce')
+    dated = dates.notna().to_numpy()
+    periods = pd.PeriodIndex(dates[dated], freq=PERIOD_FREQUENCIES[resolution])
+    values = data.loc[dated, list(columns)].astype(np.float64)
+    values.columns = [str(name) for name in values.columns]
+    # Counts are kept as floats too, so every level has one dtype whether built, merged or restored
+    aggregated = values.groupby(periods).agg(list(PERIOD_STATISTICS)).astype(np.float64)
+    aggregated.index = pd.PeriodIndex(aggregated.index, freq=PERIOD_FREQUENCIES[resolution])
+    return aggregated
+
+
+def _combine(levels):
+    """Merge per-period aggregates that may cover the same periods"""
+    combined = pd.concat(levels)
+    how = {key: key[1] if key[1] in ('min', 'max') else 'sum' for key in combined.columns}
+    return combined.groupby(level=0).agg(how).sort_index()
+
+
+class TimeSeriesPyramid:
+    """Weekly, monthly and yearly aggregates of the numeric columns of a dated dataset
+
+    Each level keeps per-period counts, sums, minima and maxima, which merge
+    exactly, so appended rows are folded in without revisiting earlier ones and
+    any span of a long series is served from the coarsest level that still
+    shows enough detail.
+    """
+
+    def __init__(self, date_column, columns):
+        self.date_column = str(date_column)
+        self.columns = [str(name) for name in columns]
+        self.levels = {}
+
+    @classmethod
+    def from_frame(cls, data, date_column=None):
+        """Build the pyramid of a DataFrame, or return None when it has no datetime column"""
+        date_column = date_column or find_date_column(data)
+        if date_column is None:
+            return None
+        columns = [
+            name for name in data.columns
+            if pd.api.types.is_numeric_dtype(data[name]) and not pd.api.types.is_bool_dtype(data[name])
+        ]
+        return cls(date_column, columns).update(data)
+
+    def update(self, rows):
+        """Fold a batch of rows (with the date column and every pyramid column) into each level"""
+        by_name = {str(name): name for name in rows.columns}
+        rows = rows[[by_name[self.date_column]] + [by_name[name] for name in self.columns]]
+        rows.columns = [self.date_column] + self.columns
+        for resolution in PYRAMID_RESOLUTIONS:
+            batch = aggregate_periods(rows, self.date_column, self.columns, resolution)
+            if resolution in self.levels:
+                batch = _combine([self.levels[resolution], batch])
+            self.levels[resolution] = batch
+        return self
+
+    def merge(self, other):
+        """Combine another pyramid over the same columns into this one"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge time-series pyramids over different columns")
+        for resolution, level in other.levels.items():
+            self.levels[resolution] = _combine([self.levels[resolution], level]) if resolution in self.levels else level
+        return self
+
+    @property
+    def span(self):
+        """(first, last) timestamps covered, or (None, None) when empty"""
+        level = self.levels.get('Y')
+        if level is None or len(level) == 0:
+            return None, None
+        return level.index[0].start_time, level.index[-1].end_time
+
+    def choose_resolution(self, start=None, end=None, max_points=MAX_SERIES_POINTS):
+        """Finest resolution whose periods between start and end fit within max_points"""
+        first, last = self.span
+        if first is None:
+            return 'Y'
+        start = max(pd.Timestamp(start), first) if start is not None else first
+        end = min(pd.Timestamp(end), last) if end is not None else last
+        days = max((end - start).total_seconds() / 86400, 0)
+        for resolution in RESOLUTIONS:
+            if resolution in self.levels:
+                points = int(((self.levels[resolution].index.end_time >= start)
+                              & (self.levels[resolution].index.start_time <= end)).sum())
+            else:
+                points = math.ceil(days / APPROXIMATE_DAYS[resolution]) + 1
+            if points <= max_points:
+                return resolution
+        return 'Y'
+
+    def to_dict(self):
+        """JSON-safe state; missing minima and maxima become None"""
+        levels = {}
+        for resolution, level in self.levels.items():
+            levels[resolution] = {
+                'periods': [period.start_time.strftime('%Y-%m-%d') for period in level.index],
+                'values': {
+                    name: {
+                        stat: [None if np.isnan(value) else float(value) for value in level[(name, stat)]]
+                        for stat in PERIOD_STATISTICS
+                    }
+                    for name in self.columns
+                },
+            }
+        return {'date_column': self.date_column, 'columns': self.columns, 'levels': levels}
+
+    @classmethod
+    def from_dict(cls, state):
+        pyramid = cls(state['date_column'], state['columns'])
+        for resolution, level in state['levels'].items():
+            index = pd.DatetimeIndex(level['periods']).to_period(PERIOD_FREQUENCIES[resolution])
+            pyramid.levels[resolution] = pd.DataFrame(
+                {(name, stat): np.array(level['values'][name][stat], dtype=np.float64)
+                 for name in pyramid.columns for stat in PERIOD_STATISTICS},
+                index=index,
+            )
+        return pyramid
+
+
+def period_series(level, column, resolution, start=None, end=None, window=None, yoy=False):
+    """Mean series of one column at one resolution, with optional rolling mean and year-over-year change
+
+    level is a per-period aggregate (a pyramid level, or aggregate_periods()
+    over the rows for days). The rolling mean is count-weighted over the last
+    `window` periods, which equals the mean of the underlying rows. Year-over-year
+    change compares each period with the one PERIODS_PER_YEAR[resolution] earlier;
+    both are computed before the span is cut, so the first periods shown still
+    have a full window and a previous year.
+    """
+    level = level[str(column)]
+    counts = level['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = level['sum'] / counts.where(counts > 0)
+
+    result = pd.DataFrame({'mean': mean, 'count': counts, 'min': level['min'], 'max': level['max']})
+    # Consecutive periods, so rolling windows and yearly lags count calendar periods, not rows
+    full_index = pd.period_range(level.index.min(), level.index.max(), freq=level.index.freq) if len(level) else level.index
+    if window:
+        sums = level['sum'].reindex(full_index, fill_value=0).rolling(window, min_periods=1).sum()
+        rolling_counts = counts.reindex(full_index, fill_value=0).rolling(window, min_periods=1).sum()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['rolling_mean'] = (sums / rolling_counts.where(rolling_counts > 0)).reindex(result.index)
+    if yoy:
+        lag = PERIODS_PER_YEAR[resolution]
+        previous = mean.reindex(full_index).shift(lag).reindex(result.index)
+        result['previous_year'] = previous
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['yoy_change'] = (mean - previous) / previous.abs()
+
+    if start is not None:
+        result = result[result.index.end_time >= pd.Timestamp(start)]
+    if end is not None:
+        result = result[result.index.start_time <= pd.Timestamp(end)]
+
+    series = {
+        'column': str(column),
+        'resolution': resolution,
+        'periods': [period.start_time.isoformat() for period in result.index],
+    }
+    for key in result.columns:
+        values = result[key].to_numpy(dtype=np.float64)
+        series[key] = [None if np.isnan(value) else float(value) for value in values]
+    return series
@@ -11,10 +11,17 @@ urlpatterns = [
     
     # AJAX endpoints
     path('api/plots/', views.get_plots, name='get_plots'),
+    path('api/plots/<str:plot>/', views.get_plot, name='get_plot'),
     path('api/statistics/', views.get_statistics, name='get_statistics'),
+    path('api/hypothesis-tests/', views.get_hypothesis_tests, name='get_hypothesis_tests'),
+    path('api/resampling/', views.get_resampling, name='get_resampling'),
+    path('api/group-statistics/', views.get_group_statistics, name='get_group_statistics'),
+    path('api/time-series/', views.get_time_series, name='get_time_series'),
     path('api/data-preview/', views.get_data_preview, name='get_data_preview'),
     path('api/columns/', views.get_column_choices, name='get_column_choices'),
     path('api/upload/', views.upload_file, name='upload_file'),
+    path('api/upload/<int:file_id>/append/', views.append_rows, name='append_rows'),
+    path('api/cache/stats/', views.cache_stats, name='cache_stats'),
     
     # SVM Machine Learning endpoints
     path('api/svm/train/', views.train_svm, name='train_svm'),
@@ -4,10 +4,8 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import seaborn as sns
-import plotly.graph_objs as go
-import plotly.express as px
 from scipy import stats
-from scipy.stats import normaltest, shapiro
+from scipy.stats import normaltest
 import io
 import base64
 from sklearn.preprocessing import StandardScaler
@@ -16,72 +14,439 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix, classification_report
 from sklearn.preprocessing import LabelEncoder
 import json
+import os
+import re
+import csv
+import codecs
+import shutil
+import tempfile
+import pyarrow as pa
+import pyarrow.dataset as pa_dataset
+import pyarrow.parquet as pq
+from .streaming import StreamingSummary
+from .columnstore import ColumnStore
+from .kernels import box_summary, describe_array, describe_block
+from .randomdata import generate_random_data
+from .normality import normality_tests, qq_points
+from .correlation import correlation_matrix
+from .figures import colorscale, figure
+from .grouping import group_codes, group_statistics, kruskal_wallis, one_way_anova
+from .hypothesis import (
+    CORRECTION_METHODS, one_sample_tests, one_sample_tests_from_moments, paired_tests,
+    results_table, two_sample_tests
+)
 
 
-def generate_random_data(sample_size=1000):
-    """Generate random data similar to R's rnorm"""
-    np.random.seed(123)
-    return pd.DataFrame({
-        'x': np.random.normal(0, 1, sample_size),
-        'y': np.random.normal(0, 1, sample_size),
-        'z': np.random.normal(0, 1, sample_size)
-    })
+COLUMNAR_SUFFIX = '.parquet'
+# Directory next to a Parquet copy holding the parts appended to it, read in name order
+COLUMNAR_PARTS_SUFFIX = '.parts'
+# Appended parts a Parquet copy may collect before it is rewritten as a single file
+COLUMNAR_MAX_PARTS = 64
+SNIFF_SAMPLE_BYTES = 64 * 1024
+DEFAULT_CHUNK_ROWS = 100000
+# Outliers drawn per box; the rest are summarised in the hover text
+BOX_MAX_OUTLIERS = 100
+GROUP_TABLE_MAX_ROWS = 500
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+BOOLEAN_VALUE_PAIRS = [{'yes', 'no'}, {'true', 'false'}, {'y', 'n'}]
+SNIFF_DELIMITERS = ',;\t|'
+_NUMBER_PATTERN = re.compile(r'^[+-]?(\d+([.,]\d*)?|[.,]\d+)([eE][+-]?\d+)?$')
+_DECIMAL_COMMA_PATTERN = re.compile(r'^[+-]?\d+,\d+$')
+_ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+# Distinct values inspected before a text column is parsed as dates
+DATE_SNIFF_VALUES = 100
 
 
-def load_csv_file(file_path):
-    """Load CSV/Excel file with error handling"""
+def columnar_path_for(file_path):
+    """Path of the typed columnar (Parquet) copy kept alongside an uploaded file"""
+    return f"{file_path}{COLUMNAR_SUFFIX}"
+
+
+def columnar_parts(columnar_path):
+    """Files making up a Parquet copy: the one written at ingest, then the parts appended since"""
+    parts_dir = f"{columnar_path}{COLUMNAR_PARTS_SUFFIX}"
+    try:
+        names = sorted(name for name in os.listdir(parts_dir) if name.endswith(COLUMNAR_SUFFIX))
+    except OSError:
+        names = []
+    return [columnar_path] + [os.path.join(parts_dir, name) for name in names]
+
+
+def find_columnar_copy(file_path):
+    """Return the columnar copy of file_path if one exists and its newest part is not older than the source"""
+    columnar_path = columnar_path_for(file_path)
+    try:
+        newest = max(os.path.getmtime(path) for path in columnar_parts(columnar_path))
+        if newest >= os.path.getmtime(file_path):
+            return columnar_path
+    except OSError:
+        pass
+    return None
+
+
+def write_columnar_copy(df, file_path):
+    """Write df as a Parquet copy next to file_path and return its path"""
+    columnar_path = columnar_path_for(file_path)
+    temp_path = f"{columnar_path}.tmp"
+    df.to_parquet(temp_path, index=False)
+    # Parts of the previous copy go first; without them it is older than the source and ignored
+    shutil.rmtree(f"{columnar_path}{COLUMNAR_PARTS_SUFFIX}", ignore_errors=True)
+    # Atomic rename so concurrent readers never see a partially written file
+    os.replace(temp_path, columnar_path)
+    return columnar_path
+
+
+def columnar_schema(columnar_path):
+    """Arrow schema the parts of a Parquet copy are read with, widened where a part needed wider types"""
+    schemas = [pq.read_schema(path) for path in columnar_parts(columnar_path)]
+    if len(schemas) == 1:
+        return schemas[0]
+    return pa.unify_schemas(schemas, promote_options='permissive')
+
+
+def _cast_losslessly(column, arrow_type):
+    """column cast to arrow_type, or None when a value would not survive the cast"""
+    try:
+        cast = column.cast(arrow_type)
+    except pa.ArrowInvalid:
+        return None
+    # Safe casts catch overflow and truncation, but not rounding to a narrower float
+    if pa.types.is_floating(arrow_type) and column.type != arrow_type:
+        before = column.to_pandas().to_numpy(dtype=np.float64, na_value=np.nan)
+        after = cast.to_pandas().to_numpy(dtype=np.float64, na_value=np.nan)
+        if not np.array_equal(before, after, equal_nan=True):
+            return None
+    return cast
+
+
+def stage_columnar_part(df, file_path):
+    """Write df as a part for the Parquet copy of file_path; returns its temporary path
+
+    Only the new rows are encoded, so the cost does not grow with the copy. Each
+    column takes the copy's type when its values fit it unchanged and keeps its
+    own otherwise, in which case reads widen the column (say float32 to float64).
+    The part becomes visible once publish_columnar_part moves it into place.
+    Raises ArrowException when a column's new type and stored type have no
+    common wider type, such as text in a date column.
+    """
+    columnar_path = columnar_path_for(file_path)
+    stored = columnar_schema(columnar_path)
+    table = pa.Table.from_pandas(optimize_dtypes(df.set_axis(stored.names, axis=1)), preserve_index=False)
+    columns = []
+    for field in stored:
+        column = table.column(field.name)
+        cast = _cast_losslessly(column, field.type)
+        columns.append(column if cast is None else cast)
+    part = pa.table(columns, names=stored.names)
+    pa.unify_schemas([stored, part.schema], promote_options='permissive')
+    
+    parts_dir = f"{columnar_path}{COLUMNAR_PARTS_SUFFIX}"
+    os.makedirs(parts_dir, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(suffix='.tmp', dir=parts_dir)
+    os.close(handle)
+    pq.write_table(part, temp_path)
+    return temp_path
+
+
+def publish_columnar_part(temp_path, file_path):
+    """Move a staged part into place as the last part of the Parquet copy of file_path
+
+    Once the copy has more than COLUMNAR_MAX_PARTS parts it is rewritten as a
+    single file, so reads do not open ever more small files.
+    """
+    columnar_path = columnar_path_for(file_path)
+    parts = columnar_parts(columnar_path)
+    part_path = os.path.join(f"{columnar_path}{COLUMNAR_PARTS_SUFFIX}", f"{len(parts):06d}{COLUMNAR_SUFFIX}")
+    os.replace(temp_path, part_path)
+    # The rename keeps the staging time, but the copy must look at least as new as the source
+    os.utime(part_path)
+    if len(parts) >= COLUMNAR_MAX_PARTS:
+        write_columnar_copy(read_columnar_file(columnar_path), file_path)
+    return part_path
+
+
+def remove_columnar_copy(file_path):
+    """Delete the Parquet copy of file_path and its appended parts"""
+    columnar_path = columnar_path_for(file_path)
+    shutil.rmtree(f"{columnar_path}{COLUMNAR_PARTS_SUFFIX}", ignore_errors=True)
+    if os.path.isfile(columnar_path):
+        os.remove(columnar_path)
+
+
+def sniff_csv(file_path, sample_bytes=SNIFF_SAMPLE_BYTES):
+    """Detect encoding, delimiter, header and decimal convention from a bounded prefix of a CSV file"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    
+    # Encoding: honour a BOM, otherwise accept UTF-8 if the prefix decodes cleanly
+    if sample.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    elif sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
+    else:
+        try:
+            # final=False tolerates a multi-byte character cut off by the sample boundary
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = 'latin-1'
+    text = sample.decode(encoding, errors='replace')
+    
+    # Only sniff complete lines unless the whole file fit in the sample
+    if len(sample) == sample_bytes and '\n' in text:
+        text = text[:text.rfind('\n')]
+    
+    try:
+        delimiter = csv.Sniffer().sniff(text, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ','
+    
+    rows = [row for row in csv.reader(io.StringIO(text), delimiter=delimiter) if row]
+    # A header is assumed unless the first row is entirely numeric
+    header = not rows or not all(_NUMBER_PATTERN.match(field.strip()) for field in rows[0])
+    
+    # Decimal commas are only possible when the comma is not the field separator
+    decimal = '.'
+    if delimiter != ',':
+        fields = [field.strip() for row in rows[1 if header else 0:] for field in row]
+        comma_numbers = sum(1 for field in fields if _DECIMAL_COMMA_PATTERN.match(field))
+        dot_numbers = sum(1 for field in fields if re.match(r'^[+-]?\d+\.\d+$', field))
+        if comma_numbers > dot_numbers:
+            decimal = ','
+    
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'header': header,
+        'decimal': decimal,
+    }
+
+
+def read_csv_with_dialect(file_path, dialect, **kwargs):
+    """Parse a CSV file once using a sniffed dialect
+
+    If bytes past the sniffed prefix turn out not to be UTF-8, the file is re-read
+    as latin-1 (which decodes any byte sequence) and dialect is updated in place so
+    callers caching it do not hit the same failure again.
+    """
+    read_kwargs = dict(
+        sep=dialect['delimiter'],
+        header=0 if dialect['header'] else None,
+        decimal=dialect['decimal'],
+        **kwargs
+    )
+    try:
+        return pd.read_csv(file_path, encoding=dialect['encoding'], **read_kwargs)
+    except UnicodeDecodeError:
+        dialect['encoding'] = 'latin-1'
+        return pd.read_csv(file_path, encoding='latin-1', **read_kwargs)
+
+
+def looks_like_dates(values):
+    """Whether text values look like ISO 8601 dates, judged from the first DATE_SNIFF_VALUES"""
+    sample = values[:DATE_SNIFF_VALUES]
+    return len(sample) > 0 and all(isinstance(value, str) and _ISO_DATE_PATTERN.match(value.strip()) for value in sample)
+
+
+def optimize_dtypes(df):
+    """Compact column dtypes in place where no information is lost
+
+    Yes/No-style text columns without missing values become booleans, ISO 8601
+    dates become datetimes, other low-cardinality text becomes categoricals,
+    integers are downcast to the smallest type holding their range and floats
+    become float32 when every value round-trips exactly. Memory before and after is recorded in df.attrs.
+    """
+    memory_before = int(df.memory_usage(index=True, deep=True).sum())
+    
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        
+        if pd.api.types.is_integer_dtype(series) and isinstance(series.dtype, np.dtype):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        
+        elif pd.api.types.is_float_dtype(series) and series.dtype == np.float64:
+            values = series.to_numpy()
+            compact = values.astype(np.float32)
+            if np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                df[col] = compact
+        
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.dropna()
+            if len(non_null) == 0:
+                continue
+            unique_values = non_null.unique()
+            lowered = {str(value).strip().lower() for value in unique_values}
+            if len(non_null) == len(series) and any(lowered <= pair for pair in BOOLEAN_VALUE_PAIRS):
+                df[col] = non_null.astype(str).str.strip().str.lower().isin(['yes', 'true', 'y'])
+            elif looks_like_dates(unique_values):
+                try:
+                    df[col] = pd.to_datetime(series, format='ISO8601')
+                except (TypeError, ValueError):
+                    # A later value is not a date after all; keep the text
+                    pass
+            elif len(unique_values) <= CATEGORY_MAX_UNIQUE_RATIO * len(non_null):
+                df[col] = series.astype('category')
+    
+    df.attrs['memory_usage'] = {
+        'before': memory_before,
+        'after': int(df.memory_usage(index=True, deep=True).sum())
+    }
+    return df
+
+
+def read_columnar_file(columnar_path, columns=None, nrows=None):
+    """Read a Parquet copy, decoding only the requested columns and leading rows"""
+    parts = columnar_parts(columnar_path)
+    if len(parts) > 1:
+        dataset = pa_dataset.dataset(parts, schema=columnar_schema(columnar_path), format='parquet')
+        table = dataset.to_table(columns=columns) if nrows is None else dataset.head(nrows, columns=columns)
+        return table.to_pandas()
+    if nrows is None:
+        return pd.read_parquet(columnar_path, columns=columns)
+    parquet_file = pq.ParquetFile(columnar_path)
+    batch = next(parquet_file.iter_batches(batch_size=nrows, columns=columns), None)
+    if batch is None:
+        return pd.read_parquet(columnar_path, columns=columns)
+    return batch.to_pandas()
+
+
+def load_csv_file(file_path, prefer_columnar=True, dialect=None, columns=None, nrows=None):
+    """Load CSV/Excel file with error handling, preferring an up-to-date columnar copy
+
+    columns and nrows are pushed down into the reader (usecols/nrows, or Parquet
+    column selection) so only the requested columns and leading rows are parsed.
+    """
     try:
+        if prefer_columnar:
+            columnar_path = find_columnar_copy(file_path)
+            if columnar_path:
+                return read_columnar_file(columnar_path, columns, nrows), None
+        
         # Determine file type by extension
         file_extension = file_path.lower().split('.')[-1]
         
         if file_extension in ['xlsx', 'xls']:
             # Load Excel file - read first sheet
-            df = pd.read_excel(file_path, sheet_name=0, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
-            return df, None
+            df = pd.read_excel(
+                file_path, sheet_name=0, usecols=columns, nrows=nrows,
+                engine='openpyxl' if file_extension == 'xlsx' else 'xlrd'
+            )
+            return optimize_dtypes(df), None
         else:
-            # Load CSV file with different encodings
-            for encoding in ['utf-8', 'latin-1', 'iso-8859-1']:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    return df, None
-                except UnicodeDecodeError:
-                    continue
-            return None, "Unable to decode CSV file with common encodings"
+            # Sniff the dialect from a bounded prefix (unless cached) and parse exactly once
+            if dialect is None:
+                dialect = sniff_csv(file_path)
+            df = read_csv_with_dialect(file_path, dialect, usecols=columns, nrows=nrows)
+            return optimize_dtypes(df), None
     except Exception as e:
         return None, f"Error loading file: {str(e)}"
 
 
+def count_rows(file_path, dialect=None):
+    """Count data rows without parsing values, or return None when that is not possible"""
+    columnar_path = find_columnar_copy(file_path)
+    if columnar_path:
+        return sum(pq.ParquetFile(path).metadata.num_rows for path in columnar_parts(columnar_path))
+    if file_path.lower().endswith(('.xlsx', '.xls')):
+        return None
+    if dialect is None:
+        dialect = sniff_csv(file_path)
+    if dialect['encoding'] == 'utf-16':
+        return None
+    
+    # Count line breaks in binary blocks; quoted fields spanning lines are not expected here
+    lines = 0
+    last_byte = b''
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            lines += block.count(b'\n')
+            last_byte = block[-1:]
+    if last_byte and last_byte != b'\n':
+        lines += 1
+    return max(lines - (1 if dialect['header'] else 0), 0)
+
+
+def iter_chunks(file_path, dialect=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Yield the dataset in DataFrames of at most chunksize rows"""
+    columnar_path = find_columnar_copy(file_path)
+    if columnar_path:
+        for path in columnar_parts(columnar_path):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        return
+    if dialect is None:
+        dialect = sniff_csv(file_path)
+    rows_read = 0
+    try:
+        with read_csv_with_dialect(file_path, dialect, chunksize=chunksize) as reader:
+            for chunk in reader:
+                rows_read += len(chunk)
+                yield chunk
+    except UnicodeDecodeError:
+        # Bytes past the sniffed prefix were not UTF-8: resume as latin-1 after the rows already read
+        dialect['encoding'] = 'latin-1'
+        first_data_row = 1 if dialect['header'] else 0
+        
+        def already_read(row):
+            return first_data_row <= row < first_data_row + rows_read
+        
+        with read_csv_with_dialect(file_path, dialect, chunksize=chunksize, skiprows=already_read) as reader:
+            for chunk in reader:
+                yield chunk
+
+
+def summarize_stream(file_path, dialect=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Build a StreamingSummary of a file without holding more than one chunk in memory"""
+    try:
+        summary = StreamingSummary()
+        for chunk in iter_chunks(file_path, dialect, chunksize):
+            summary.update(chunk)
+        return summary, None
+    except Exception as e:
+        return None, f"Error streaming file: {str(e)}"
+
+
+def as_frame(data):
+    """Return a zero-copy DataFrame view of a ColumnStore; other inputs pass through unchanged"""
+    if isinstance(data, ColumnStore):
+        return data.to_frame()
+    return data
+
+
 def get_summary_statistics(data, column=None):
     """Calculate summary statistics for a column or dataset"""
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        if column not in data.columns:
+            column = data.numeric_columns[0] if data.numeric_columns else None
+        if column not in data.moments:
+            return {"error": "Selected column is not numeric"}
+        return data.summary_statistics(column)
+    
     if column and column in data.columns:
         series = data[column]
     elif len(data.columns) == 1:
         series = data.iloc[:, 0]
     else:
         # For multiple columns, return summary for all numeric columns
-        return data.describe().to_dict()
+        numeric = data.select_dtypes(include=[np.number])
+        block = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        return dict(zip(numeric.columns, describe_block(block)))
     
     if not pd.api.types.is_numeric_dtype(series):
         return {"error": "Selected column is not numeric"}
     
-    stats_dict = {
-        'count': int(len(series)),
-        'mean': float(series.mean()),
-        'median': float(series.median()),
-        'std': float(series.std()),
-        'var': float(series.var()),
-        'min': float(series.min()),
-        'max': float(series.max()),
-        'q25': float(series.quantile(0.25)),
-        'q75': float(series.quantile(0.75)),
-        'skewness': float(stats.skew(series)),
-        'kurtosis': float(stats.kurtosis(series))
-    }
-    return stats_dict
+    return describe_array(series.to_numpy(dtype=np.float64, na_value=np.nan))
 
 
 def perform_hypothesis_test(data, column=None, test_value=0):
     """Perform one-sample t-test"""
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        return perform_hypothesis_test_from_moments(data, column, test_value)
+    
     if column and column in data.columns:
         series = data[column]
     elif len(data.columns) == 1:
@@ -95,9 +460,10 @@ def perform_hypothesis_test(data, column=None, test_value=0):
     # One-sample t-test
     t_stat, p_value = stats.ttest_1samp(series, test_value)
     
-    # Normality tests
-    shapiro_result = shapiro(series[:5000] if len(series) > 5000 else series)  # Shapiro limited to 5000 samples
-    shapiro_stat, shapiro_p = shapiro_result
+    # Normality tests: Shapiro-Wilk up to 5000 rows, D'Agostino K² on the full column beyond that
+    normality = normality_tests(series.to_numpy(dtype=np.float64, na_value=np.nan))
+    shapiro_stat = normality['tests']['shapiro']['statistic']
+    shapiro_p = normality['tests']['shapiro']['p_value']
     
     try:
         return {
@@ -105,9 +471,12 @@ def perform_hypothesis_test(data, column=None, test_value=0):
             'p_value': float(p_value),
             'test_value': float(test_value),
             'sample_mean': float(series.mean()),
-            'shapiro_statistic': float(shapiro_stat),
-            'shapiro_p_value': float(shapiro_p),
-            'is_normal': bool(shapiro_p > 0.05)
+            'shapiro_statistic': shapiro_stat,
+            'shapiro_p_value': shapiro_p,
+            'is_normal': normality['is_normal'],
+            'normality_test': normality['label'],
+            'normality_n': normality['n'],
+            'normality': normality['tests']
         }
     except (TypeError, ValueError):
         # Fallback for any conversion issues
@@ -116,14 +485,187 @@ def perform_hypothesis_test(data, column=None, test_value=0):
             'p_value': str(p_value),
             'test_value': float(test_value),
             'sample_mean': float(series.mean()),
-            'shapiro_statistic': str(shapiro_stat),
-            'shapiro_p_value': str(shapiro_p),
-            'is_normal': bool(shapiro_p > 0.05)
+            'shapiro_statistic': shapiro_stat,
+            'shapiro_p_value': shapiro_p,
+            'is_normal': normality['is_normal'],
+            'normality_test': normality['label'],
+            'normality_n': normality['n'],
+            'normality': normality['tests']
         }
 
 
+def perform_hypothesis_test_from_moments(summary, column=None, test_value=0):
+    """One-sample t-test and moment-based normality tests computed from streaming moments"""
+    if column not in summary.columns:
+        column = summary.columns[0]
+    if column not in summary.moments:
+        return {"error": "Selected column is not numeric"}
+    
+    moments = summary.moments[column]
+    if moments.n < 2:
+        return {"error": "At least 2 values required for a t-test"}
+    
+    t_stat = (moments.mean - test_value) / (moments.std / np.sqrt(moments.n))
+    p_value = 2 * stats.t.sf(abs(t_stat), df=moments.n - 1)
+    normality = normality_tests(moments=moments)
+    return {
+        't_statistic': float(t_stat),
+        'p_value': float(p_value),
+        'test_value': float(test_value),
+        'sample_mean': float(moments.mean),
+        'shapiro_statistic': None,
+        'shapiro_p_value': None,
+        'is_normal': normality['is_normal'],
+        'normality_test': normality['label'],
+        'normality_n': normality['n'],
+        'normality': normality['tests']
+    }
+
+
+def perform_batch_hypothesis_tests(data, test='one_sample', test_value=0, group_column=None, groups=None,
+                                   pair_column=None, correction='holm', alpha=0.05, equal_var=False):
+    """Run one kind of t-test across every numeric column at once
+    
+    test is 'one_sample' (against test_value), 'two_sample' (between two levels
+    of group_column; the only two levels unless groups names them) or 'paired'
+    (each column against pair_column). P-values are adjusted for the number of
+    columns tested with the chosen correction ('bonferroni', 'holm' or 'bh').
+    """
+    data = as_frame(data)
+    if correction not in CORRECTION_METHODS:
+        return {"error": f"Unknown correction method: {correction}"}
+    
+    if isinstance(data, StreamingSummary):
+        if test != 'one_sample':
+            return {"error": "Two-sample and paired tests need raw values, which streamed datasets do not keep"}
+        columns = data.numeric_columns
+        results = one_sample_tests_from_moments([data.moments[col] for col in columns], test_value)
+    else:
+        numeric = data.select_dtypes(include=[np.number])
+        columns = [col for col in numeric.columns if col not in (group_column, pair_column)]
+        block = numeric[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        if test == 'one_sample':
+            results = one_sample_tests(block, test_value)
+        elif test == 'two_sample':
+            if group_column not in data.columns:
+                return {"error": "Select a grouping column"}
+            labels = data[group_column].astype(str).where(data[group_column].notna())
+            if groups is None:
+                groups = list(labels.dropna().unique())
+                if len(groups) != 2:
+                    return {"error": f"Grouping column has {len(groups)} groups; choose two of them"}
+            groups = [str(group) for group in groups]
+            results = two_sample_tests(
+                block, (labels == groups[0]).to_numpy(), (labels == groups[1]).to_numpy(), equal_var=equal_var
+            )
+        elif test == 'paired':
+            if pair_column not in numeric.columns:
+                return {"error": "Select a numeric column to pair with"}
+            reference = numeric[pair_column].to_numpy(dtype=np.float64, na_value=np.nan)
+            results = paired_tests(block, reference)
+        else:
+            return {"error": f"Unknown test: {test}"}
+    
+    if len(columns) == 0:
+        return {"error": "No numeric columns to test"}
+    
+    response = {
+        'test': test,
+        'correction': correction,
+        'alpha': alpha,
+        'results': results_table(columns, results, correction, alpha),
+    }
+    if test == 'two_sample':
+        response['groups'] = groups
+    return response
+
+
+def perform_group_statistics(data, column, group_columns, max_groups=GROUP_TABLE_MAX_ROWS):
+    """Statistics of a numeric column for every combination of one or more grouping columns
+    
+    Returns per-group counts, moments and quartiles, and one-way ANOVA and
+    Kruskal-Wallis tests of whether the column differs between the groups.
+    At most max_groups rows are returned; the tests always use every group.
+    """
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        return {"error": "Grouped statistics need raw values, which streamed datasets do not keep"}
+    if column not in data.columns or not pd.api.types.is_numeric_dtype(data[column]):
+        return {"error": "Selected column is not numeric"}
+    group_columns = [col for col in group_columns if col != column]
+    if not group_columns:
+        return {"error": "Select at least one grouping column"}
+    missing_columns = [col for col in group_columns if col not in data.columns]
+    if missing_columns:
+        return {"error": f"Unknown grouping column: {missing_columns[0]}"}
+    
+    codes, levels = group_codes(data[group_columns])
+    values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    grouped = group_statistics(values, codes, len(levels))
+    anova = one_way_anova(grouped['count'], grouped['mean'], grouped['m2'])
+    kruskal = kruskal_wallis(values, codes, len(levels))
+    
+    def finite(value):
+        value = float(value)
+        return value if np.isfinite(value) else None
+    
+    table = []
+    for g, keys in enumerate(levels.iloc[:max_groups].to_dict('records')):
+        row = {'group': keys}
+        row['count'] = int(grouped['count'][g])
+        row['missing'] = int(grouped['missing'][g])
+        for key in ('mean', 'std', 'min', 'q25', 'median', 'q75', 'max', 'skewness', 'kurtosis'):
+            row[key] = finite(grouped[key][g])
+        table.append(row)
+    
+    return {
+        'column': column,
+        'group_columns': group_columns,
+        'n_groups': len(levels),
+        'truncated': len(levels) > max_groups,
+        'groups': table,
+        'anova': {'statistic': finite(anova[0]), 'p_value': finite(anova[1]),
+                  'df_between': anova[2], 'df_within': anova[3]},
+        'kruskal': {'statistic': finite(kruskal[0]), 'p_value': finite(kruskal[1]), 'df': kruskal[2]},
+    }
+
+
+def resampling_samples(data, column, group_column=None, groups=None):
+    """Return (x, y, groups, error): the column's values, split in two by group_column if given"""
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        return None, None, None, "Resampling needs raw values, which streamed datasets do not keep"
+    if column not in data.columns or not pd.api.types.is_numeric_dtype(data[column]):
+        return None, None, None, "Selected column is not numeric"
+    
+    values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    if group_column is None:
+        return values, None, None, None
+    if group_column not in data.columns:
+        return None, None, None, "Grouping column not found"
+    
+    labels = data[group_column].astype(str).where(data[group_column].notna())
+    if groups is None:
+        groups = list(labels.dropna().unique())
+        if len(groups) != 2:
+            return None, None, None, f"Grouping column has {len(groups)} groups; choose two of them"
+    groups = [str(group) for group in groups]
+    first = (labels == groups[0]).to_numpy()
+    second = (labels == groups[1]).to_numpy()
+    return values[first], values[second], groups, None
+
+
 def create_histogram_plotly(data, column, bins=30, color='blue'):
-    """Create histogram using Plotly"""
+    """Create histogram using Plotly
+    
+    Values are binned server-side with np.histogram and sent as one bar per bin,
+    so the figure's size depends on the number of bins, not on the number of rows.
+    """
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        return create_histogram_from_summary(data, column, bins, color)
+    
     if column not in data.columns:
         return None
     
@@ -131,139 +673,238 @@ def create_histogram_plotly(data, column, bins=30, color='blue'):
     if not pd.api.types.is_numeric_dtype(series):
         return None
     
-    fig = px.histogram(
-        data, 
-        x=column, 
-        nbins=bins,
-        title=f'Distribution of {column}',
-        color_discrete_sequence=[color.lower()]
-    )
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    return _histogram_figure(edges, counts, column, color)
+
+
+def create_histogram_from_summary(summary, column, bins=30, color='blue'):
+    """Create histogram using Plotly from a streaming column histogram"""
+    if column not in summary.histograms:
+        return None
     
-    fig.update_layout(
+    edges, counts = summary.histograms[column].counts_for_bins(bins)
+    return _histogram_figure(edges, counts, column, color)
+
+
+def _histogram_figure(edges, counts, column, color):
+    return figure(
+        [{
+            'type': 'bar',
+            'x': (edges[:-1] + edges[1:]) / 2,
+            'y': counts,
+            'width': np.diff(edges),
+            'marker': {'color': color.lower()},
+            'name': column
+        }],
+        title=f'Distribution of {column}',
         xaxis_title="Value",
         yaxis_title="Count",
-        template="plotly_white"
+        bargap=0
     )
-    
-    return fig.to_json()
 
 
 def create_boxplot_plotly(data, column=None):
-    """Create box plot using Plotly"""
+    """Create box plot using Plotly
+    
+    Quartiles, whiskers and a capped sample of outliers are computed here and
+    drawn with Plotly's precomputed box form, so no column is sent row by row.
+    """
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        return create_boxplot_from_summary(data, column)
+    
     if column and column in data.columns:
         if not pd.api.types.is_numeric_dtype(data[column]):
             return None
-        
-        fig = go.Figure()
-        fig.add_trace(go.Box(y=data[column], name=column))
-        fig.update_layout(
-            title=f'Box Plot of {column}',
-            yaxis_title="Value",
-            template="plotly_white"
-        )
+        columns = [column]
     else:
         # Multiple columns - show all numeric columns
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) == 0:
+        columns = list(data.select_dtypes(include=[np.number]).columns)
+        if len(columns) == 0:
             return None
-        
-        fig = go.Figure()
-        for col in numeric_cols:
-            fig.add_trace(go.Box(y=data[col], name=col))
-        
-        fig.update_layout(
-            title='Box Plot',
-            yaxis_title="Value",
-            template="plotly_white"
-        )
     
-    return fig.to_json()
+    boxes = {}
+    for col in columns:
+        summary = box_summary(data[col].to_numpy(dtype=np.float64, na_value=np.nan), BOX_MAX_OUTLIERS)
+        if summary is not None:
+            boxes[col] = summary
+    return _box_figure(boxes, column if column in boxes and len(columns) == 1 else None)
+
+
+def create_boxplot_from_summary(summary, column=None):
+    """Create box plot using Plotly from streaming quantile sketches
+    
+    Quartiles come from each column's sketch and whiskers end at the most extreme
+    retained sketch item within 1.5 IQR of the box, so no raw values are needed.
+    Individual outliers are not drawn.
+    """
+    columns = [column] if column in summary.sketches else summary.numeric_columns
+    if len(columns) == 0:
+        return None
+    
+    boxes = {}
+    for col in columns:
+        sketch = summary.sketches[col]
+        if sketch.n == 0:
+            continue
+        q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        items = sketch.sorted_items()
+        inside = items[(items >= q1 - 1.5 * iqr) & (items <= q3 + 1.5 * iqr)]
+        lowerfence, upperfence = (inside[0], inside[-1]) if len(inside) else (q1, q3)
+        boxes[col] = {
+            'q1': q1, 'median': median, 'q3': q3,
+            'lowerfence': min(lowerfence, q1), 'upperfence': max(upperfence, q3),
+            'mean': summary.moments[col].mean,
+        }
+    return _box_figure(boxes, column if len(columns) == 1 else None)
+
+
+def _box_figure(boxes, column=None):
+    """Box plot figure from per-column box_summary()-style dicts; outliers, if any, are drawn as markers"""
+    traces = []
+    for col, box in boxes.items():
+        traces.append({
+            'type': 'box',
+            'name': col,
+            'x': [col],
+            'q1': [box['q1']], 'median': [box['median']], 'q3': [box['q3']],
+            'lowerfence': [box['lowerfence']], 'upperfence': [box['upperfence']],
+            'mean': [box['mean']],
+            'boxpoints': False,
+            'legendgroup': col
+        })
+        outliers = box.get('outliers')
+        if outliers is not None and len(outliers):
+            traces.append({
+                'type': 'scatter',
+                'x': [col] * len(outliers),
+                'y': outliers,
+                'mode': 'markers',
+                'name': f'{col} outliers',
+                'legendgroup': col,
+                'showlegend': False,
+                'marker': {'size': 4, 'color': 'rgba(80, 80, 80, 0.6)'},
+                'hovertemplate': f"%{{y}}<extra>{box['n_outliers']} outliers in total</extra>"
+            })
+    
+    return figure(
+        traces,
+        title=f'Box Plot of {column}' if column else 'Box Plot',
+        yaxis_title="Value",
+        showlegend=False
+    )
 
 
-def create_qq_plot_plotly(data, column):
-    """Create Q-Q plot using Plotly"""
+def create_qq_plot_plotly(data, column, distribution='norm'):
+    """Create Q-Q plot using Plotly
+    
+    At most normality.QQ_MAX_POINTS order statistics are drawn (every one for small
+    columns), against any of the normality.QQ_DISTRIBUTIONS reference distributions.
+    """
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        if column not in data.sketches:
+            return None
+        # Sketch quantiles stand in for the order statistics of the column
+        return _qq_figure(qq_points(sketch=data.sketches[column], distribution=distribution), column)
+    
     if column not in data.columns:
         return None
     
-    series = data[column].dropna()
+    series = data[column]
     if not pd.api.types.is_numeric_dtype(series):
         return None
     
-    # Generate theoretical quantiles
-    theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(series)))
-    sample_quantiles = np.sort(series)
-    
-    fig = go.Figure()
-    
-    # Add scatter plot
-    fig.add_trace(go.Scatter(
-        x=theoretical_quantiles,
-        y=sample_quantiles,
-        mode='markers',
-        name='Sample Quantiles',
-        marker=dict(color='blue', size=4)
-    ))
-    
-    # Add reference line
-    min_val = min(theoretical_quantiles.min(), sample_quantiles.min())
-    max_val = max(theoretical_quantiles.max(), sample_quantiles.max())
-    fig.add_trace(go.Scatter(
-        x=[min_val, max_val],
-        y=[min_val, max_val],
-        mode='lines',
-        name='Reference Line',
-        line=dict(color='red', width=2)
-    ))
-    
-    fig.update_layout(
-        title=f'Q-Q Plot of {column}',
-        xaxis_title="Theoretical Quantiles",
-        yaxis_title="Sample Quantiles",
-        template="plotly_white"
-    )
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return _qq_figure(qq_points(values, distribution=distribution), column)
+
+
+def _qq_figure(points, column):
+    if points is None:
+        return None
     
-    return fig.to_json()
+    line_x = np.array([points['theoretical'][0], points['theoretical'][-1]])
+    return figure(
+        [
+            {
+                'type': 'scatter',
+                'x': points['theoretical'],
+                'y': points['sample'],
+                'mode': 'markers',
+                'name': 'Sample Quantiles',
+                'marker': {'color': 'blue', 'size': 4}
+            },
+            # Reference line through the quartiles
+            {
+                'type': 'scatter',
+                'x': line_x,
+                'y': points['intercept'] + points['slope'] * line_x,
+                'mode': 'lines',
+                'name': 'Reference Line',
+                'line': {'color': 'red', 'width': 2}
+            },
+        ],
+        title=f"Q-Q Plot of {column} ({points['label']}, n={points['n']:,})",
+        xaxis_title=f"Theoretical Quantiles ({points['label']})",
+        yaxis_title="Sample Quantiles"
+    )
 
 
-def create_correlation_plot_plotly(data):
-    """Create correlation heatmap using Plotly"""
-    numeric_data = data.select_dtypes(include=[np.number])
-    if len(numeric_data.columns) < 2:
+def create_correlation_plot_plotly(data, method='pearson', corr_matrix=None):
+    """Create correlation heatmap using Plotly
+    
+    corr_matrix, when given, is a precomputed (e.g. cached) correlation_matrix result.
+    """
+    data = as_frame(data)
+    if isinstance(data, StreamingSummary):
+        # Only Pearson correlations can be recovered from the summary's pairwise sums
+        if data.correlation is None or len(data.correlation.columns) < 2:
+            return None
+        method = 'pearson'
+        corr_matrix = data.correlation.matrix()
+    elif corr_matrix is None:
+        corr_matrix = correlation_matrix(data, method)
+    if len(corr_matrix.columns) < 2:
         return None
     
-    corr_matrix = numeric_data.corr()
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.columns,
-        colorscale='RdBu',
-        zmid=0,
-        text=np.round(corr_matrix.values, 2),
-        texttemplate="%{text}",
-        textfont={"size": 10},
-        hoverongaps=False
-    ))
-    
-    fig.update_layout(
-        title='Correlation Matrix',
-        template="plotly_white",
+    labels = [str(name) for name in corr_matrix.columns]
+    return figure(
+        [{
+            'type': 'heatmap',
+            'z': corr_matrix.to_numpy(),
+            'x': labels,
+            'y': labels,
+            'colorscale': colorscale('RdBu'),
+            'zmid': 0,
+            'text': np.round(corr_matrix.to_numpy(), 2),
+            'texttemplate': "%{text}",
+            'textfont': {"size": 10},
+            'hoverongaps': False
+        }],
+        title=f'Correlation Matrix ({method.title()})',
         width=600,
         height=600
     )
-    
-    return fig.to_json()
 
 
 def get_data_info(data):
     """Get basic information about the dataset"""
+    if isinstance(data, StreamingSummary):
+        return data.data_info()
+    
+    memory_usage = data.attrs.get('memory_usage') or {}
     info = {
         'shape': data.shape,
         'columns': list(data.columns),
         'dtypes': dict(data.dtypes.astype(str)),
         'missing_values': dict(data.isnull().sum()),
         'numeric_columns': list(data.select_dtypes(include=[np.number]).columns),
-        'categorical_columns': list(data.select_dtypes(include=['object']).columns)
+        'categorical_columns': list(data.select_dtypes(exclude=[np.number, 'datetime']).columns),
+        'datetime_columns': list(data.select_dtypes(include=['datetime']).columns),
+        'memory_before': memory_usage.get('before'),
+        'memory_after': memory_usage.get('after', int(data.memory_usage(index=True, deep=True).sum()))
     }
     return info
 
@@ -302,9 +943,9 @@ def prepare_svm_data(data, target_column=None):
                 le = LabelEncoder()
                 X[col] = le.fit_transform(X[col].astype(str))
         
-        # Handle non-numeric target
+        # Handle non-numeric target (booleans from Yes/No columns are treated as classes too)
         label_encoder = None
-        if not pd.api.types.is_numeric_dtype(y):
+        if not pd.api.types.is_numeric_dtype(y) or pd.api.types.is_bool_dtype(y):
             label_encoder = LabelEncoder()
             y = label_encoder.fit_transform(y.astype(str))
         
@@ -386,28 +1027,25 @@ def train_svm_model(data, target_column=None, test_size=0.2, kernel='rbf', rando
 def create_confusion_matrix_plotly(confusion_matrix, class_labels):
     """Create confusion matrix heatmap using Plotly"""
     try:
-        fig = go.Figure(data=go.Heatmap(
-            z=confusion_matrix,
-            x=[f"Predicted {label}" for label in class_labels],
-            y=[f"Actual {label}" for label in class_labels],
-            colorscale='Blues',
-            text=confusion_matrix,
-            texttemplate="%{text}",
-            textfont={"size": 12},
-            hoverongaps=False
-        ))
-        
-        fig.update_layout(
+        return figure(
+            [{
+                'type': 'heatmap',
+                'z': confusion_matrix,
+                'x': [f"Predicted {label}" for label in class_labels],
+                'y': [f"Actual {label}" for label in class_labels],
+                'colorscale': colorscale('Blues'),
+                'text': confusion_matrix,
+                'texttemplate': "%{text}",
+                'textfont': {"size": 12},
+                'hoverongaps': False
+            }],
             title='Confusion Matrix',
             xaxis_title="Predicted",
             yaxis_title="Actual",
-            template="plotly_white",
             width=500,
             height=500
         )
         
-        return fig.to_json()
-        
     except Exception as e:
         return None
 
@@ -418,25 +1056,22 @@ def create_svm_metrics_plot(results):
         metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
         values = [results['accuracy'], results['precision'], results['recall'], results['f1_score']]
         
-        fig = go.Figure(data=go.Bar(
-            x=metrics,
-            y=values,
-            marker_color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'],
-            text=[f"{v:.3f}" for v in values],
-            textposition='auto'
-        ))
-        
-        fig.update_layout(
+        return figure(
+            [{
+                'type': 'bar',
+                'x': metrics,
+                'y': values,
+                'marker': {'color': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']},
+                'text': [f"{v:.3f}" for v in values],
+                'textposition': 'auto'
+            }],
             title='SVM Model Performance Metrics',
             xaxis_title="Metrics",
             yaxis_title="Score",
-            yaxis=dict(range=[0, 1]),
-            template="plotly_white",
+            yaxis={'range': [0, 1]},
             showlegend=False
         )
         
-        return fig.to_json()
-        
     except Exception as e:
         return None
 
@@ -452,6 +1087,9 @@ def get_svm_feature_columns(data, target_column=None):
 
 def validate_svm_data(data):
     """Validate that data is suitable for SVM training"""
+    if isinstance(data, StreamingSummary):
+        return False, "Dataset is too large for in-memory SVM training"
+    
     if data is None or data.empty:
         return False, "No data available"
     
@@ -1,5 +1,5 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
@@ -8,16 +8,41 @@ from django.urls import reverse
 import pandas as pd
 import json
 import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from .forms import AnalysisForm, FileUploadForm
 from .models import UploadedFile, AnalysisSession, SVMResults
+from .cache import dataset_cache, figure_cache
+from .ingest import append_to_upload, ingest_uploaded_file, profile_for_file
 from .utils import (
     generate_random_data, load_csv_file, get_summary_statistics,
     perform_hypothesis_test, create_histogram_plotly, create_boxplot_plotly,
     create_qq_plot_plotly, create_correlation_plot_plotly, get_data_info,
     train_svm_model, create_confusion_matrix_plotly, create_svm_metrics_plot,
-    validate_svm_data, get_svm_feature_columns
+    validate_svm_data, get_svm_feature_columns, summarize_stream,
+    count_rows, perform_batch_hypothesis_tests, perform_group_statistics, resampling_samples, as_frame, DEFAULT_CHUNK_ROWS
 )
+from .correlation import correlation_matrix
+from .figures import template_specs
+from .normality import QQ_DISTRIBUTIONS
+from .randomdata import DEFAULT_DISTRIBUTION, DEFAULT_RANDOM_SEED, summarize_random
+from .timeseries import RESOLUTIONS, TimeSeriesPyramid, aggregate_periods, period_series
+from .resampling import iter_resampling, DEFAULT_RESAMPLES
+from .streaming import PREVIEW_ROWS, StreamingSummary
+from .columnstore import ColumnStore
+
+
+PLOT_TYPES = ('histogram', 'boxplot', 'qqplot', 'correlation')
+
+_plot_executor = None
+_plot_executor_workers = None
+_plot_executor_lock = threading.Lock()
+# Large random datasets are summarised one at a time on this thread, off the request path
+_random_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='random-data')
+_random_futures = {}
+_random_lock = threading.Lock()
 
 
 def dashboard(request):
@@ -33,6 +58,8 @@ def dashboard(request):
         defaults={
             'data_source': 'random',
             'sample_size': 1000,
+            'random_seed': DEFAULT_RANDOM_SEED,
+            'random_distribution': DEFAULT_DISTRIBUTION,
             'color': 'blue',
             'bins': 30,
             'show_plot': True,
@@ -41,20 +68,20 @@ def dashboard(request):
         }
     )
     
-    # Load initial data
-    data, error = load_data(analysis_session)
+    # Read the dataset schema from its stored profile rather than loading the data
+    data_info, error = get_dataset_info(analysis_session)
     column_choices = []
     svm_target_choices = []
     
-    if data is not None:
+    if data_info is not None:
         if analysis_session.data_source == 'random':
             column_choices = [('x', 'X'), ('y', 'Y'), ('z', 'Z')]
             analysis_session.selected_column = 'x'
             # No SVM for random data
             svm_target_choices = []
         else:
-            numeric_columns = data.select_dtypes(include=['number']).columns.tolist()
-            all_columns = data.columns.tolist()
+            numeric_columns = data_info['numeric_columns']
+            all_columns = data_info['columns']
             column_choices = [(col, col.replace('_', ' ').title()) for col in numeric_columns]
             svm_target_choices = [(col, col.replace('_', ' ').title()) for col in all_columns]
             
@@ -69,12 +96,15 @@ def dashboard(request):
     form_data = {
         'data_source': analysis_session.data_source,
         'sample_size': analysis_session.sample_size,
+        'random_distribution': analysis_session.random_distribution,
+        'random_seed': analysis_session.random_seed,
         'selected_column': analysis_session.selected_column,
         'color': analysis_session.color,
         'bins': analysis_session.bins,
         'show_plot': analysis_session.show_plot,
         'show_stats': analysis_session.show_stats,
         'show_correlation': analysis_session.show_correlation,
+        'correlation_method': analysis_session.correlation_method,
         'svm_target_column': analysis_session.svm_target_column,
         'svm_kernel': analysis_session.svm_kernel,
         'svm_test_size': analysis_session.svm_test_size,
@@ -85,9 +115,11 @@ def dashboard(request):
     
     context = {
         'form': form,
-        'data_info': get_data_info(data) if data is not None else None,
+        'data_info': data_info,
         'error': error,
-        'session_id': session_id
+        'session_id': session_id,
+        'qq_distributions': [(name, label) for name, (label, _) in QQ_DISTRIBUTIONS.items()],
+        'plot_templates': template_specs()
     }
     
     return render(request, 'analysis/dashboard.html', context)
@@ -117,15 +149,15 @@ def update_analysis(request):
             column_choices = [('x', 'X'), ('y', 'Y'), ('z', 'Z')]
             svm_target_choices = []  # No SVM for random data
         else:
-            # Try to load data to get column choices
+            # Get column choices from the dataset profile
             temp_session = AnalysisSession(
                 data_source=new_data_source,
                 uploaded_file=analysis_session.uploaded_file
             )
-            temp_data, temp_error = load_data(temp_session)
-            if temp_data is not None:
-                numeric_columns = temp_data.select_dtypes(include=['number']).columns.tolist()
-                all_columns = temp_data.columns.tolist()
+            temp_info, temp_error = get_dataset_info(temp_session)
+            if temp_info is not None:
+                numeric_columns = temp_info['numeric_columns']
+                all_columns = temp_info['columns']
                 column_choices = [(col, col.replace('_', ' ').title()) for col in numeric_columns]
                 svm_target_choices = [(col, col.replace('_', ' ').title()) for col in all_columns]
                 print(f"DEBUG: Found numeric columns: {numeric_columns}")
@@ -169,6 +201,9 @@ def update_analysis(request):
             # Update analysis session
             analysis_session.data_source = form.cleaned_data['data_source']
             analysis_session.sample_size = form.cleaned_data.get('sample_size', 1000)
+            analysis_session.random_distribution = form.cleaned_data.get('random_distribution') or DEFAULT_DISTRIBUTION
+            if form.cleaned_data.get('random_seed') is not None:
+                analysis_session.random_seed = form.cleaned_data['random_seed']
             
             # Handle column selection based on data source
             new_selected_column = form.cleaned_data.get('selected_column')
@@ -186,6 +221,7 @@ def update_analysis(request):
             analysis_session.show_plot = form.cleaned_data['show_plot']
             analysis_session.show_stats = form.cleaned_data['show_stats']
             analysis_session.show_correlation = form.cleaned_data['show_correlation']
+            analysis_session.correlation_method = form.cleaned_data.get('correlation_method') or 'pearson'
             
             # Update SVM settings only if SVM is enabled
             enable_svm = form.cleaned_data.get('enable_svm', False)
@@ -202,11 +238,9 @@ def update_analysis(request):
             # Handle file upload
             if form.cleaned_data['data_source'] == 'upload' and form.cleaned_data.get('uploaded_file'):
                 uploaded_file = form.cleaned_data['uploaded_file']
-                file_obj = UploadedFile.objects.create(
-                    file=uploaded_file,
-                    original_name=uploaded_file.name,
-                    file_size=uploaded_file.size
-                )
+                file_obj, created = UploadedFile.objects.create_from_upload(uploaded_file)
+                if created:
+                    ingest_uploaded_file(file_obj)
                 analysis_session.uploaded_file = file_obj
             
             analysis_session.save()
@@ -227,7 +261,25 @@ def update_analysis(request):
 
 
 def get_plots(request):
-    """AJAX endpoint to get plot data"""
+    """AJAX endpoint to get plot data
+    
+    Figures are rendered concurrently. `plots` (comma-separated) restricts the
+    batch; figures not ready within PLOT_TIMEOUT_SECONDS are reported under
+    'errors' and finish into the figure cache for the next request.
+    """
+    only = request.GET.get('plots')
+    return plots_response(request, only.split(',') if only else None)
+
+
+def get_plot(request, plot):
+    """AJAX endpoint to get a single plot, so a page can draw each figure as soon as it is ready"""
+    if plot not in PLOT_TYPES:
+        return JsonResponse({'error': f'Unknown plot: {plot}'})
+    return plots_response(request, [plot])
+
+
+def plots_response(request, only=None):
+    """JSON response with the session's figures, limited to the plot types in `only` when given"""
     session_id = request.session.get('analysis_session_id')
     if not session_id:
         return JsonResponse({'error': 'No session found'})
@@ -237,33 +289,123 @@ def get_plots(request):
     except AnalysisSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'})
     
-    # Load data
-    data, error = load_data(analysis_session)
+    qq_distribution = request.GET.get('qq_distribution', 'norm')
+    if qq_distribution not in QQ_DISTRIBUTIONS:
+        qq_distribution = 'norm'
+    requested = requested_plots(analysis_session, qq_distribution)
+    if only is not None:
+        requested = {plot: params for plot, params in requested.items() if plot in only}
+    
+    # Figures already rendered for this dataset and these parameters skip loading the data
+    dataset_key = dataset_cache_key(analysis_session)
+    plots = figure_cache.get_many(dataset_key, requested) if dataset_key is not None else {}
+    missing = {plot: params for plot, params in requested.items() if plot not in plots}
+    if not missing:
+        return JsonResponse(plots)
+    
+    # Only the selected column is needed unless a plot spans every numeric column
+    column = analysis_session.selected_column
+    needs_all_columns = 'correlation' in missing or ('boxplot' in missing and not column)
+    columns = None if needs_all_columns else [column]
+    # The stored profile only carries the sums for Pearson correlations
+    pearson_only = missing.get('correlation', {}).get('method', 'pearson') == 'pearson'
+    data = load_profile_summary(analysis_session, columns) if pearson_only else None
+    if data is None:
+        data, error = load_numeric_data(analysis_session, columns=columns)
     if data is None:
         return JsonResponse({'error': error or 'Unable to load data'})
     
-    plots = {}
-    column = analysis_session.selected_column
+    figures, errors = render_plots(analysis_session, data, missing, dataset_key)
+    plots.update(figures)
+    if errors:
+        plots['errors'] = errors
+    return JsonResponse(plots)
+
+
+def get_plot_executor():
+    """Thread pool shared by all requests for rendering figures
     
-    if analysis_session.show_plot:
-        # Histogram
-        if column and column in data.columns:
-            plots['histogram'] = create_histogram_plotly(
-                data, column, analysis_session.bins, analysis_session.color
-            )
-        
-        # Box plot
-        plots['boxplot'] = create_boxplot_plotly(data, column)
-        
-        # Q-Q plot
-        if column and column in data.columns:
-            plots['qqplot'] = create_qq_plot_plotly(data, column)
-        
-        # Correlation plot
-        if analysis_session.show_correlation:
-            plots['correlation'] = create_correlation_plot_plotly(data)
+    Threads suffice because the NumPy and SciPy work behind each figure releases
+    the GIL, and they share the already loaded dataset without copying it.
+    """
+    global _plot_executor, _plot_executor_workers
+    workers = max(settings.PLOT_WORKERS, 1)
+    with _plot_executor_lock:
+        if _plot_executor is None or _plot_executor_workers != workers:
+            if _plot_executor is not None:
+                _plot_executor.shutdown(wait=False)
+            _plot_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='plots')
+            _plot_executor_workers = workers
+        return _plot_executor
+
+
+def render_plots(analysis_session, data, requested, dataset_key=None, timeout=None):
+    """Render {plot: params} concurrently; returns ({plot: figure}, {plot: error})
     
-    return JsonResponse(plots)
+    Each figure gets `timeout` seconds (PLOT_TIMEOUT_SECONDS by default) from
+    submission. One that takes longer is reported as an error but keeps
+    rendering, and is stored in the figure cache when it finishes.
+    """
+    timeout = settings.PLOT_TIMEOUT_SECONDS if timeout is None else timeout
+    
+    def render(plot):
+        figure = render_plot(analysis_session, data, plot, requested[plot])
+        if dataset_key is not None:
+            figure_cache.set(dataset_key, plot, requested[plot], figure)
+        return figure
+    
+    executor = get_plot_executor()
+    deadline = time.monotonic() + timeout
+    futures = {plot: executor.submit(render, plot) for plot in requested}
+    figures, errors = {}, {}
+    for plot, future in futures.items():
+        try:
+            figures[plot] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            errors[plot] = f'Still rendering after {timeout:g}s; it will be ready on the next request'
+        except Exception as e:
+            errors[plot] = f'Error rendering {plot}: {str(e)}'
+    return figures, errors
+
+
+def requested_plots(analysis_session, qq_distribution='norm'):
+    """{plot: parameters} of the figures the session's dashboard shows
+    
+    The parameters are exactly those the figure depends on, so for example a
+    colour change only invalidates the histogram.
+    """
+    if not analysis_session.show_plot:
+        return {}
+    
+    column = analysis_session.selected_column
+    requested = {}
+    if column:
+        requested['histogram'] = {
+            'column': column, 'bins': analysis_session.bins, 'color': analysis_session.color
+        }
+    requested['boxplot'] = {'column': column}
+    if column:
+        requested['qqplot'] = {'column': column, 'distribution': qq_distribution}
+    if analysis_session.show_correlation:
+        requested['correlation'] = {'method': analysis_session.correlation_method}
+    return requested
+
+
+def render_plot(analysis_session, data, plot, params):
+    """Build one figure of requested_plots() from the loaded data"""
+    if plot == 'histogram':
+        return create_histogram_plotly(data, params['column'], params['bins'], params['color'])
+    if plot == 'boxplot':
+        return create_boxplot_plotly(data, params['column'])
+    if plot == 'qqplot':
+        return create_qq_plot_plotly(data, params['column'], params['distribution'])
+    if isinstance(data, StreamingSummary):
+        # Datasets streamed from disk only carry the sums for Pearson correlations
+        return create_correlation_plot_plotly(data)
+    method = params['method']
+    return create_correlation_plot_plotly(
+        data, method, cached_correlation_matrix(analysis_session, data, method)
+    )
 
 
 def get_statistics(request):
@@ -277,13 +419,16 @@ def get_statistics(request):
     except AnalysisSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'})
     
-    # Load data
-    data, error = load_data(analysis_session)
+    # Load only the selected column, or read the statistics from the stored profile
+    column = analysis_session.selected_column
+    columns = [column] if column else None
+    data = load_profile_summary(analysis_session, columns)
+    if data is None:
+        data, error = load_numeric_data(analysis_session, columns=columns)
     if data is None:
         return JsonResponse({'error': error or 'Unable to load data'})
     
     stats = {}
-    column = analysis_session.selected_column
     
     if analysis_session.show_stats:
         # Summary statistics
@@ -295,6 +440,194 @@ def get_statistics(request):
     return JsonResponse(stats)
 
 
+def get_hypothesis_tests(request):
+    """AJAX endpoint running a t-test across every numeric column with multiple-comparison correction"""
+    session_id = request.session.get('analysis_session_id')
+    if not session_id:
+        return JsonResponse({'error': 'No session found'})
+    
+    try:
+        analysis_session = AnalysisSession.objects.get(session_id=session_id)
+    except AnalysisSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'})
+    
+    test = request.GET.get('test', 'one_sample')
+    group_column = request.GET.get('group_column') or None
+    groups = request.GET.getlist('group') or None
+    try:
+        test_value = float(request.GET.get('test_value', 0))
+        alpha = float(request.GET.get('alpha', 0.05))
+    except ValueError:
+        return JsonResponse({'error': 'test_value and alpha must be numbers'})
+    
+    if test == 'two_sample' and group_column:
+        # Only the numeric columns and the grouping column are needed
+        data_info, _ = get_dataset_info(analysis_session)
+        columns = list(dict.fromkeys(data_info['numeric_columns'] + [group_column])) if data_info else None
+        data, error = load_data(analysis_session, columns=columns)
+    else:
+        data, error = load_numeric_data(analysis_session)
+    if data is None:
+        return JsonResponse({'error': error or 'Unable to load data'})
+    
+    return JsonResponse(perform_batch_hypothesis_tests(
+        data, test=test, test_value=test_value, group_column=group_column, groups=groups,
+        pair_column=request.GET.get('pair_column') or None,
+        correction=request.GET.get('correction', 'holm'), alpha=alpha,
+        equal_var=request.GET.get('equal_var') == 'true'
+    ))
+
+
+def get_group_statistics(request):
+    """AJAX endpoint for statistics of a numeric column within the groups of categorical columns"""
+    session_id = request.session.get('analysis_session_id')
+    if not session_id:
+        return JsonResponse({'error': 'No session found'})
+    
+    try:
+        analysis_session = AnalysisSession.objects.get(session_id=session_id)
+    except AnalysisSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'})
+    
+    column = request.GET.get('column') or analysis_session.selected_column
+    group_columns = request.GET.getlist('group_column')
+    if not column or not group_columns:
+        return JsonResponse({'error': 'Select a numeric column and at least one grouping column'})
+    
+    # Only the analysed column and the grouping columns are needed
+    data, error = load_data(analysis_session, columns=list(dict.fromkeys([column] + group_columns)))
+    if data is None:
+        return JsonResponse({'error': error or 'Unable to load data'})
+    
+    return JsonResponse(perform_group_statistics(data, column, group_columns))
+
+
+def get_time_series(request):
+    """AJAX endpoint serving a column over time from the dataset's resolution pyramid
+    
+    resolution is 'D', 'W', 'M', 'Y' or 'auto', which picks the finest level
+    showing at most MAX_SERIES_POINTS periods between start and end. Weeks,
+    months and years come from the precomputed pyramid; only short spans at
+    daily resolution read the rows. window adds a rolling mean over that many
+    periods and yoy=true a year-over-year comparison.
+    """
+    session_id = request.session.get('analysis_session_id')
+    if not session_id:
+        return JsonResponse({'error': 'No session found'})
+    
+    try:
+        analysis_session = AnalysisSession.objects.get(session_id=session_id)
+    except AnalysisSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'})
+    
+    pyramid = load_time_series_pyramid(analysis_session)
+    if pyramid is None:
+        return JsonResponse({'error': 'The dataset has no date column'})
+    
+    column = request.GET.get('column') or analysis_session.selected_column
+    if column not in pyramid.columns:
+        return JsonResponse({'error': 'Selected column is not numeric'})
+    try:
+        start = pd.Timestamp(request.GET['start']) if request.GET.get('start') else None
+        end = pd.Timestamp(request.GET['end']) if request.GET.get('end') else None
+        window = int(request.GET.get('window') or 0)
+    except ValueError:
+        return JsonResponse({'error': 'start and end must be dates and window a whole number'})
+    if window < 0:
+        return JsonResponse({'error': 'window must not be negative'})
+    
+    resolution = request.GET.get('resolution', 'auto')
+    if resolution == 'auto':
+        resolution = pyramid.choose_resolution(start, end)
+    elif resolution not in RESOLUTIONS:
+        return JsonResponse({'error': f'Unknown resolution: {resolution}'})
+    
+    if resolution in pyramid.levels:
+        level = pyramid.levels[resolution]
+    else:
+        data, error = load_data(analysis_session, columns=[pyramid.date_column, column])
+        if data is None or isinstance(data, StreamingSummary):
+            return JsonResponse({'error': error or 'Daily values are not available for this dataset'})
+        level = aggregate_periods(data, pyramid.date_column, [column], resolution)
+    
+    return JsonResponse(period_series(
+        level, column, resolution, start=start, end=end, window=window,
+        yoy=request.GET.get('yoy') == 'true'
+    ))
+
+
+def get_resampling(request):
+    """AJAX endpoint for bootstrap intervals and permutation tests
+    
+    With stream=true the response is newline-delimited JSON: progress events
+    while resamples are computed, then the result.
+    """
+    session_id = request.session.get('analysis_session_id')
+    if not session_id:
+        return JsonResponse({'error': 'No session found'})
+    
+    try:
+        analysis_session = AnalysisSession.objects.get(session_id=session_id)
+    except AnalysisSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'})
+    
+    column = request.GET.get('column') or analysis_session.selected_column
+    group_column = request.GET.get('group_column') or None
+    try:
+        n_resamples = min(
+            int(request.GET.get('n_resamples', DEFAULT_RESAMPLES)),
+            getattr(settings, 'RESAMPLING_MAX_RESAMPLES', DEFAULT_RESAMPLES)
+        )
+        confidence = float(request.GET.get('confidence', 0.95))
+        test_value = float(request.GET.get('test_value', 0))
+        seed = int(request.GET.get('seed', 0))
+    except ValueError:
+        return JsonResponse({'error': 'n_resamples, confidence, test_value and seed must be numbers'})
+    if seed < 0:
+        return JsonResponse({'error': 'seed must be a non-negative integer'})
+    
+    if group_column:
+        data, error = load_data(analysis_session, columns=[column, group_column])
+    else:
+        data, error = load_numeric_data(analysis_session, columns=[column])
+    if data is None:
+        return JsonResponse({'error': error or 'Unable to load data'})
+    
+    x, y, groups, error = resampling_samples(data, column, group_column, request.GET.getlist('group') or None)
+    if error:
+        return JsonResponse({'error': error})
+    
+    try:
+        events = iter_resampling(
+            x, y, method=request.GET.get('method', 'bootstrap'),
+            statistic=request.GET.get('statistic', 'mean'), n_resamples=n_resamples,
+            confidence=confidence, test_value=test_value, seed=seed,
+            workers=getattr(settings, 'RESAMPLING_WORKERS', 1)
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e)})
+    
+    def with_context(event):
+        if 'result' in event:
+            event['result'].update({'column': column, 'group_column': group_column, 'groups': groups})
+        return event
+    
+    if request.GET.get('stream') == 'true':
+        return StreamingHttpResponse(
+            (json.dumps(with_context(event)) + '\n' for event in events),
+            content_type='application/x-ndjson'
+        )
+    
+    # Progress events are dropped; the result comes with the last event
+    result = None
+    for event in events:
+        if 'result' in event:
+            result = with_context(event)['result']
+    if result is None:
+        return JsonResponse({'error': 'Resampling produced no result'})
+    return JsonResponse(result)
+
+
 def get_data_preview(request):
     """AJAX endpoint to get data preview"""
     session_id = request.session.get('analysis_session_id')
@@ -306,19 +639,21 @@ def get_data_preview(request):
     except AnalysisSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'})
     
-    # Load data
-    data, error = load_data(analysis_session)
+    # Load only the first 100 rows for preview
+    data, error = load_data(analysis_session, nrows=100)
     if data is None:
         return JsonResponse({'error': error or 'Unable to load data'})
     
-    # Get first 100 rows for preview
     preview_data = data.head(100)
+    total_rows = dataset_row_count(analysis_session)
+    if total_rows is None:
+        total_rows = len(load_data(analysis_session)[0])
     
     # Convert to dict for JSON serialization
     data_dict = {
         'columns': list(preview_data.columns),
         'data': preview_data.values.tolist(),
-        'total_rows': len(data),
+        'total_rows': total_rows,
         'preview_rows': len(preview_data)
     }
     
@@ -336,9 +671,9 @@ def get_column_choices(request):
     except AnalysisSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'})
     
-    # Load data
-    data, error = load_data(analysis_session)
-    if data is None:
+    # Read columns from the dataset profile
+    data_info, error = get_dataset_info(analysis_session)
+    if data_info is None:
         return JsonResponse({'error': error or 'Unable to load data'})
     
     if analysis_session.data_source == 'random':
@@ -348,7 +683,7 @@ def get_column_choices(request):
             {'value': 'z', 'label': 'Z'}
         ]
     else:
-        numeric_columns = data.select_dtypes(include=['number']).columns.tolist()
+        numeric_columns = data_info['numeric_columns']
         columns = [
             {'value': col, 'label': col.replace('_', ' ').title()}
             for col in numeric_columns
@@ -357,17 +692,24 @@ def get_column_choices(request):
     return JsonResponse({'columns': columns})
 
 
-def load_data(analysis_session):
-    """Helper function to load data based on analysis session"""
+def load_data(analysis_session, columns=None, nrows=None):
+    """Helper function to load data based on analysis session
+
+    columns and nrows restrict the load to the columns and leading rows an
+    endpoint actually uses; they are pushed down into the file reader.
+    """
     try:
         if analysis_session.data_source == 'random':
-            data = generate_random_data(analysis_session.sample_size or 1000)
-            return data, None
+            data, error = load_random_cached(*random_data_params(analysis_session))
+            return project_data(data, columns, nrows), error
         
         elif analysis_session.data_source == 'upload':
             if analysis_session.uploaded_file:
-                file_path = analysis_session.uploaded_file.file.path
-                return load_csv_file(file_path)
+                uploaded_file = analysis_session.uploaded_file
+                return load_file_cached(
+                    uploaded_file.file.path, dialect=uploaded_file.csv_dialect,
+                    columns=columns, nrows=nrows, profile=uploaded_file.profile
+                )
             else:
                 return None, "No file uploaded"
         
@@ -375,11 +717,11 @@ def load_data(analysis_session):
             # Look for the brain tumor dataset in the project root
             dataset_path = os.path.join(settings.BASE_DIR, 'brain_tumor_dataset.csv')
             if os.path.exists(dataset_path):
-                return load_csv_file(dataset_path)
+                return load_file_cached(dataset_path, columns=columns, nrows=nrows)
             else:
                 # Fallback to random data if local file not found
-                data = generate_random_data(1000)
-                return data, "Local dataset not found, using random data"
+                data, _ = load_random_cached(1000)
+                return project_data(data, columns, nrows), "Local dataset not found, using random data"
         
         else:
             return None, "Invalid data source"
@@ -388,6 +730,294 @@ def load_data(analysis_session):
         return None, f"Error loading data: {str(e)}"
 
 
+def random_data_params(analysis_session):
+    """(sample_size, seed, distribution) of a random-data session"""
+    return (
+        analysis_session.sample_size or 1000,
+        analysis_session.random_seed if analysis_session.random_seed is not None else DEFAULT_RANDOM_SEED,
+        analysis_session.random_distribution or DEFAULT_DISTRIBUTION,
+    )
+
+
+def load_random_cached(sample_size, seed=DEFAULT_RANDOM_SEED, distribution=DEFAULT_DISTRIBUTION):
+    """Random dataset for (size, seed, distribution), generated once per process
+    
+    Generation is deterministic, so the cache key is the parameters themselves.
+    Samples above RANDOM_STREAMING_ROWS are drawn chunk by chunk into a
+    StreamingSummary on a background thread instead of being held in memory as
+    a DataFrame; see load_random_summary.
+    """
+    if sample_size > settings.RANDOM_STREAMING_ROWS:
+        return load_random_summary(sample_size, seed, distribution)
+    return dataset_cache.get_or_load(
+        ('random', sample_size, seed, distribution),
+        lambda: (generate_random_data(sample_size, seed, distribution), None)
+    )
+
+
+def load_random_summary(sample_size, seed=DEFAULT_RANDOM_SEED, distribution=DEFAULT_DISTRIBUTION):
+    """(StreamingSummary, error) of a large random dataset, generated once on a background thread
+    
+    A request waits up to RANDOM_WAIT_SECONDS for the summary. If it is not
+    ready by then, the request gets an error, generation carries on, and a
+    later request picks up the cached result.
+    """
+    key = ('random', sample_size, seed, distribution)
+    summary = dataset_cache.get(key)
+    if summary is not None:
+        return summary, None
+    
+    with _random_lock:
+        future = _random_futures.get(key)
+        if future is None:
+            future = _random_futures[key] = _random_executor.submit(_summarize_random_into_cache, key)
+    try:
+        return future.result(timeout=settings.RANDOM_WAIT_SECONDS)
+    except FutureTimeoutError:
+        return None, f'Still generating {sample_size:,} random rows; reload the page in a moment'
+
+
+def _summarize_random_into_cache(key):
+    try:
+        summary = summarize_random(*key[1:])
+        dataset_cache.set(key, summary)
+        return summary, None
+    except Exception as e:
+        return None, f"Error generating random data: {str(e)}"
+    finally:
+        with _random_lock:
+            _random_futures.pop(key, None)
+
+
+def get_dataset_profile(analysis_session):
+    """Return the stored DatasetProfile for a file-backed session, building it on first use"""
+    if analysis_session.data_source == 'upload' and analysis_session.uploaded_file:
+        uploaded_file = analysis_session.uploaded_file
+        if uploaded_file.profile_id:
+            return uploaded_file.profile
+        profile = profile_for_file(
+            uploaded_file.file.path, uploaded_file.original_name,
+            lambda: load_data(analysis_session)
+        )
+        if profile is not None and uploaded_file.pk:
+            uploaded_file.profile = profile
+            uploaded_file.save(update_fields=['profile'])
+        return profile
+    
+    if analysis_session.data_source == 'local':
+        dataset_path = os.path.join(settings.BASE_DIR, 'brain_tumor_dataset.csv')
+        if os.path.exists(dataset_path):
+            return profile_for_file(dataset_path, 'brain_tumor_dataset.csv', lambda: load_data(analysis_session))
+    
+    return None
+
+
+def get_dataset_info(analysis_session):
+    """Return (data_info, error), from the stored profile when there is one"""
+    try:
+        profile = get_dataset_profile(analysis_session)
+    except OSError:
+        profile = None
+    if profile is not None:
+        return profile.data_info(), None
+    
+    data, error = load_data(analysis_session)
+    return (get_data_info(data) if data is not None else None), error
+
+
+def project_data(data, columns=None, nrows=None):
+    """Restrict an already loaded dataset to the requested columns and leading rows"""
+    if data is None or isinstance(data, StreamingSummary):
+        return data
+    if columns is not None:
+        data = data[[col for col in columns if col in data.columns]]
+    if nrows is not None:
+        data = data.head(nrows)
+    return data
+
+
+def load_profile_summary(analysis_session, columns=None):
+    """StreamingSummary of the session's upload rebuilt from its stored profile, or None
+
+    Appends fold their rows into the profile and drop the upload from the dataset
+    cache, so until the data is loaded again statistics and figures are served
+    from the profile instead of being recomputed from every row. None when the
+    profile lacks the streaming state or the data is already in memory.
+    """
+    uploaded_file = analysis_session.uploaded_file
+    if analysis_session.data_source != 'upload' or uploaded_file is None:
+        return None
+    profile = uploaded_file.profile
+    if profile is None or not profile.has_streaming_state:
+        return None
+    try:
+        file_path = uploaded_file.file.path
+        keys = [dataset_cache.file_key(file_path), dataset_cache.file_key(file_path, 'columns')]
+        if columns is not None:
+            keys.append(dataset_cache.file_key(file_path, 'projection', (tuple(columns), None)))
+    except OSError:
+        return None
+    if any(dataset_cache.peek(key) is not None for key in keys):
+        return None
+    return profile.streaming_summary()
+
+
+def load_numeric_data(analysis_session, columns=None):
+    """Load only the numeric columns, from the memory-mapped column store when one exists
+
+    columns restricts the result to those columns; requests for a column the
+    store does not hold are loaded from the file instead.
+    """
+    uploaded_file = analysis_session.uploaded_file
+    if analysis_session.data_source == 'upload' and uploaded_file and uploaded_file.column_store:
+        try:
+            file_path = uploaded_file.file.path
+            store, _ = dataset_cache.get_or_load(
+                dataset_cache.file_key(file_path, 'columns'),
+                lambda: (ColumnStore.open(file_path), None)
+            )
+            if store is not None:
+                if columns is None:
+                    return store, None
+                if all(column in store for column in columns):
+                    return store.select(columns), None
+        except OSError:
+            pass
+    return load_data(analysis_session, columns=columns)
+
+
+def load_file_cached(file_path, dialect=None, columns=None, nrows=None, profile=None):
+    """Load a CSV/Excel file through the process-wide dataset cache
+
+    Files larger than STREAMING_THRESHOLD_BYTES are read in bounded chunks into a
+    StreamingSummary instead of being materialised as a DataFrame, or rebuilt
+    from the stored profile of the file when it carries the summary state.
+    Projected loads are served from the full dataset when it is already cached,
+    and otherwise cached separately under their (columns, nrows) projection.
+    """
+    threshold = getattr(settings, 'STREAMING_THRESHOLD_BYTES', None)
+    if threshold is not None and os.path.getsize(file_path) > threshold:
+        if profile is not None and profile.has_streaming_state:
+            def loader():
+                preview, _ = load_csv_file(file_path, dialect=dialect, nrows=PREVIEW_ROWS)
+                return profile.streaming_summary(preview), None
+        else:
+            chunksize = getattr(settings, 'STREAMING_CHUNK_ROWS', DEFAULT_CHUNK_ROWS)
+            def loader():
+                return summarize_stream(file_path, dialect=dialect, chunksize=chunksize)
+        return dataset_cache.get_or_load(dataset_cache.file_key(file_path, 'stream'), loader)
+    
+    full_key = dataset_cache.file_key(file_path)
+    if columns is None and nrows is None:
+        return dataset_cache.get_or_load(
+            full_key,
+            lambda: load_csv_file(file_path, dialect=dialect)
+        )
+    
+    full_data = dataset_cache.peek(full_key)
+    if full_data is not None:
+        return project_data(full_data, columns, nrows), None
+    
+    projection = (tuple(columns) if columns is not None else None, nrows)
+    data, error = dataset_cache.get_or_load(
+        dataset_cache.file_key(file_path, 'projection', projection),
+        lambda: load_csv_file(file_path, dialect=dialect, columns=columns, nrows=nrows)
+    )
+    if data is None and columns is not None:
+        # A requested column is not in the file; fall back to the whole dataset
+        data, error = load_file_cached(file_path, dialect=dialect)
+        return project_data(data, None, nrows), error
+    return data, error
+
+
+def dataset_cache_key(analysis_session):
+    """Dataset cache key identifying the current contents of the session's dataset, or None"""
+    if analysis_session.data_source == 'random':
+        return ('random',) + random_data_params(analysis_session)
+    
+    if analysis_session.data_source == 'upload' and analysis_session.uploaded_file:
+        file_path = analysis_session.uploaded_file.file.path
+    elif analysis_session.data_source == 'local':
+        file_path = os.path.join(settings.BASE_DIR, 'brain_tumor_dataset.csv')
+        if not os.path.exists(file_path):
+            return ('random', 1000, DEFAULT_RANDOM_SEED, DEFAULT_DISTRIBUTION)
+    else:
+        return None
+    
+    try:
+        return dataset_cache.file_key(file_path)
+    except OSError:
+        return None
+
+
+def cached_correlation_matrix(analysis_session, data, method='pearson'):
+    """Correlation matrix of the session's dataset, cached per dataset fingerprint and method
+    
+    The entry lives in the dataset cache next to the data it was computed from,
+    so replacing or appending to the file drops it along with the parsed data.
+    """
+    def loader():
+        return correlation_matrix(as_frame(data), method), None
+    
+    key = dataset_cache_key(analysis_session)
+    if key is None:
+        return loader()[0]
+    corr_matrix, _ = dataset_cache.get_or_load(key + ('correlation', method), loader)
+    return corr_matrix
+
+
+def load_time_series_pyramid(analysis_session):
+    """TimeSeriesPyramid of the session's dataset, or None when it has no date column
+    
+    The pyramid normally comes from the stored profile; profiles built before
+    date columns were parsed get one from the loaded data instead.
+    """
+    def loader():
+        profile = get_dataset_profile(analysis_session)
+        if profile is not None and profile.time_series is not None:
+            return TimeSeriesPyramid.from_dict(profile.time_series), None
+        data, error = load_data(analysis_session)
+        if data is None or isinstance(data, StreamingSummary):
+            return None, error
+        return TimeSeriesPyramid.from_frame(data), None
+    
+    key = dataset_cache_key(analysis_session)
+    if key is None:
+        return loader()[0]
+    pyramid, _ = dataset_cache.get_or_load(key + ('timeseries',), loader)
+    return pyramid
+
+
+def dataset_row_count(analysis_session, fallback=None):
+    """Number of rows in the session's dataset, counted without parsing it when possible"""
+    if analysis_session.data_source == 'random':
+        return analysis_session.sample_size or 1000
+    
+    if analysis_session.data_source == 'upload' and analysis_session.uploaded_file:
+        file_path = analysis_session.uploaded_file.file.path
+        dialect = analysis_session.uploaded_file.csv_dialect
+    elif analysis_session.data_source == 'local':
+        file_path = os.path.join(settings.BASE_DIR, 'brain_tumor_dataset.csv')
+        dialect = None
+    else:
+        return fallback
+    
+    try:
+        for key in (dataset_cache.file_key(file_path), dataset_cache.file_key(file_path, 'stream')):
+            cached = dataset_cache.peek(key)
+            if cached is not None:
+                return len(cached)
+        row_count = count_rows(file_path, dialect)
+    except (OSError, ValueError):
+        return fallback
+    return fallback if row_count is None else row_count
+
+
+def cache_stats(request):
+    """AJAX endpoint reporting dataset cache usage"""
+    return JsonResponse({'datasets': dataset_cache.stats(), 'figures': figure_cache.stats()})
+
+
 # API Views for more complex operations
 @require_http_methods(["POST"])
 def upload_file(request):
@@ -395,7 +1025,9 @@ def upload_file(request):
     if request.method == 'POST':
         form = FileUploadForm(request.POST, request.FILES)
         if form.is_valid():
-            uploaded_file = form.save()
+            uploaded_file, created = UploadedFile.objects.create_from_upload(form.cleaned_data['file'])
+            if created:
+                ingest_uploaded_file(uploaded_file)
             return JsonResponse({
                 'success': True,
                 'file_id': uploaded_file.id,
@@ -410,6 +1042,40 @@ def upload_file(request):
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
 
+@require_http_methods(["POST"])
+def append_rows(request, file_id):
+    """Append CSV rows to an uploaded dataset via AJAX, updating its statistics incrementally"""
+    session_id = request.session.get('analysis_session_id')
+    if not session_id:
+        return JsonResponse({'success': False, 'error': 'No session found'})
+    
+    try:
+        analysis_session = AnalysisSession.objects.get(session_id=session_id)
+    except AnalysisSession.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Session not found'})
+    
+    # Only the session's own upload can be extended
+    if analysis_session.uploaded_file_id != file_id:
+        return JsonResponse({'success': False, 'error': 'File not found'})
+    uploaded_file = analysis_session.uploaded_file
+    
+    if 'file' in request.FILES:
+        content = request.FILES['file'].read()
+    else:
+        content = request.POST.get('rows', '')
+    
+    rows_appended, error = append_to_upload(uploaded_file, content)
+    if error:
+        return JsonResponse({'success': False, 'error': error})
+    
+    uploaded_file.refresh_from_db()
+    return JsonResponse({
+        'success': True,
+        'rows_appended': rows_appended,
+        'total_rows': uploaded_file.profile.n_rows if uploaded_file.profile else None
+    })
+
+
 def about(request):
     """About page view"""
     return render(request, 'analysis/about.html')
@@ -105,4 +105,55 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB 
\ No newline at end of file
+DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB 
+# Parsed dataset cache (per process)
+DATASET_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# Rendered figures are cached per dataset fingerprint and plot parameters. Set
+# FIGURE_CACHE_BACKEND to 'file' to share them between worker processes, or to
+# 'redis' to use REDIS_URL (requires the redis package).
+FIGURE_CACHE_BACKEND = os.environ.get('FIGURE_CACHE_BACKEND', 'memory')
+FIGURE_CACHE_TIMEOUT = 60 * 60  # 1 hour
+FIGURE_CACHE_BACKENDS = {
+    'memory': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'figures',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('FIGURE_CACHE_DIR', str(BASE_DIR / 'cache' / 'figures')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        'KEY_PREFIX': 'statistical_analysis',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'figures': dict(FIGURE_CACHE_BACKENDS[FIGURE_CACHE_BACKEND], TIMEOUT=FIGURE_CACHE_TIMEOUT),
+}
+
+# Threads rendering a request's figures concurrently, and how long each may take
+# before the response is sent without it
+PLOT_WORKERS = min(4, os.cpu_count() or 1)
+PLOT_TIMEOUT_SECONDS = 30
+
+# Files above this size are summarised in chunks instead of loaded into memory
+STREAMING_THRESHOLD_BYTES = 512 * 1024 * 1024  # 512MB
+STREAMING_CHUNK_ROWS = 100000
+
+# Random datasets above this many rows are drawn in chunks into a streaming summary
+RANDOM_STREAMING_ROWS = 1000000
+RANDOM_MAX_SAMPLE_SIZE = 50000000
+# How long a request waits for a large random dataset before asking the user to reload
+RANDOM_WAIT_SECONDS = 10
+
+# Worker processes for large bootstrap/permutation runs (1 runs them in the request process)
+RESAMPLING_WORKERS = min(4, os.cpu_count() or 1)
+RESAMPLING_MAX_RESAMPLES = 100000
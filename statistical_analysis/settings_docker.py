@@ -96,7 +96,9 @@ LOGGING = {
 
 # Cache (Redis if available)
 if os.environ.get('REDIS_URL'):
+    # Keep the 'figures' cache from settings.py (FIGURE_CACHE_BACKEND)
     CACHES = {
+        **CACHES,
         'default': {
             'BACKEND': 'django.core.cache.backends.redis.RedisCache',
             'LOCATION': os.environ.get('REDIS_URL'),
@@ -107,7 +107,9 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 
 # Cache configuration (optional but recommended)
+# Keep the 'figures' cache from settings.py (FIGURE_CACHE_BACKEND)
 CACHES = {
+    **CACHES,
     'default': {
         'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
         'LOCATION': 'cache_table',